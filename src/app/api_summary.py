@@ -3,11 +3,15 @@
 
 import sqlite3
 import re
-from fastapi import APIRouter, HTTPException, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
 from pathlib import Path
 
+from src.app.db import ReadPool, get_db, get_pool
+from src.cosme_collector.normalize import product_key
+from src.database.summary import read_product_summary
+
 # =========================================================
 # [모듈 임포트] 크롤러 & 분석기
 # =========================================================
@@ -24,8 +28,7 @@ except ImportError as e:
 # =========================
 BASE_DIR = Path(__file__).resolve().parents[2]
 
-# 모든 데이터는 laneige.db에 통합되어 있음
-DB_PATH = BASE_DIR / "laneige.db"
+# 모든 데이터는 laneige.db에 통합되어 있음 (연결은 src/app/db.py 의 읽기 전용 풀에서 빌림)
 
 # Amazon CSV 경로
 AMAZON_CSV_PATH = BASE_DIR / "src" / "review_collector" / "amazon_reviews.CSV"
@@ -62,6 +65,14 @@ class ProductSummaryResponse(BaseModel):
     keywords: List[str]
     sentiment: SentimentData
 
+class LinkedProduct(BaseModel):
+    source: str
+    product_id: str
+    product_name: Optional[str]
+    latest_rank: Optional[int]
+    score: float
+    method: str
+
 # =========================
 # 3. 헬퍼 함수
 # =========================
@@ -95,123 +106,141 @@ def parse_gpt_response(gpt_text: str):
 # 4. API 엔드포인트
 # =========================
 @router.get("/{product_id}", response_model=ProductSummaryResponse)
-async def get_product_summary(
+def get_product_summary(
     product_id: str, 
-    source: str = Query(..., description="amazon 또는 cosme")
+    source: str = Query(..., description="amazon 또는 cosme"),
+    history: int = Query(30, ge=1, le=365, description="순위 추이 최근 N일"),
+    pool: ReadPool = Depends(get_pool)
 ):
-    if not DB_PATH.exists():
-         raise HTTPException(status_code=500, detail="Database file (laneige.db) not found.")
+    if source.lower() not in ("amazon", "cosme"):
+        raise HTTPException(status_code=400, detail="source must be amazon or cosme")
 
-    conn = sqlite3.connect(DB_PATH)
-    conn.row_factory = sqlite3.Row
-    cursor = conn.cursor()
+    total_reviews = 0
     
-    try:
-        product_name = ""
-        current_rank = 0
-        rating = 0.0
-        total_reviews = 0
-        ranking_trend = []
-        rank_change = 0
-        
-        # -------------------------------------------------
-        # [Step 1] DB 조회 (테이블 분기)
-        # -------------------------------------------------
-        if source.lower() == 'amazon':
-            # amazon 테이블 조회
-            cursor.execute("SELECT * FROM amazon WHERE productcode = ? ORDER BY crawldate ASC", (product_id,))
-            rows = cursor.fetchall()
-            
-            if not rows: raise HTTPException(status_code=404, detail="Product not found in Amazon DB")
-            
-            latest = rows[-1]
-            product_name = latest['productname']
-            current_rank = latest['rank']
-            rating = latest['rating']
-            
-            if len(rows) >= 2:
-                prev_rank = rows[-2]['rank']
-                rank_change = prev_rank - current_rank
-            
-            for row in rows:
-                label = row['crawldate'][:10] if 'crawldate' in row.keys() else "Date"
-                ranking_trend.append(RankingPoint(label=label, rank=row['rank']))
-
-        elif source.lower() == 'cosme':
-            # cosme 테이블 조회 (laneige.db 안에 있음)
-            cursor.execute("SELECT * FROM cosme WHERE product_id = ? ORDER BY date ASC", (product_id,))
-            rows = cursor.fetchall()
-            
-            if not rows: raise HTTPException(status_code=404, detail="Product not found in Cosme DB")
-            
-            latest = rows[-1]
-            product_name = latest['product_name'] if 'product_name' in latest.keys() else f"{latest['brand_name']} Item"
-            current_rank = int(latest['global_rank']) if latest['global_rank'] else 0
-            rating = latest['rating_score']
-
-            if len(rows) >= 2:
-                prev_val = int(rows[-2]['global_rank']) if rows[-2]['global_rank'] else 0
-                if prev_val > 0 and current_rank > 0:
-                    rank_change = prev_val - current_rank
-            
-            for row in rows:
-                label = row['date'] if 'date' in row.keys() else "Date"
-                val = int(row['global_rank']) if row['global_rank'] else 0
-                ranking_trend.append(RankingPoint(label=label, rank=val))
-
-        # -------------------------------------------------
-        # [Step 2] 리뷰 분석 (Live Crawling or CSV)
-        # -------------------------------------------------
-        reviews = []
-        
-        # Amazon: CSV 파일 사용
-        if source.lower() == 'amazon':
-            target_key = product_name.lower().replace(" ", "")
-            reviews = load_amazon_reviews_by_product(str(AMAZON_CSV_PATH), target_key)
-            if not reviews and "laneige" in product_name.lower():
-                 pass # Fallback 로직 필요시 추가
-
-        # Cosme: 실시간 크롤링 (속도 이슈로 1페이지 제한)
-        elif source.lower() == 'cosme':
-            try:
-                reviews = crawl_by_id(product_id, max_pages=1)
-            except Exception:
-                reviews = []
-
-        # -------------------------------------------------
-        # [Step 3] GPT 분석 및 결과 반환
-        # -------------------------------------------------
-        keywords = ["데이터 부족"]
-        sentiment_dict = {"pos": 0, "neu": 0, "neg": 0}
-
-        if reviews:
-            gpt_report = analyze_reviews(product_name, reviews, source)
-            keywords, sentiment_dict = parse_gpt_response(gpt_report)
-            total_reviews = len(reviews)
-        else:
-            if source.lower() == 'amazon':
-                total_reviews = latest['reviewcount'] if 'reviewcount' in latest.keys() else 0
-            elif source.lower() == 'cosme':
-                total_reviews = latest['review_count'] if 'review_count' in latest.keys() else 0
-
-        return ProductSummaryResponse(
-            product_id=product_id,
-            product_name=product_name,
-            source=source,
-            basic_analysis=BasicAnalysis(
-                current_ranking=current_rank,
-                rank_change=rank_change,
-                total_reviews=total_reviews,
-                rating=rating
-            ),
-            ranking_trend=ranking_trend,
-            keywords=keywords,
-            sentiment=SentimentData(
-                positive=sentiment_dict['pos'],
-                neutral=sentiment_dict['neu'],
-                negative=sentiment_dict['neg']
-            )
+    # -------------------------------------------------
+    # [Step 1] DB 조회 (적재 때 만든 product_summary 1행 + product_rank_history 최근 N일)
+    # 연결은 이 구간만 빌림 (아래 크롤링 / GPT 분석 동안 풀을 점유하지 않음)
+    # -------------------------------------------------
+    with pool.connection() as conn:
+        summary, points = read_product_summary(conn, source.lower(), product_id, history)
+    if summary is None:
+        label = "Amazon" if source.lower() == "amazon" else "Cosme"
+        raise HTTPException(status_code=404, detail=f"Product not found in {label} DB")
+
+    product_name = summary['product_name'] or f"{summary['brand_name']} Item"
+    rating = summary['rating']
+    rank_change = summary['rank_change'] or 0
+
+    if source.lower() == 'amazon':
+        current_rank = summary['latest_rank']
+        ranking_trend = [RankingPoint(label=day, rank=rank) for day, rank in points]
+    else:
+        # cosme 는 global_rank 없는 날(그룹 랭킹만)을 0 으로 표시
+        current_rank = summary['latest_rank'] or 0
+        ranking_trend = [RankingPoint(label=day, rank=rank or 0) for day, rank in points]
+
+    # -------------------------------------------------
+    # [Step 2] 리뷰 분석 (Live Crawling or CSV)
+    # -------------------------------------------------
+    reviews = []
+    
+    # Amazon: CSV 파일 사용
+    if source.lower() == 'amazon':
+        target_key = product_key(product_name)
+        reviews = load_amazon_reviews_by_product(str(AMAZON_CSV_PATH), target_key)
+        if not reviews and "laneige" in product_name.lower():
+             pass # Fallback 로직 필요시 추가
+
+    # Cosme: 실시간 크롤링 (속도 이슈로 1페이지 제한)
+    elif source.lower() == 'cosme':
+        try:
+            reviews = crawl_by_id(product_id, max_pages=1)
+        except Exception:
+            reviews = []
+
+    # -------------------------------------------------
+    # [Step 3] GPT 분석 및 결과 반환
+    # -------------------------------------------------
+    keywords = ["데이터 부족"]
+    sentiment_dict = {"pos": 0, "neu": 0, "neg": 0}
+
+    if reviews:
+        gpt_report = analyze_reviews(product_name, reviews, source)
+        keywords, sentiment_dict = parse_gpt_response(gpt_report)
+        total_reviews = len(reviews)
+    else:
+        total_reviews = summary['review_count'] or 0
+
+    return ProductSummaryResponse(
+        product_id=product_id,
+        product_name=product_name,
+        source=source,
+        basic_analysis=BasicAnalysis(
+            current_ranking=current_rank,
+            rank_change=rank_change,
+            total_reviews=total_reviews,
+            rating=rating
+        ),
+        ranking_trend=ranking_trend,
+        keywords=keywords,
+        sentiment=SentimentData(
+            positive=sentiment_dict['pos'],
+            neutral=sentiment_dict['neu'],
+            negative=sentiment_dict['neg']
         )
+    )
+
+
+# 다른 마켓의 같은 상품 (product_xref 조인, src/database/product_xref.py 로 생성)
+LINKED_SQL = {
+    "cosme": """
+        SELECT x.amazon_productcode AS product_id, MAX(a.productname) AS product_name,
+               MIN(a.rank) AS latest_rank, x.score, x.method
+        FROM product_xref x
+        JOIN amazon a ON a.productcode = x.amazon_productcode
+        WHERE x.cosme_product_id = ?
+          AND a.crawldate = (SELECT MAX(crawldate) FROM amazon WHERE productcode = x.amazon_productcode)
+        GROUP BY x.amazon_productcode
+        ORDER BY x.score DESC
+    """,
+    "amazon": """
+        SELECT x.cosme_product_id AS product_id, MAX(c.product_name) AS product_name,
+               MIN(COALESCE(c.global_rank, c.group_rank)) AS latest_rank, x.score, x.method
+        FROM product_xref x
+        LEFT JOIN cosme c ON c.product_id = x.cosme_product_id
+          AND c.date = (SELECT MAX(date) FROM cosme WHERE product_id = x.cosme_product_id)
+        WHERE x.amazon_productcode = ?
+        GROUP BY x.cosme_product_id
+        ORDER BY x.score DESC
+    """,
+}
+
+
+@router.get("/{product_id}/linked", response_model=List[LinkedProduct])
+def get_linked_products(
+    product_id: str,
+    source: str = Query(..., description="amazon 또는 cosme (product_id 의 출처)"),
+    conn: sqlite3.Connection = Depends(get_db)
+):
+    source = source.lower()
+    if source not in LINKED_SQL:
+        raise HTTPException(status_code=400, detail="source must be amazon or cosme")
 
-    finally:
-        conn.close()
\ No newline at end of file
+    conn.row_factory = sqlite3.Row
+    try:
+        rows = conn.execute(LINKED_SQL[source], (product_id,)).fetchall()
+    except sqlite3.OperationalError:
+        # product_xref 미생성
+        rows = []
+    other = "amazon" if source == "cosme" else "cosme"
+    return [
+        LinkedProduct(
+            source=other,
+            product_id=str(r["product_id"]),
+            product_name=r["product_name"],
+            latest_rank=int(r["latest_rank"]) if r["latest_rank"] is not None else None,
+            score=r["score"],
+            method=r["method"],
+        )
+        for r in rows
+    ]
@@ -0,0 +1,162 @@
+# db.py : API 용 laneige.db 읽기 전용 연결 풀
+# 요청마다 sqlite3.connect / close 하지 않고, 미리 열어 둔 읽기 전용 연결을 빌려 쓰고 돌려줌
+#
+#   from src.app.db import get_db, get_pool
+#
+#   @router.get("/x")
+#   def handler(conn: sqlite3.Connection = Depends(get_db)):      # 요청 동안 연결 1개
+#       ...
+#
+#   @router.get("/y")
+#   def handler(pool: ReadPool = Depends(get_pool)):              # 필요한 구간만 빌림
+#       with pool.connection() as conn:
+#           ...
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from pathlib import Path
+
+from fastapi import HTTPException
+
+# =========================
+# 설정
+# =========================
+BASE_DIR = Path(__file__).resolve().parents[2]
+DB_PATH = BASE_DIR / "laneige.db"
+
+POOL_SIZE = 8            # 동시에 열어 두는 최대 연결 수
+ACQUIRE_TIMEOUT = 5.0    # 연결이 모두 사용 중일 때 기다리는 시간 (초)
+CACHED_STATEMENTS = 256  # 연결별 prepared statement 캐시 (같은 SQL 문자열은 다시 파싱 안 함)
+
+# 연결마다 1번 실행
+# - journal_mode=WAL 은 적재(src/database/loader.py) 때 DB 파일에 설정되어 유지됨
+#   → 읽기 전용 연결은 바꿀 수 없고, WAL 이면 적재 중에도 막히지 않고 읽음
+READ_PRAGMAS = {
+    "query_only": "ON",
+    "mmap_size": 256 * 1024 * 1024,   # bytes
+    "cache_size": -16 * 1024,         # KiB 단위 (16MB)
+    "temp_store": "MEMORY",
+}
+
+
+# =========================
+# 연결 풀
+# =========================
+class ReadPool:
+    """
+    읽기 전용 연결 풀 (threadpool 에서 도는 sync 핸들러용)
+    - 연결은 필요할 때 만들고 최대 size 개까지 재사용
+    - 한 연결은 한 번에 한 요청만 사용 → check_same_thread=False 로 스레드 간 전달 허용
+    """
+
+    def __init__(self, db_path: Path = DB_PATH, size: int = POOL_SIZE, timeout: float = ACQUIRE_TIMEOUT):
+        self.db_path = Path(db_path)
+        self.size = size
+        self.timeout = timeout
+        self._idle = queue.LifoQueue()   # 최근에 쓴 연결부터 (페이지 캐시가 따뜻함)
+        self._lock = threading.Lock()
+        self._opened = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(
+            f"{self.db_path.as_uri()}?mode=ro",
+            uri=True,
+            check_same_thread=False,
+            cached_statements=CACHED_STATEMENTS,
+        )
+        for k, v in READ_PRAGMAS.items():
+            conn.execute(f"PRAGMA {k} = {v}")
+        return conn
+
+    def acquire(self) -> sqlite3.Connection:
+        try:
+            return self._idle.get_nowait()
+        except queue.Empty:
+            pass
+
+        with self._lock:
+            can_open = self._opened < self.size
+            if can_open:
+                self._opened += 1
+        if can_open:
+            try:
+                return self._connect()
+            except Exception:
+                with self._lock:
+                    self._opened -= 1
+                raise
+
+        try:
+            return self._idle.get(timeout=self.timeout)
+        except queue.Empty:
+            raise HTTPException(status_code=503, detail="Database busy, try again.") from None
+
+    def release(self, conn: sqlite3.Connection, broken: bool = False):
+        if not broken:
+            try:
+                if conn.in_transaction:
+                    conn.rollback()
+                conn.row_factory = None
+                self._idle.put(conn)
+                return
+            except sqlite3.Error:
+                pass
+        conn.close()
+        with self._lock:
+            self._opened -= 1
+
+    @contextmanager
+    def connection(self):
+        conn = self.acquire()
+        broken = False
+        try:
+            yield conn
+        except sqlite3.DatabaseError as e:
+            # 연결 자체가 망가졌을 수 있는 에러면 풀에 돌려놓지 않음
+            broken = not isinstance(e, sqlite3.OperationalError)
+            raise
+        finally:
+            self.release(conn, broken=broken)
+
+    def close(self):
+        """idle 연결 모두 닫기 (사용 중인 연결은 release 때 다시 풀로 들어옴)"""
+        while True:
+            try:
+                conn = self._idle.get_nowait()
+            except queue.Empty:
+                return
+            conn.close()
+            with self._lock:
+                self._opened -= 1
+
+
+_pool = None
+_pool_lock = threading.Lock()
+
+
+def get_pool() -> ReadPool:
+    """FastAPI 의존성: 앱 전체에서 공유하는 ReadPool (DB 파일이 없으면 500)"""
+    global _pool
+    if not DB_PATH.exists():
+        raise HTTPException(status_code=500, detail="Database file (laneige.db) not found.")
+    if _pool is None:
+        with _pool_lock:
+            if _pool is None:
+                _pool = ReadPool(DB_PATH)
+    return _pool
+
+
+def get_db():
+    """FastAPI 의존성: 요청 1개 동안 쓸 읽기 전용 연결 (응답 후 풀로 반환)"""
+    with get_pool().connection() as conn:
+        yield conn
+
+
+def close_pool():
+    global _pool
+    with _pool_lock:
+        if _pool is not None:
+            _pool.close()
+            _pool = None
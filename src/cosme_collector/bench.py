@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import argparse
+import contextlib
+import io
+import json
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+# =========================
+# 수집 파이프라인 벤치마크 (replay archive 기반, 네트워크 없음)
+#
+#   python -m src.cosme_collector.bench --archive fixtures/cosme --scenario test full
+#   python -m src.cosme_collector.bench --archive ... --save-baseline bench_baseline.json
+#   python -m src.cosme_collector.bench --archive ... --baseline bench_baseline.json   (회귀 시 exit 1)
+#
+# - 시나리오 1개 = 별도 프로세스 (peak RSS 가 섞이지 않게)
+# - 측정: pages/sec(벽시계), CPU ms/page(process_time), peak RSS(MB)
+# - 속도 제한은 사실상 끔 (파이프라인 자체 처리량 측정), 지연/오류는 ReplayAdapter 로 주입
+# =========================
+
+SCENARIOS = {
+    "test": True,    # build_jobs(test_mode=True)
+    "full": False,   # build_jobs()
+}
+
+# 값이 클수록 좋은 지표 / 작을수록 좋은 지표
+HIGHER_IS_BETTER = ("pages_per_sec",)
+LOWER_IS_BETTER = ("cpu_ms_per_page", "peak_rss_mb")
+
+
+def _peak_rss_mb() -> float | None:
+    try:
+        import resource
+    except ImportError:  # Windows
+        return None
+    rss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux: KB, macOS: bytes
+    return rss / (1024 * 1024) if sys.platform == "darwin" else rss / 1024
+
+
+def run_scenario(
+    archive_dir: Path,
+    test_mode: bool,
+    latency_ms: float = 0.0,
+    jitter_ms: float = 0.0,
+    error_rate: float = 0.0,
+    drop_rate: float = 0.0,
+    parser_backend: str = "bs4",
+) -> dict:
+    """현재 프로세스에서 시나리오 1개 실행 (run_all 전체: 요청 → 파싱 → 이미지 → DataFrame)"""
+    from src.cosme_collector.config import build_paths, build_settings
+    from src.cosme_collector.document import HtmlDocument
+    from src.cosme_collector.http_client import build_rate_limiter, build_transport, fetch_html_safe
+    from src.cosme_collector.image_store import ImageStore
+    from src.cosme_collector.jobs import build_jobs
+    from src.cosme_collector.pipeline import run_all
+    from src.cosme_collector.replay import FixtureArchive, ReplayAdapter
+
+    base = Path(tempfile.mkdtemp(prefix="cosme-bench-"))
+    try:
+        settings = replace(
+            build_settings(base),
+            parser_backend=parser_backend,
+            rate_per_sec=1000.0, rate_burst=100, rate_max_per_sec=1000.0,
+            image_rate_per_sec=1000.0, image_rate_burst=100, image_rate_max_per_sec=1000.0,
+        )
+        paths = build_paths(settings, week=0)
+        adapter = ReplayAdapter(
+            FixtureArchive(archive_dir),
+            latency_ms=latency_ms,
+            jitter_ms=jitter_ms,
+            error_rate=error_rate,
+            drop_rate=drop_rate,
+        )
+        session = build_transport(settings, adapter=adapter)
+        limiter = build_rate_limiter(settings)
+        jobs = build_jobs(test_mode=test_mode)
+        fetch_fn = lambda url: HtmlDocument(fetch_html_safe(session, settings, url, limiter=limiter), url)
+
+        cpu0 = time.process_time()
+        t0 = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            df = run_all(
+                session=session,
+                settings=settings,
+                jobs=jobs,
+                html_cache_dir=paths["html_cache_dir"],
+                img_dir=paths["img_dir"],
+                fetch_html_fn=fetch_fn,
+                download_images=True,
+                image_store=ImageStore(paths["image_store_dir"]),
+            )
+        wall = time.perf_counter() - t0
+        cpu = time.process_time() - cpu0
+        session.close()
+
+        pages = sum(len(job["urls"]) for job in jobs)
+        return {
+            "pages": pages,
+            "rows": int(len(df)),
+            "wall_sec": round(wall, 4),
+            "pages_per_sec": round(pages / wall, 3) if wall > 0 else None,
+            "cpu_ms_per_page": round(cpu / pages * 1000, 3) if pages else None,
+            "peak_rss_mb": round(_peak_rss_mb() or 0.0, 1),
+            "replay": dict(adapter.stats),
+        }
+    finally:
+        shutil.rmtree(base, ignore_errors=True)
+
+
+def run_isolated(name: str, args: argparse.Namespace) -> dict:
+    """시나리오를 자식 프로세스로 실행하고 결과 JSON(마지막 줄)을 받음"""
+    cmd = [
+        sys.executable, "-m", "src.cosme_collector.bench",
+        "--child", name,
+        "--archive", str(args.archive),
+        "--latency-ms", str(args.latency_ms),
+        "--jitter-ms", str(args.jitter_ms),
+        "--error-rate", str(args.error_rate),
+        "--drop-rate", str(args.drop_rate),
+        "--parser", args.parser,
+    ]
+    out = subprocess.run(cmd, capture_output=True, text=True, cwd=Path(__file__).resolve().parents[2])
+    if out.returncode != 0:
+        raise RuntimeError(f"[BENCH] {name} failed:\n{out.stderr[-2000:]}")
+    return json.loads(out.stdout.strip().splitlines()[-1])
+
+
+def compare(results: dict, baseline: dict, tolerance: float) -> list[str]:
+    """기준 대비 tolerance(비율) 이상 나빠진 지표 목록"""
+    problems = []
+    for name, cur in results.items():
+        base = baseline.get(name)
+        if not base:
+            continue
+        for key in HIGHER_IS_BETTER:
+            if base.get(key) and cur.get(key) is not None and cur[key] < base[key] * (1 - tolerance):
+                problems.append(f"{name}.{key}: {cur[key]} < {base[key]} (-{tolerance:.0%})")
+        for key in LOWER_IS_BETTER:
+            if base.get(key) and cur.get(key) is not None and cur[key] > base[key] * (1 + tolerance):
+                problems.append(f"{name}.{key}: {cur[key]} > {base[key]} (+{tolerance:.0%})")
+    return problems
+
+
+def main():
+    parser = argparse.ArgumentParser(description="cosme_collector end-to-end benchmark (replay)")
+    parser.add_argument("--archive", type=Path, required=True, help="replay fixture archive 디렉터리")
+    parser.add_argument("--scenario", nargs="+", choices=sorted(SCENARIOS), default=["test", "full"])
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--drop-rate", type=float, default=0.0)
+    parser.add_argument("--parser", default="bs4")
+    parser.add_argument("--out", type=Path, default=None, help="결과 JSON 저장")
+    parser.add_argument("--baseline", type=Path, default=None, help="기준 JSON 과 비교, 회귀 시 exit 1")
+    parser.add_argument("--save-baseline", type=Path, default=None)
+    parser.add_argument("--tolerance", type=float, default=0.2, help="허용 악화 비율 (기본 20%%)")
+    parser.add_argument("--child", default=None, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        result = run_scenario(
+            args.archive,
+            test_mode=SCENARIOS[args.child],
+            latency_ms=args.latency_ms,
+            jitter_ms=args.jitter_ms,
+            error_rate=args.error_rate,
+            drop_rate=args.drop_rate,
+            parser_backend=args.parser,
+        )
+        print(json.dumps(result))
+        return
+
+    results = {}
+    for name in args.scenario:
+        results[name] = r = run_isolated(name, args)
+        print(
+            f"[BENCH] {name}: pages={r['pages']} rows={r['rows']} "
+            f"{r['pages_per_sec']} pages/s, {r['cpu_ms_per_page']} cpu-ms/page, peak {r['peak_rss_mb']} MB",
+            flush=True,
+        )
+
+    if args.out:
+        args.out.write_text(json.dumps(results, indent=2), encoding="utf-8")
+    if args.save_baseline:
+        args.save_baseline.write_text(json.dumps(results, indent=2), encoding="utf-8")
+        print(f"[BENCH] baseline saved: {args.save_baseline}")
+
+    if args.baseline:
+        problems = compare(results, json.loads(args.baseline.read_text(encoding="utf-8")), args.tolerance)
+        for p in problems:
+            print(f"[BENCH REGRESSION] {p}")
+        if problems:
+            sys.exit(1)
+        print("[BENCH] no regressions")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,8 +1,14 @@
 from __future__ import annotations
 
+import hashlib
+import json
+import os
 import re
+import threading
+import time
+from dataclasses import dataclass, asdict
 from pathlib import Path
-from urllib.parse import quote
+from typing import Callable, Optional
 
 
 def safe_filename(s: str) -> str:
@@ -10,9 +16,183 @@ def safe_filename(s: str) -> str:
     return s[:180]
 
 
-def cache_path_for(html_cache_dir: Path, job: dict, url: str) -> Path:
-    key = f'{job["category_id"]}__{job["ranking_type"]}__{quote(url, safe="")}'
-    return html_cache_dir / (safe_filename(key) + ".html")
+def cache_key(url: str) -> str:
+    """URL → sha256 키 (잘린 safe_filename 과 달리 충돌 없음)"""
+    return hashlib.sha256(url.encode("utf-8")).hexdigest()
+
+
+@dataclass
+class CacheMeta:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    fetched_at: float        # 본문을 마지막으로 받은 시각 (200)
+    validated_at: float      # 마지막으로 서버와 확인한 시각 (200/304)
+    accessed_at: float       # LRU 기준
+    content_sha256: str
+    size: int
+
+
+class HtmlCache:
+    """
+    HTML 페이지 캐시
+    - 키: sha256(url)  →  {dir}/{key[:2]}/{key}.html + {key}.json(메타)
+    - 메타: ETag / Last-Modified / 받은 시각 / 본문 해시
+    - TTL 이내: 네트워크 없이 캐시 반환
+    - TTL 경과: If-None-Match / If-Modified-Since 로 재검증 → 304면 캐시 본문 재사용
+    - 전체 크기가 max_bytes 를 넘으면 오래 안 쓴 항목부터 삭제 (LRU)
+    - 여러 fetch 스레드에서 동시에 써도 안전
+    """
+
+    def __init__(self, cache_dir: Path, ttl_sec: float = 6 * 3600, max_bytes: int = 512 * 1024 * 1024):
+        self.cache_dir = Path(cache_dir)
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.ttl_sec = ttl_sec
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index: dict[str, CacheMeta] = {}
+        self._total = 0
+        self._load_index()
+
+    # -------------------------
+    # 파일 경로 / 인덱스
+    # -------------------------
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        d = self.cache_dir / key[:2]
+        return d / f"{key}.html", d / f"{key}.json"
+
+    def _load_index(self):
+        for meta_path in self.cache_dir.glob("*/*.json"):
+            try:
+                meta = CacheMeta(**json.loads(meta_path.read_text(encoding="utf-8")))
+            except Exception:
+                continue
+            self._index[meta_path.stem] = meta
+            self._total += meta.size
+
+    def _write_meta(self, key: str, meta: CacheMeta):
+        _, meta_path = self._paths(key)
+        tmp = meta_path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(asdict(meta), ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, meta_path)
+
+    def _remove(self, key: str):
+        meta = self._index.pop(key, None)
+        if meta:
+            self._total -= meta.size
+        for p in self._paths(key):
+            p.unlink(missing_ok=True)
+
+    def _evict(self):
+        if self._total <= self.max_bytes:
+            return
+        for key, _ in sorted(self._index.items(), key=lambda kv: kv[1].accessed_at):
+            if self._total <= self.max_bytes:
+                break
+            self._remove(key)
+
+    # -------------------------
+    # 기본 연산
+    # -------------------------
+    def get(self, url: str) -> tuple[str, CacheMeta] | None:
+        """캐시된 본문 + 메타 (본문 해시가 안 맞으면 버림)"""
+        key = cache_key(url)
+        with self._lock:
+            meta = self._index.get(key)
+            if meta is None:
+                return None
+            html_path, _ = self._paths(key)
+            try:
+                # 바이트 그대로 읽음 (read_text 는 \r\n → \n 변환 → put 때 해시와 달라짐)
+                data = html_path.read_bytes()
+            except OSError:
+                self._remove(key)
+                return None
+            if hashlib.sha256(data).hexdigest() != meta.content_sha256:
+                self._remove(key)
+                return None
+            # LRU 순서가 재시작 후에도 유지되도록 메타 파일에도 기록
+            meta.accessed_at = time.time()
+            self._write_meta(key, meta)
+            return data.decode("utf-8"), meta
+
+    def put(self, url: str, html: str, etag: str | None = None, last_modified: str | None = None) -> CacheMeta:
+        key = cache_key(url)
+        now = time.time()
+        data = html.encode("utf-8", errors="ignore")
+        meta = CacheMeta(
+            url=url,
+            etag=etag,
+            last_modified=last_modified,
+            fetched_at=now,
+            validated_at=now,
+            accessed_at=now,
+            content_sha256=hashlib.sha256(data).hexdigest(),
+            size=len(data),
+        )
+        with self._lock:
+            html_path, _ = self._paths(key)
+            html_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = html_path.with_suffix(".html.tmp")
+            tmp.write_bytes(data)
+            os.replace(tmp, html_path)
+            self._write_meta(key, meta)
+
+            old = self._index.get(key)
+            if old:
+                self._total -= old.size
+            self._index[key] = meta
+            self._total += meta.size
+            self._evict()
+        return meta
+
+    def mark_validated(self, url: str):
+        """304 응답: 본문은 그대로, 확인 시각만 갱신"""
+        key = cache_key(url)
+        with self._lock:
+            meta = self._index.get(key)
+            if meta is None:
+                return
+            meta.validated_at = meta.accessed_at = time.time()
+            self._write_meta(key, meta)
+
+    def is_fresh(self, meta: CacheMeta) -> bool:
+        return (time.time() - meta.validated_at) < self.ttl_sec
+
+    # -------------------------
+    # 조건부 요청 포함 fetch
+    # -------------------------
+    def fetch(self, url: str, fetch_fn: Callable, force_refresh: bool = False) -> str:
+        """
+        fetch_fn(url, headers) -> requests.Response (200 또는 304)
+        """
+        cached = None if force_refresh else self.get(url)
+        if cached is not None:
+            html, meta = cached
+            if self.is_fresh(meta):
+                return html
+
+            headers = {}
+            if meta.etag:
+                headers["If-None-Match"] = meta.etag
+            if meta.last_modified:
+                headers["If-Modified-Since"] = meta.last_modified
+
+            r = fetch_fn(url, headers)
+            if r.status_code == 304:
+                self.mark_validated(url)
+                return html
+        else:
+            r = fetch_fn(url, {})
+
+        html = r.text or ""
+        self.put(
+            url,
+            html,
+            etag=r.headers.get("ETag"),
+            last_modified=r.headers.get("Last-Modified"),
+        )
+        return html
 
 
 def load_or_save_html(
@@ -22,13 +202,15 @@ def load_or_save_html(
     fetch_fn,
     force_refresh: bool = False,
 ) -> str:
-    path = cache_path_for(html_cache_dir, job, url)
-    if path.exists() and not force_refresh:
-        html = path.read_text(encoding="utf-8", errors="ignore")
-
-        if len(html) > 5000 and "</html>" in html.lower():
-            return html
+    """
+    (호환용) fetch_fn(url) -> str 만 있는 경우
+    조건부 요청 없이 TTL 기준으로만 캐시
+    """
+    cache = HtmlCache(html_cache_dir)
+    cached = None if force_refresh else cache.get(url)
+    if cached is not None and cache.is_fresh(cached[1]):
+        return cached[0]
 
     html = fetch_fn(url)
-    path.write_text(html, encoding="utf-8", errors="ignore")
+    cache.put(url, html)
     return html
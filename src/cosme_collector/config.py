@@ -12,12 +12,37 @@ class Settings:
     today: str
 
     # throttle
-    request_sleep_sec: float = 1.3
     retry: int = 3
     timeout: int = 25
-    session_pause_every: int = 20
-    session_pause_sec: float = 6.0
-    image_sleep_sec: float = 0.6
+
+    # shared transport (커넥션 풀, transport.Transport)
+    pool_connections: int = 10      # 풀을 유지할 호스트 수
+    pool_maxsize: int = 8           # 호스트당 연결 수 (www.cosme.net 은 fetch_workers)
+
+    # concurrent fetch (호스트별 token bucket, AIMD 로 rate_min ~ rate_max 사이에서 조절)
+    fetch_workers: int = 4
+    rate_per_sec: float = 2.0           # 시작 속도
+    rate_burst: int = 4
+    rate_min_per_sec: float = 0.2
+    rate_max_per_sec: float = 4.0
+    latency_target_sec: float = 3.0     # 이보다 느린 응답에서는 속도를 올리지 않음
+
+    # circuit breaker (호스트별 연속 실패 → cooldown 동안 요청 중단)
+    breaker_failures: int = 5
+    breaker_cooldown_sec: float = 30.0
+
+    # background image download pool (별도 token bucket)
+    image_workers: int = 3
+    image_rate_per_sec: float = 1.5
+    image_rate_burst: int = 2
+    image_rate_max_per_sec: float = 3.0
+
+    # parser backend: "bs4"(기준 구현) / "lxml"(컴파일된 XPath, 대량 재파싱용)
+    parser_backend: str = "bs4"
+
+    # html cache (output/cosme/_html)
+    html_cache_ttl_sec: int = 6 * 3600
+    html_cache_max_mb: int = 512
 
     # headers
     user_agent: str = (
@@ -42,8 +67,9 @@ def build_paths(settings: Settings, week: int) -> dict[str, Path]:
     cosme_crawler의 결과물은 output/cosme 아래로 모읍니다.
     - CSV: output/cosme/{today}_cosme_rankings_raw.csv
     - Split CSV: output/cosme/{today}_cosme_rankings_csv_split/ -> 제거
-    - HTML cache: output/cosme/{today}_html/ -> 제거
-    - Images: output/cosme/{today}_images/
+    - HTML cache: output/cosme/_html/ (url 해시 키, TTL + 조건부 재검증, 실행 간 유지)
+    - Images: output/cosme/week{N}_images/ (+ 공통 저장소 output/cosme/_images/)
+    - Parquet dataset (--parquet): output/dataset/source=cosme/week={N}/category_id=.../
     """
 
     cosme_out_dir = settings.output_dir / "cosme"
@@ -52,6 +78,9 @@ def build_paths(settings: Settings, week: int) -> dict[str, Path]:
     # 주차별 CSV 한 파일로 저장
     week_csv = cosme_out_dir / f"week{week}_cosme.csv"
 
+    # 크롤링 중 페이지마다 이어쓰는 부분 결과 (정상 종료 시 삭제)
+    partial_csv = cosme_out_dir / f"week{week}_cosme.partial.csv"
+
     # 주차별 이미지 폴더
     img_dir = cosme_out_dir / f"week{week}_images"
     img_dir.mkdir(parents=True, exist_ok=True)
@@ -62,9 +91,33 @@ def build_paths(settings: Settings, week: int) -> dict[str, Path]:
     html_cache_dir = cosme_out_dir / "_html"
     html_cache_dir.mkdir(parents=True, exist_ok=True)
 
+    # 크롤링 진행 기록 (--resume 용)
+    journal_path = cosme_out_dir / f"week{week}_journal.jsonl"
+
+    # 주차 공통 이미지 저장소 (weekN_images 는 여기로의 하드링크)
+    image_store_dir = cosme_out_dir / "_images"
+    image_store_dir.mkdir(parents=True, exist_ok=True)
+
+    # 수집 결과 Parquet 데이터셋 (source / week / category_id 파티션)
+    dataset_dir = settings.output_dir / "dataset"
+
+    # 증분 수집 상태 (--incremental, 페이지 지문 + 지난 Row)
+    incremental_state = cosme_out_dir / "_incremental.json"
+
+    # 계측 결과 (--metrics)
+    metrics_json = cosme_out_dir / f"week{week}_metrics.json"
+    metrics_prom = cosme_out_dir / f"week{week}_metrics.prom"
+
     return {
         "week_csv": week_csv,
+        "partial_csv": partial_csv,
         "img_dir": img_dir,
         # "split_out_dir": split_out_dir,
         "html_cache_dir": html_cache_dir,
+        "image_store_dir": image_store_dir,
+        "journal_path": journal_path,
+        "dataset_dir": dataset_dir,
+        "incremental_state": incremental_state,
+        "metrics_json": metrics_json,
+        "metrics_prom": metrics_prom,
     }
@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import argparse
+import re
+from pathlib import Path
+
+import pandas as pd
+
+from src.cosme_collector.pipeline import CATEGORICAL_COLUMNS, Row
+from src.cosme_collector.sinks import row_field_types
+
+# =========================
+# Parquet 데이터셋 (수집 결과의 기준 저장소, pyarrow 필요)
+#
+# output/dataset/
+#   source=cosme/week=3/category_id=800/part-0.parquet
+#   source=amazon/week=3/category=Lip Care Products/part-0.parquet
+#
+# - 스키마 고정: cosme 는 pipeline.Row 에서, amazon 은 CSV 헤더 기준으로 정의
+#   (product_id / productcode 는 항상 string)
+# - 값 종류가 적은 컬럼은 dictionary 인코딩, 파일은 zstd 압축
+# - 읽을 때는 필요한 week / category 파티션과 컬럼만 읽음
+# =========================
+
+COSME_PARTITIONS = ("week", "category_id")
+AMAZON_PARTITIONS = ("week", "category")
+
+AMAZON_FIELDS: list[tuple[str, type]] = [
+    ("crawldate", str),
+    ("platform", str),
+    ("category_id", str),
+    ("category", str),
+    ("priceoriginal", float),
+    ("discountrate", float),
+    ("imageurl", str),
+    ("producturl", str),
+    ("badges", str),
+    ("rank", int),
+    ("rank_change_text", str),
+    ("productcode", str),
+    ("productname", str),
+    ("brandname", str),
+    ("rating", float),
+    ("reviewcount", int),
+    ("source", str),
+]
+AMAZON_CATEGORICAL = ("crawldate", "platform", "category_id", "source", "rank_change_text", "badges")
+
+COSME_FIELDS: list[tuple[str, type]] = row_field_types(Row)
+
+
+def _require_pyarrow():
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError as e:
+        raise RuntimeError("Parquet 데이터셋은 pyarrow 가 필요합니다: pip install pyarrow") from e
+
+
+def _schema(field_types: list[tuple[str, type]], categorical: tuple[str, ...], partitions: tuple[str, ...]):
+    import pyarrow as pa
+
+    to_pa = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+    out = []
+    for name, tp in field_types:
+        if name in partitions:
+            continue
+        if name in categorical:
+            out.append((name, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            out.append((name, to_pa.get(tp, pa.string())))
+    return pa.schema(out)
+
+
+def _partitioning(partitions: tuple[str, ...]):
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    types = {"week": pa.int32()}
+    return ds.partitioning(
+        pa.schema([(p, types.get(p, pa.string())) for p in partitions]),
+        flavor="hive",
+    )
+
+
+def _coerce(df: pd.DataFrame, field_types: list[tuple[str, type]]) -> pd.DataFrame:
+    """CSV/DataFrame 값 타입을 고정 스키마에 맞춤 (없는 컬럼은 빈 값으로 추가)"""
+    out = pd.DataFrame(index=df.index)
+    for name, tp in field_types:
+        col = df[name] if name in df.columns else pd.Series(None, index=df.index, dtype=object)
+        if tp is int:
+            out[name] = pd.to_numeric(col, errors="coerce").astype("Int64")
+        elif tp is float:
+            out[name] = pd.to_numeric(col, errors="coerce").astype("float64")
+        else:
+            if isinstance(col.dtype, pd.CategoricalDtype):
+                col = col.astype(object)
+            out[name] = col.map(_to_str, na_action="ignore").astype(object).where(col.notna(), None)
+    return out
+
+
+def _to_str(v) -> str:
+    # CSV 에서 float 로 읽힌 정수 id(10276493.0) 는 정수 문자열로
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v)
+
+
+def _write(df: pd.DataFrame, root: Path, field_types, categorical, partitions, week: int):
+    _require_pyarrow()
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+
+    data = _coerce(df, field_types)
+    data["week"] = week
+    schema = _schema(field_types, categorical, partitions)
+    for p in partitions:
+        schema = schema.append(pa.field(p, pa.int32() if p == "week" else pa.string()))
+    table = pa.Table.from_pandas(data[schema.names], schema=schema, preserve_index=False)
+
+    ds.write_dataset(
+        table,
+        base_dir=str(root),
+        format="parquet",
+        partitioning=_partitioning(partitions),
+        basename_template="part-{i}.parquet",
+        existing_data_behavior="delete_matching",   # 같은 주차/카테고리 재실행 시 교체
+        file_options=ds.ParquetFileFormat().make_write_options(compression="zstd"),
+    )
+
+
+def _read(root: Path, partitions, weeks=None, filters: dict | None = None, columns=None) -> pd.DataFrame:
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    if not root.exists():
+        return pd.DataFrame(columns=columns or [])
+
+    dataset = ds.dataset(str(root), format="parquet", partitioning=_partitioning(partitions))
+    expr = None
+    if weeks is not None:
+        expr = ds.field("week").isin([int(w) for w in weeks])
+    for name, values in (filters or {}).items():
+        if values is None:
+            continue
+        e = ds.field(name).isin([str(v) for v in values])
+        expr = e if expr is None else expr & e
+    return dataset.to_table(filter=expr, columns=columns).to_pandas()
+
+
+# -------------------------
+# cosme
+# -------------------------
+def cosme_root(dataset_root: Path) -> Path:
+    return Path(dataset_root) / "source=cosme"
+
+
+def write_cosme_week(df: pd.DataFrame, dataset_root: Path, week: int):
+    _write(df, cosme_root(dataset_root), COSME_FIELDS, CATEGORICAL_COLUMNS, COSME_PARTITIONS, week)
+
+
+def read_cosme(
+    dataset_root: Path,
+    weeks: list[int] | None = None,
+    category_ids: list[str] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    return _read(cosme_root(dataset_root), COSME_PARTITIONS, weeks, {"category_id": category_ids}, columns)
+
+
+# -------------------------
+# amazon
+# -------------------------
+def amazon_root(dataset_root: Path) -> Path:
+    return Path(dataset_root) / "source=amazon"
+
+
+def write_amazon_week(df: pd.DataFrame, dataset_root: Path, week: int):
+    _write(df, amazon_root(dataset_root), AMAZON_FIELDS, AMAZON_CATEGORICAL, AMAZON_PARTITIONS, week)
+
+
+def read_amazon(
+    dataset_root: Path,
+    weeks: list[int] | None = None,
+    categories: list[str] | None = None,
+    columns: list[str] | None = None,
+) -> pd.DataFrame:
+    return _read(amazon_root(dataset_root), AMAZON_PARTITIONS, weeks, {"category": categories}, columns)
+
+
+# -------------------------
+# 기존 CSV → 데이터셋 (백필)
+# -------------------------
+def week_of(path: Path) -> int | None:
+    m = re.match(r"week(\d+)_(cosme|amazon)\.csv$", path.name, re.IGNORECASE)
+    return int(m.group(1)) if m else None
+
+
+def read_csv_typed(path: Path, field_types: list[tuple[str, type]]) -> pd.DataFrame:
+    """문자열 컬럼은 str 로 읽어서 id 가 숫자로 바뀌지 않게 함"""
+    dtype = {name: str for name, tp in field_types if tp is str}
+    return pd.read_csv(path, dtype=dtype, encoding="utf-8-sig")
+
+
+def backfill_from_csv(output_dir: Path, dataset_root: Path):
+    for csv_path in sorted((output_dir / "cosme").glob("week*_cosme.csv")):
+        week = week_of(csv_path)
+        if week is None:
+            continue
+        write_cosme_week(read_csv_typed(csv_path, COSME_FIELDS), dataset_root, week)
+        print(f"[DATASET] cosme week{week} <- {csv_path.name}")
+
+    for csv_path in sorted((output_dir / "amazon").glob("*_amazon.csv")):
+        week = week_of(csv_path)
+        if week is None:
+            continue
+        write_amazon_week(read_csv_typed(csv_path, AMAZON_FIELDS), dataset_root, week)
+        print(f"[DATASET] amazon week{week} <- {csv_path.name}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="output/*.csv → output/dataset (Parquet)")
+    parser.add_argument("--output-dir", type=Path, default=Path(__file__).resolve().parents[2] / "output")
+    args = parser.parse_args()
+    backfill_from_csv(args.output_dir, args.output_dir / "dataset")
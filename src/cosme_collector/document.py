@@ -0,0 +1,83 @@
+from __future__ import annotations
+
+import html as html_lib
+import re
+
+from bs4 import BeautifulSoup
+from lxml import etree
+
+# <head> 범위만 보고 끝내는 정규식 (전체 트리 생성 X)
+_HEAD_END_RE = re.compile(r"</head\s*>|<body[\s>]", re.IGNORECASE)
+_TITLE_RE = re.compile(r"<title[^>]*>(.*?)</title\s*>", re.IGNORECASE | re.DOTALL)
+_LINK_TAG_RE = re.compile(r"<link\b[^>]*>", re.IGNORECASE)
+_REL_CANONICAL_RE = re.compile(r"""\brel\s*=\s*["']?canonical\b""", re.IGNORECASE)
+_HREF_RE = re.compile(r"""\bhref\s*=\s*(?:"([^"]*)"|'([^']*)'|([^\s>]+))""", re.IGNORECASE)
+
+# </head>를 못 찾는 비정상 페이지는 앞부분만 봄
+_HEAD_SCAN_LIMIT = 64 * 1024
+
+
+class HtmlDocument:
+    """
+    페이지 1개를 한 번만 파싱해서 여러 단계가 같이 쓰는 문서 객체
+    - title / canonical : <head> 구간 정규식으로만 추출 (차단 페이지 검사용, 트리 생성 X)
+    - soup              : 처음 접근할 때 lxml 로 1회 파싱 후 재사용 (bs4 백엔드)
+    - tree              : lxml.etree 루트 (lxml 백엔드, soup 없이 바로 파싱)
+    """
+
+    __slots__ = ("html", "url", "_head", "_title", "_soup", "_tree")
+
+    def __init__(self, html: str, url: str = ""):
+        self.html = html or ""
+        self.url = url
+        self._head: str | None = None
+        self._title: str | None = None
+        self._soup: BeautifulSoup | None = None
+        self._tree = None
+
+    @property
+    def head(self) -> str:
+        if self._head is None:
+            m = _HEAD_END_RE.search(self.html, 0, _HEAD_SCAN_LIMIT)
+            self._head = self.html[: m.start() if m else _HEAD_SCAN_LIMIT]
+        return self._head
+
+    @property
+    def title(self) -> str:
+        if self._title is None:
+            m = _TITLE_RE.search(self.head)
+            self._title = html_lib.unescape(m.group(1)).strip() if m else ""
+        return self._title
+
+    @property
+    def canonical(self) -> str:
+        for tag in _LINK_TAG_RE.findall(self.head):
+            if not _REL_CANONICAL_RE.search(tag):
+                continue
+            m = _HREF_RE.search(tag)
+            if m:
+                return html_lib.unescape(next(g for g in m.groups() if g is not None))
+        return ""
+
+    @property
+    def soup(self) -> BeautifulSoup:
+        if self._soup is None:
+            self._soup = BeautifulSoup(self.html, "lxml")
+        return self._soup
+
+    @property
+    def tree(self):
+        """빈 문서면 None"""
+        if self._tree is None and self.html:
+            self._tree = etree.HTML(self.html)
+        return self._tree
+
+    def text(self, sep: str = "\n") -> str:
+        return self.soup.get_text(sep, strip=True)
+
+
+def as_document(doc: str | HtmlDocument, url: str = "") -> HtmlDocument:
+    """str 이면 HtmlDocument 로 감싸고, 이미 문서면 그대로 반환"""
+    if isinstance(doc, HtmlDocument):
+        return doc
+    return HtmlDocument(doc, url=url)
@@ -0,0 +1,54 @@
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Iterator
+
+from src.cosme_collector import metrics
+
+
+def iter_pages(
+    jobs: list[dict],
+    fetch_fn: Callable[[str], str],
+    max_workers: int = 4,
+    prefetch: int | None = None,
+    skip: Callable[[dict, str], bool] | None = None,
+) -> Iterator[tuple[dict, str, str | None]]:
+    """
+    jobs의 모든 url을 스레드 풀로 동시에 받아오면서
+    (job, url, html)을 jobs/urls 순서 그대로 yield
+
+    - 동시에 진행되는 요청 수: max_workers
+    - 미리 받아두는 페이지 수: prefetch (기본 max_workers * 2)
+    - 호출 측이 앞 페이지를 파싱하는 동안 뒤 페이지 요청이 계속 진행됨
+    - 요청 속도 제한은 fetch_fn(= fetch_html_safe + HostRateLimiter) 쪽에서 처리
+    - skip(job, url) 이 True 인 페이지는 요청하지 않고 html=None 으로 순서만 맞춰 yield
+    """
+    tasks = iter([(job, url) for job in jobs for url in job["urls"]])
+    window = max(1, prefetch or max_workers * 2)
+
+    ex = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="cosme-fetch")
+    pending: deque = deque()
+
+    def _fill():
+        while len(pending) < window:
+            nxt = next(tasks, None)
+            if nxt is None:
+                return
+            job, url = nxt
+            if skip is not None and skip(job, url):
+                pending.append((job, url, None))
+            else:
+                # 워커 스레드에서도 job 별로 계측되도록 컨텍스트를 붙여서 실행
+                pending.append((job, url, ex.submit(metrics.bind(fetch_fn, job), url)))
+
+    try:
+        _fill()
+        while pending:
+            job, url, fut = pending.popleft()
+            html = fut.result() if fut is not None else None
+            _fill()
+            yield job, url, html
+    finally:
+        # 실패/중단 시 아직 시작 안 한 요청은 버림
+        ex.shutdown(wait=True, cancel_futures=True)
@@ -2,33 +2,54 @@ from __future__ import annotations
 
 import time
 import requests
-from bs4 import BeautifulSoup
+from requests.adapters import HTTPAdapter
 
+from src.cosme_collector import metrics
 from src.cosme_collector.config import Settings
-
-
-def build_session(settings):
-    s = requests.Session()
-    s.headers.update({
-        "User-Agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
-            "AppleWebKit/537.36 (KHTML, like Gecko) "
-            "Chrome/120.0.0.0 Safari/537.36"
-        ),
-        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
-        "Accept-Language": "ja,en-US;q=0.9,en;q=0.8,ko;q=0.7",
-        "Connection": "keep-alive",
-        "Upgrade-Insecure-Requests": "1",
-    })
-    return s
-
-
-def _looks_blocked_or_wrong(html: str, requested_url: str = "") -> bool:
-    if not html:
+from src.cosme_collector.document import HtmlDocument, as_document
+from src.cosme_collector.rate_limit import (
+    BLOCKED,
+    ERROR,
+    AdaptiveHostLimiter,
+    CircuitOpenError,
+    HostRateLimiter,
+    backoff_delay,
+)
+from src.cosme_collector.transport import HttpSession, Transport
+
+
+def build_transport(settings: Settings, adapter: HTTPAdapter | None = None) -> Transport:
+    """
+    모든 수집 요청이 공유하는 커넥션 풀
+    - www.cosme.net: 페이지 워커 수만큼 연결 유지
+    - 그 외(이미지 CDN 등): settings.pool_maxsize
+    - adapter: 녹화/재생(replay.py) 등 실제 네트워크 대신 쓸 adapter
+    """
+    return Transport(
+        pool_connections=settings.pool_connections,
+        pool_maxsize=settings.pool_maxsize,
+        host_pool_sizes={"www.cosme.net": max(settings.fetch_workers, 1)},
+        adapter=adapter,
+    )
+
+
+def build_session(settings) -> requests.Session:
+    """(호환용) 현재 스레드 전용 Session. 여러 스레드에서 쓸 때는 build_transport 사용"""
+    return build_transport(settings).session()
+
+
+def _looks_blocked_or_wrong(doc: str | HtmlDocument, requested_url: str = "") -> bool:
+    """
+    로그인/가입 페이지 등 잘못된 페이지 판별
+    - title / canonical 은 <head> 정규식으로만 확인 (전체 트리 파싱 X)
+    - 본문 텍스트가 필요한 블로그(/beautist) 검사만 doc.text() 로 전체 파싱
+      (이 검사용 파싱이라 추출 단계에서 재사용되지 않음 → 제품 랭킹 페이지는 파싱 비용 없음)
+    """
+    doc = as_document(doc, url=requested_url)
+    if not doc.html:
         return True
 
-    soup = BeautifulSoup(html, "html.parser")
-    title = (soup.title.get_text(" ", strip=True) if soup.title else "") or ""
+    title = doc.title
 
     # 확실한 로그인/가입 페이지 타이틀만 강하게 차단
     if "ログイン／メンバー登録" in title:
@@ -38,35 +59,108 @@ def _looks_blocked_or_wrong(html: str, requested_url: str = "") -> bool:
 
     # 블로그 쪽만 canonical 체크 (제품 랭킹에는 적용 X)
     if "/beautist" in requested_url:
-        canon = soup.select_one('link[rel="canonical"]')
-        canonical = (canon.get("href") if canon else "") or ""
-        if canonical.rstrip("/") == "https://www.cosme.net/beautist":
+        if doc.canonical.rstrip("/") == "https://www.cosme.net/beautist":
             return True
 
     # “문구 기반 차단 판단”은 블로그에서만 적용
     if "/beautist" in requested_url:
-        txt = soup.get_text("\n", strip=True)
+        txt = doc.text("\n")
         if "会員登録(無料)" in txt and "ログイン" in txt and "ブログ TOP" not in txt:
             return True
 
     return False
 
 
-def fetch_html_safe(session: requests.Session, settings: Settings, url: str) -> str:
+def build_rate_limiter(settings: Settings) -> AdaptiveHostLimiter:
+    return AdaptiveHostLimiter(
+        rate=settings.rate_per_sec,
+        burst=settings.rate_burst,
+        min_rate=settings.rate_min_per_sec,
+        max_rate=settings.rate_max_per_sec,
+        latency_target=settings.latency_target_sec,
+        breaker_failures=settings.breaker_failures,
+        breaker_cooldown=settings.breaker_cooldown_sec,
+    )
+
+
+def fetch_html_response(
+    session: HttpSession,
+    settings: Settings,
+    url: str,
+    limiter: HostRateLimiter | None = None,
+    headers: dict | None = None,
+) -> requests.Response:
+    """
+    재시도 + 차단 페이지 검사까지 끝난 Response 반환
+    - headers 로 If-None-Match / If-Modified-Since 를 넘기면 304 도 그대로 반환
+    - 응답 결과(429/5xx/차단 페이지/지연)는 limiter 에 알려서 속도 조절
+    - 서킷이 열려 있으면 요청하지 않고 cooldown 만큼 기다렸다가 재시도
+    """
     last_err = None
     for i in range(settings.retry):
+        if i:
+            metrics.inc("http.retries")
         try:
-            r = session.get(url, timeout=settings.timeout, allow_redirects=True)
+            if limiter is not None:
+                metrics.inc("sleep.rate_limit_sec", limiter.acquire(url))
+            metrics.inc("http.requests")
+            try:
+                with metrics.timed("http.fetch"):
+                    r = session.get(url, timeout=settings.timeout, allow_redirects=True, headers=headers)
+            except requests.RequestException:
+                metrics.inc("http.errors")
+                if limiter is not None:
+                    limiter.record_failure(url, ERROR)
+                raise
+            # 성공은 차단 페이지 검사 뒤에 기록 (로그인 페이지 200 이 실패 카운트를 초기화하지 않도록)
+            failed = limiter is not None and limiter.observe_failure(url, r)
+            if r.status_code >= 400:
+                metrics.inc("http.errors")
+                if limiter is not None and not failed:
+                    limiter.observe_success(url, r)
             r.raise_for_status()
-            html = r.text or ""
-
-            if _looks_blocked_or_wrong(html, requested_url=url):
+            if r.status_code == 304:
+                metrics.inc("http.not_modified")
+                if limiter is not None:
+                    limiter.observe_success(url, r)
+                return r
+            metrics.inc("http.bytes", len(r.content))
+
+            with metrics.timed("http.block_check"):
+                blocked = _looks_blocked_or_wrong(HtmlDocument(r.text or "", url), requested_url=url)
+            if blocked:
+                metrics.inc("http.blocked")
+                if limiter is not None:
+                    limiter.record_failure(url, BLOCKED)
                 raise RuntimeError(f"BLOCKED/WRONG PAGE: {url}  final={r.url}")
 
-            return html
+            if limiter is not None:
+                limiter.observe_success(url, r)
+            return r
 
+        except CircuitOpenError as e:
+            last_err = e
+            metrics.inc("http.circuit_open")
+            if i < settings.retry - 1:
+                metrics.inc("sleep.backoff_sec", e.retry_in)
+                time.sleep(e.retry_in)
         except Exception as e:
             last_err = e
-            time.sleep(1.0 + i)
+            if i < settings.retry - 1:
+                delay = backoff_delay(i)
+                metrics.inc("sleep.backoff_sec", delay)
+                time.sleep(delay)
 
+    metrics.inc("http.failed")
     raise RuntimeError(f"FETCH FAILED: {url} :: {last_err}")
+
+
+def fetch_html_safe(
+    session: HttpSession,
+    settings: Settings,
+    url: str,
+    limiter: HostRateLimiter | None = None,
+) -> str:
+    r = fetch_html_response(session, settings, url, limiter=limiter)
+    return r.text or ""
+
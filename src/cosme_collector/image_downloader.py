@@ -1,12 +1,29 @@
 from __future__ import annotations
 
 import hashlib
+import threading
 import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
 from pathlib import Path
+from typing import TYPE_CHECKING
 from urllib.parse import urlparse
 
 import requests
 
+from src.cosme_collector import metrics
+from src.cosme_collector.rate_limit import (
+    ERROR,
+    AdaptiveHostLimiter,
+    CircuitOpenError,
+    HostRateLimiter,
+    backoff_delay,
+)
+from src.cosme_collector.transport import HttpSession, stream_to_file
+
+if TYPE_CHECKING:
+    from src.cosme_collector.image_store import ImageStore
+
 
 def _safe_ext(url: str) -> str:
     try:
@@ -18,8 +35,14 @@ def _safe_ext(url: str) -> str:
     return ".jpg"
 
 
+def image_filename(url: str, stem: str | None = None) -> str:
+    h = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
+    ext = _safe_ext(url)
+    return f"{stem}_{h}{ext}" if stem else f"{h}{ext}"
+
+
 def download_image_safe(
-    session: requests.Session,
+    session: HttpSession,
     url: str,
     out_dir: Path,
     filename_stem: str | None = None,
@@ -27,35 +50,170 @@ def download_image_safe(
     retry: int = 3,
     timeout: int = 25,
     sleep_sec: float = 0.0,
+    limiter: HostRateLimiter | None = None,
 ) -> Path | None:
     """
     실패해도 None 반환
+    - 서킷이 열려 있으면 바로 포기 (이미지는 필수가 아님)
     """
     if not url:
         return None
 
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    stem = filename_stem or filename_prefix or ""
-    h = hashlib.sha1(url.encode("utf-8")).hexdigest()[:12]
-    ext = _safe_ext(url)
-    fname = f"{stem}_{h}{ext}" if stem else f"{h}{ext}"
-    out_path = out_dir / fname
+    out_path = out_dir / image_filename(url, filename_stem or filename_prefix)
 
     if out_path.exists() and out_path.stat().st_size > 0:
+        metrics.inc("images.skipped")
         return out_path
 
-    last = None
     for i in range(retry):
+        if i:
+            metrics.inc("images.retries")
         try:
-            r = session.get(url, timeout=timeout)
-            r.raise_for_status()
-            out_path.write_bytes(r.content)
+            if limiter is not None:
+                metrics.inc("sleep.rate_limit_sec", limiter.acquire(url))
+            with metrics.timed("image.fetch"):
+                try:
+                    r = session.get(url, timeout=timeout, stream=True)
+                except requests.RequestException:
+                    if limiter is not None:
+                        limiter.record_failure(url, ERROR)
+                    raise
+                with r:
+                    if limiter is not None:
+                        limiter.observe_response(url, r)
+                    r.raise_for_status()
+                    _, size = stream_to_file(r, out_path)
+            metrics.inc("images.downloaded")
+            metrics.inc("images.bytes", size)
             if sleep_sec:
+                metrics.inc("sleep.fixed_sec", sleep_sec)
                 time.sleep(sleep_sec)
             return out_path
-        except Exception as e:
-            last = e
-            time.sleep(0.8 + i)
+        except CircuitOpenError:
+            break
+        except Exception:
+            if i < retry - 1:
+                delay = backoff_delay(i, base=0.8)
+                metrics.inc("sleep.backoff_sec", delay)
+                time.sleep(delay)
 
+    metrics.inc("images.failed")
     return None
+
+
+# =========================
+# 백그라운드 이미지 다운로드 풀
+# - 페이지 파싱 루프는 submit() 으로 작업만 넣고 바로 다음 페이지로 진행
+# - 워커 스레드가 별도 호스트별 token bucket 속도로 다운로드
+# - drain() 에서 전부 끝날 때까지 기다린 뒤 성공/실패 리포트 반환
+# - store(ImageStore)가 있으면 주차 간 공유 blob 에서 재검증 후 하드링크만 생성
+# =========================
+@dataclass
+class ImageReport:
+    total: int = 0
+    ok: int = 0
+    failed: list[str] = field(default_factory=list)  # 실패한 이미지 url
+
+    def summary(self) -> str:
+        return f"[IMAGES] total={self.total} ok={self.ok} failed={len(self.failed)}"
+
+
+class ImageDownloadPool:
+    def __init__(
+        self,
+        session: HttpSession,
+        out_dir: Path,
+        workers: int = 3,
+        rate_per_sec: float = 1.5,
+        burst: int = 2,
+        max_rate_per_sec: float | None = None,
+        retry: int = 3,
+        timeout: int = 25,
+        store: ImageStore | None = None,
+    ):
+        self.session = session
+        self.out_dir = out_dir
+        self.retry = retry
+        self.timeout = timeout
+        self.store = store
+        self._manifest: list[dict] = []
+        self.limiter = AdaptiveHostLimiter(rate=rate_per_sec, burst=burst, max_rate=max_rate_per_sec)
+        self._ex = ThreadPoolExecutor(max_workers=max(1, workers), thread_name_prefix="cosme-image")
+        self._futures: list[tuple[str, Future]] = []
+        self._lock = threading.Lock()
+
+    def submit(self, url: str, filename_stem: str, revalidate: bool = True) -> Future:
+        """
+        다운로드 예약. Future 결과는 저장 경로(Path) 또는 None(실패)
+        - revalidate=False: 저장소에 이미 있으면 서버 확인 없이 바로 연결 (증분 수집의 변경 없는 페이지)
+        """
+        # 워커 스레드에서도 지금 job 으로 계측
+        if self.store is not None:
+            fut = self._ex.submit(metrics.bind(self._fetch_via_store), url, filename_stem, revalidate)
+        else:
+            fut = self._ex.submit(
+                metrics.bind(download_image_safe),
+                session=self.session,
+                url=url,
+                out_dir=self.out_dir,
+                filename_stem=filename_stem,
+                retry=self.retry,
+                timeout=self.timeout,
+                limiter=self.limiter,
+            )
+        with self._lock:
+            self._futures.append((url, fut))
+        return fut
+
+    def _fetch_via_store(self, url: str, filename_stem: str, revalidate: bool = True) -> Path | None:
+        blob = self.store.fetch(
+            self.session,
+            url,
+            retry=self.retry,
+            timeout=self.timeout,
+            limiter=self.limiter,
+            revalidate=revalidate,
+        )
+        if blob is None:
+            return None
+        out_path = self.store.link_into(blob, self.out_dir / image_filename(url, filename_stem))
+        with self._lock:
+            self._manifest.append({
+                "filename": out_path.name,
+                "image_url": url,
+                "sha256": self.store.sha256_for(url),
+            })
+        return out_path
+
+    def drain(self) -> ImageReport:
+        """예약된 다운로드가 모두 끝날 때까지 대기 후 리포트"""
+        with self._lock:
+            futures = list(self._futures)
+
+        report = ImageReport(total=len(futures))
+        for url, fut in futures:
+            try:
+                p = fut.result()
+            except Exception:
+                p = None
+            if p:
+                report.ok += 1
+            else:
+                report.failed.append(url)
+
+        if self.store is not None:
+            self.store.save()
+            if self._manifest:
+                self.store.write_manifest(self.out_dir, self._manifest)
+        return report
+
+    def close(self):
+        self._ex.shutdown(wait=True, cancel_futures=True)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
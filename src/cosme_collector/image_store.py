@@ -0,0 +1,224 @@
+from __future__ import annotations
+
+import csv
+import json
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+
+import requests
+
+from src.cosme_collector import metrics
+from src.cosme_collector.image_downloader import _safe_ext
+from src.cosme_collector.rate_limit import ERROR, CircuitOpenError, HostRateLimiter, backoff_delay
+from src.cosme_collector.transport import HttpSession, stream_to_file
+
+
+class ImageStore:
+    """
+    이미지 content-addressed 저장소 (주차 간 공유)
+
+    output/cosme/_images/
+      index.json                     url → {sha256, ext, etag, last_modified, fetched_at, size}
+      blobs/ab/abcdef....jpg          실제 바이트 (sha256 기준, 같은 내용은 1개만 저장)
+
+    - 이미 받은 url: If-None-Match / If-Modified-Since 로 재검증 → 304면 다운로드 없음
+      (서버가 검증 헤더를 안 주면 url 을 불변으로 보고 요청 자체를 생략)
+    - 한 실행 안에서 같은 url 은 1번만 확인
+    - 주차 폴더(weekN_images)에는 blob 으로의 하드링크(불가하면 복사) + manifest.csv
+    """
+
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.blob_dir = self.root / "blobs"
+        self.blob_dir.mkdir(parents=True, exist_ok=True)
+        self.index_path = self.root / "index.json"
+        self._index: dict[str, dict] = {}
+        if self.index_path.exists():
+            try:
+                self._index = json.loads(self.index_path.read_text(encoding="utf-8"))
+            except Exception:
+                self._index = {}
+
+        self._lock = threading.Lock()
+        self._url_locks: dict[str, threading.Lock] = {}
+        self._checked: set[str] = set()   # 이번 실행에서 확인 끝난 url
+        self._dirty = False
+
+    # -------------------------
+    # blob / index
+    # -------------------------
+    def blob_path(self, sha256: str, ext: str) -> Path:
+        return self.blob_dir / sha256[:2] / f"{sha256}{ext}"
+
+    def _entry_blob(self, entry: dict | None) -> Path | None:
+        if not entry:
+            return None
+        p = self.blob_path(entry["sha256"], entry["ext"])
+        return p if p.exists() else None
+
+    def _url_lock(self, url: str) -> threading.Lock:
+        with self._lock:
+            lk = self._url_locks.get(url)
+            if lk is None:
+                lk = self._url_locks[url] = threading.Lock()
+            return lk
+
+    def _put_response(self, url: str, r: requests.Response) -> Path:
+        """stream=True 응답을 임시 파일로 받으면서 해시 → blob 으로 이동 (이미 있으면 버림)"""
+        ext = _safe_ext(url)
+        incoming = self.blob_dir / f".incoming-{threading.get_ident()}{ext}"
+        sha, size = stream_to_file(r, incoming)
+        p = self.blob_path(sha, ext)
+        if p.exists():
+            incoming.unlink(missing_ok=True)
+        else:
+            p.parent.mkdir(parents=True, exist_ok=True)
+            os.replace(incoming, p)
+        headers = r.headers
+
+        with self._lock:
+            self._index[url] = {
+                "sha256": sha,
+                "ext": ext,
+                "etag": headers.get("ETag"),
+                "last_modified": headers.get("Last-Modified"),
+                "fetched_at": time.time(),
+                "size": size,
+            }
+            self._dirty = True
+        return p
+
+    def sha256_for(self, url: str) -> str | None:
+        entry = self._index.get(url)
+        return entry["sha256"] if entry else None
+
+    def save(self):
+        with self._lock:
+            if not self._dirty:
+                return
+            tmp = self.index_path.with_suffix(".json.tmp")
+            tmp.write_text(json.dumps(self._index, ensure_ascii=False), encoding="utf-8")
+            os.replace(tmp, self.index_path)
+            self._dirty = False
+
+    # -------------------------
+    # fetch (조건부 요청)
+    # -------------------------
+    def fetch(
+        self,
+        session: HttpSession,
+        url: str,
+        retry: int = 3,
+        timeout: int = 25,
+        limiter: HostRateLimiter | None = None,
+        revalidate: bool = True,
+    ) -> Path | None:
+        """
+        url 의 blob 경로. 실패하면 None
+        - revalidate=False: blob 이 있으면 조건부 요청도 하지 않음
+        """
+        if not url:
+            return None
+
+        with self._url_lock(url):
+            entry = self._index.get(url)
+            blob = self._entry_blob(entry)
+
+            if blob is not None and (url in self._checked or not revalidate):
+                metrics.inc("images.skipped")
+                return blob
+
+            headers = {}
+            if blob is not None:
+                if entry.get("etag"):
+                    headers["If-None-Match"] = entry["etag"]
+                if entry.get("last_modified"):
+                    headers["If-Modified-Since"] = entry["last_modified"]
+                if not headers:
+                    # 검증 수단 없음 → url 불변으로 간주
+                    self._checked.add(url)
+                    metrics.inc("images.skipped")
+                    return blob
+
+            for i in range(retry):
+                if i:
+                    metrics.inc("images.retries")
+                try:
+                    if limiter is not None:
+                        metrics.inc("sleep.rate_limit_sec", limiter.acquire(url))
+                    with metrics.timed("image.fetch"):
+                        try:
+                            r = session.get(url, timeout=timeout, headers=headers or None, stream=True)
+                        except requests.RequestException:
+                            if limiter is not None:
+                                limiter.record_failure(url, ERROR)
+                            raise
+                        with r:
+                            if limiter is not None:
+                                limiter.observe_response(url, r)
+                            if r.status_code == 304 and blob is not None:
+                                self._checked.add(url)
+                                metrics.inc("images.not_modified")
+                                return blob
+                            r.raise_for_status()
+                            p = self._put_response(url, r)
+                    self._checked.add(url)
+                    metrics.inc("images.downloaded")
+                    metrics.inc("images.bytes", self._index[url]["size"])
+                    return p
+                except CircuitOpenError:
+                    break
+                except Exception:
+                    if i < retry - 1:
+                        delay = backoff_delay(i, base=0.8)
+                        metrics.inc("sleep.backoff_sec", delay)
+                        time.sleep(delay)
+
+            # 재검증 실패 시 예전 blob 이라도 사용
+            metrics.inc("images.failed")
+            return blob
+
+    # -------------------------
+    # 주차 폴더 연결
+    # -------------------------
+    @staticmethod
+    def link_into(blob: Path, out_path: Path) -> Path:
+        """blob → out_path 하드링크 (다른 파일시스템 등으로 실패하면 복사)"""
+        out_path.parent.mkdir(parents=True, exist_ok=True)
+        if out_path.exists():
+            try:
+                if os.path.samefile(out_path, blob):
+                    return out_path
+            except OSError:
+                pass
+            out_path.unlink()
+        try:
+            os.link(blob, out_path)
+        except OSError:
+            shutil.copyfile(blob, out_path)
+        return out_path
+
+    @staticmethod
+    def write_manifest(out_dir: Path, entries: list[dict]):
+        """
+        out_dir/manifest.csv (filename, image_url, sha256)
+        - 재실행 시 기존 항목과 filename 기준으로 합침
+        """
+        path = out_dir / "manifest.csv"
+        merged: dict[str, dict] = {}
+        if path.exists():
+            with open(path, encoding="utf-8", newline="") as f:
+                for row in csv.DictReader(f):
+                    merged[row["filename"]] = row
+        for e in entries:
+            merged[e["filename"]] = e
+
+        out_dir.mkdir(parents=True, exist_ok=True)
+        with open(path, "w", encoding="utf-8", newline="") as f:
+            w = csv.DictWriter(f, fieldnames=["filename", "image_url", "sha256"])
+            w.writeheader()
+            for fname in sorted(merged):
+                w.writerow({k: merged[fname].get(k, "") for k in ("filename", "image_url", "sha256")})
@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import re
+from dataclasses import asdict, replace
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+from src.cosme_collector.document import HtmlDocument
+from src.cosme_collector.journal import journal_key
+
+if TYPE_CHECKING:
+    from src.cosme_collector.pipeline import Row
+
+# =========================
+# 증분 수집 (--incremental)
+# - 페이지 지문: 본문에서 정규식으로 뽑은 (상품 id 순서 + 순위 변동 아이콘 순서)
+#   → 광고/추천 영역 속성, 토큰 같은 자주 바뀌는 마크업은 무시
+# - 지난 실행과 지문이 같으면 파싱/이미지 확인/Row 생성 없이 지난 Row 를 그대로 사용
+#   (date / collected_at 만 새로)
+# - 주의: 지문은 id / 순위만 보므로 이어받은 Row 의 rating_score / review_count / price_text
+#   (상품명 / 이미지 URL 도) 는 지문이 마지막으로 바뀐 실행 때 값 그대로 (stale)
+#   → 최신 값이 필요하면 상태 파일을 지우고 --incremental 로 실행 (전체 파싱 후 상태 파일이 새 Row 로 갱신됨)
+# - 상태 파일: output/cosme/_incremental.json  {"job|url": {"fp", "rows", "images"}}
+#   QC 통과 후에만 save() → 실패한 실행의 결과가 다음 실행으로 넘어가지 않음
+# =========================
+
+_FP_PRODUCT_RE = re.compile(r"/products/(\d+)/")
+_FP_ICON_RE = re.compile(r"ico_(up|down|stay|new)")
+
+
+def page_fingerprint(doc: str | HtmlDocument) -> str:
+    html = doc.html if isinstance(doc, HtmlDocument) else (doc or "")
+    h = hashlib.sha1()
+    h.update(",".join(_FP_PRODUCT_RE.findall(html)).encode())
+    h.update(b"|")
+    h.update(",".join(_FP_ICON_RE.findall(html)).encode())
+    return h.hexdigest()
+
+
+def body_hash(doc: str | HtmlDocument) -> str:
+    html = doc.html if isinstance(doc, HtmlDocument) else (doc or "")
+    return hashlib.sha1(html.encode("utf-8", "surrogatepass")).hexdigest()
+
+
+class IncrementalState:
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._prev: dict[str, dict] = {}
+        if self.path.exists():
+            try:
+                self._prev = json.loads(self.path.read_text(encoding="utf-8"))
+            except Exception:
+                self._prev = {}
+        self._cur: dict[str, tuple[str, list[Row], list[tuple[int, str, str]]]] = {}
+
+    @staticmethod
+    def _key(job: dict, url: str) -> str:
+        return f"{journal_key(job)}|{url}"
+
+    def carry(
+        self, job: dict, url: str, fingerprint: str, date: str, collected_at: str
+    ) -> tuple[list[Row], list[tuple[int, str, str]]] | None:
+        """
+        지문이 지난 실행과 같으면 (새 date/collected_at 을 넣은 Row, 이미지 작업) 반환
+        평점 / 리뷰 수 / 가격은 다시 읽지 않으므로 지난 Row 값 그대로
+        """
+        prev = self._prev.get(self._key(job, url))
+        if not prev or prev.get("fp") != fingerprint:
+            return None
+
+        from src.cosme_collector.pipeline import Row
+
+        rows = [
+            replace(Row(**d), date=date, collected_at=collected_at, image_path=None)
+            for d in prev["rows"]
+        ]
+        return rows, [tuple(t) for t in prev.get("images", [])]
+
+    def update(self, job: dict, url: str, fingerprint: str, rows: list[Row], image_jobs: list[tuple[int, str, str]]):
+        self._cur[self._key(job, url)] = (fingerprint, rows, image_jobs)
+
+    def save(self):
+        """이번 실행 페이지로 갱신 (이번에 안 본 페이지는 이전 기록 유지)"""
+        merged = dict(self._prev)
+        for key, (fp, rows, image_jobs) in self._cur.items():
+            merged[key] = {
+                "fp": fp,
+                "rows": [{**asdict(r), "image_path": None} for r in rows],
+                "images": [list(t) for t in image_jobs],
+            }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = self.path.with_suffix(".json.tmp")
+        tmp.write_text(json.dumps(merged, ensure_ascii=False), encoding="utf-8")
+        os.replace(tmp, self.path)
+        self._prev, self._cur = merged, {}
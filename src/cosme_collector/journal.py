@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import json
+import os
+from dataclasses import asdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from src.cosme_collector.pipeline import Row
+
+
+def journal_key(job: dict) -> str:
+    return f'{job["category_id"]}/{job["ranking_type"]}'
+
+
+class CrawlJournal:
+    """
+    크롤링 진행 기록 (append-only JSONL, output/cosme/week{N}_journal.jsonl)
+    - 한 줄 = 완료된 페이지 1개: {"job", "url", "rows", "images", "completed_at"}
+    - 페이지 파싱이 끝날 때마다 바로 flush + fsync → 중간에 죽어도 완료분은 남음
+    - --resume 시 load() 결과로 완료 페이지는 요청 없이 Row 를 복원
+    """
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+
+    def reset(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.path.write_text("", encoding="utf-8")
+
+    def record(self, job: dict, url: str, rows: list[Row], image_jobs: list[tuple[int, str, str]]):
+        line = json.dumps(
+            {
+                "job": journal_key(job),
+                "url": url,
+                "rows": [asdict(r) for r in rows],
+                "images": [list(t) for t in image_jobs],
+                "completed_at": datetime.now(timezone.utc).isoformat().replace("+00:00", "Z"),
+            },
+            ensure_ascii=False,
+        )
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as f:
+            f.write(line + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+
+    def _entries(self) -> list[dict]:
+        if not self.path.exists():
+            return []
+        out = []
+        with open(self.path, encoding="utf-8") as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    out.append(json.loads(line))
+                except json.JSONDecodeError:
+                    # 쓰다가 죽은 마지막 줄
+                    continue
+        return out
+
+    def load(self) -> dict[tuple[str, str], tuple[list[Row], list[tuple[int, str, str]]]]:
+        """(job_key, url) → (rows, image_jobs). 같은 페이지가 여러 번 있으면 마지막 기록 사용"""
+        from src.cosme_collector.pipeline import Row
+
+        done = {}
+        for e in self._entries():
+            rows = [Row(**d) for d in e["rows"]]
+            image_jobs = [tuple(t) for t in e.get("images", [])]
+            done[(e["job"], e["url"])] = (rows, image_jobs)
+        return done
+
+    def forget_job(self, job: dict):
+        """job 의 기록을 지움 (QC 실패한 job 은 --resume 때 다시 수집)"""
+        key = journal_key(job)
+        keep = [e for e in self._entries() if e["job"] != key]
+        tmp = self.path.with_suffix(".jsonl.tmp")
+        with open(tmp, "w", encoding="utf-8") as f:
+            for e in keep:
+                f.write(json.dumps(e, ensure_ascii=False) + "\n")
+        os.replace(tmp, self.path)
@@ -1,28 +1,80 @@
 from __future__ import annotations
 
+from dataclasses import replace
 from pathlib import Path
 import argparse
 
+from src.cosme_collector import metrics
+from src.cosme_collector.cache import HtmlCache
 from src.cosme_collector.config import build_settings, build_paths
+from src.cosme_collector.document import HtmlDocument
+from src.cosme_collector.image_store import ImageStore
+from src.cosme_collector.incremental import IncrementalState
 from src.cosme_collector.jobs import build_jobs
-from src.cosme_collector.http_client import build_session, fetch_html_safe
-from src.cosme_collector.pipeline import run_all, quality_checks
+from src.cosme_collector.journal import CrawlJournal
+from src.cosme_collector.http_client import build_rate_limiter, build_transport, fetch_html_response
+from src.cosme_collector.parsers import PARSER_BACKENDS
+from src.cosme_collector.pipeline import run_all
+from src.cosme_collector.qc import qc_report
+from src.cosme_collector.replay import FixtureArchive, RecordingAdapter, ReplayAdapter
+from src.cosme_collector.sinks import CsvSink
 
 
 def main():
     parser = argparse.ArgumentParser()
     parser.add_argument("--test", action="store_true")
     parser.add_argument("--week", type=int, required=True)
+    parser.add_argument("--refresh", action="store_true", help="HTML 캐시 무시하고 전부 다시 받기")
+    parser.add_argument("--resume", action="store_true", help="journal 에 기록된 완료 페이지는 건너뛰고 이어서 수집")
+    parser.add_argument("--parser", choices=sorted(PARSER_BACKENDS), default=None, help="파서 백엔드 (기본: Settings.parser_backend)")
+    parser.add_argument("--incremental", action="store_true", help="지난 실행과 순위 내용이 같은 페이지는 파싱 없이 지난 Row 재사용 (평점/리뷰 수/가격은 갱신 안 됨)")
+    parser.add_argument("--record", type=Path, default=None, help="실제 응답을 fixture archive(디렉터리)에 녹화")
+    parser.add_argument("--replay", type=Path, default=None, help="네트워크 대신 fixture archive 에서 응답 재생")
+    parser.add_argument("--metrics", action="store_true", help="단계별 시간/카운터를 week{N}_metrics.json / .prom 으로 저장")
+    parser.add_argument("--parquet", action="store_true", help="CSV 와 함께 Parquet 데이터셋(output/dataset)에도 저장")
     args = parser.parse_args()
 
     base_dir = Path(__file__).resolve().parents[1]
 
     settings = build_settings(base_dir)
+    if args.parser:
+        settings = replace(settings, parser_backend=args.parser)
     paths = build_paths(settings, week=args.week)
     jobs = build_jobs(test_mode=args.test)
+    if args.metrics:
+        metrics.enable()
 
-    session = build_session(settings)
-    fetch_fn = lambda url: fetch_html_safe(session, settings, url)
+    journal = CrawlJournal(paths["journal_path"])
+    if not args.resume:
+        journal.reset()
+
+    # 녹화 / 재생 (replay.py)
+    archive = adapter = None
+    if args.record or args.replay:
+        archive = FixtureArchive(args.record or args.replay)
+        adapter = RecordingAdapter(archive) if args.record else ReplayAdapter(archive)
+
+    # 페이지 워커 / 이미지 워커가 같은 커넥션 풀 사용
+    session = build_transport(settings, adapter=adapter)
+    limiter = build_rate_limiter(settings)
+    incremental = IncrementalState(paths["incremental_state"]) if args.incremental else None
+
+    # HTML cache: QC 실패 후 재실행 시 TTL 이내면 재요청 없음, 지나면 304 재검증만
+    html_cache = HtmlCache(
+        paths["html_cache_dir"],
+        ttl_sec=settings.html_cache_ttl_sec,
+        max_bytes=settings.html_cache_max_mb * 1024 * 1024,
+    )
+    conditional_fetch = lambda url, headers: fetch_html_response(
+        session, settings, url, limiter=limiter, headers=headers
+    )
+    # 녹화 중에는 캐시를 건너뛰고 항상 요청 (TTL 이내 캐시 hit 은 네트워크를 안 타서 archive 에 안 남음)
+    force_refresh = args.refresh or args.record is not None
+    if args.record and not args.refresh:
+        print("[RECORD] --record → HTML 캐시 무시 (--refresh)", flush=True)
+    fetch_fn = lambda url: HtmlDocument(
+        html_cache.fetch(url, conditional_fetch, force_refresh=force_refresh), url
+    )
 
     df = run_all(
         session=session,
@@ -32,20 +84,47 @@ def main():
         img_dir=paths["img_dir"],
         fetch_html_fn=fetch_fn,
         download_images=True,
+        image_store=ImageStore(paths["image_store_dir"]),
+        journal=journal,
+        sinks=[CsvSink(paths["partial_csv"])],
+        incremental=incremental,
     )
+    session.close()
+    if args.metrics:
+        for host, m in limiter.metrics().items():
+            metrics.gauge("ratelimit.rate_per_sec", m["rate"], host=host)
+            metrics.gauge("breaker.trips", m["trips"], host=host)
+        metrics.write_json(paths["metrics_json"])
+        metrics.write_prometheus(paths["metrics_prom"])
+        print(f"[METRICS] {paths['metrics_json']}", flush=True)
+    if args.record:
+        archive.save()
+        print(f"[RECORD] {len(archive)} responses -> {args.record}", flush=True)
+    print(f"[RATE] pages: {limiter.summary()}", flush=True)
 
-    for job in jobs:
-        quality_checks(df, job)
+    # 전체 job 을 한 번에 검사 → 문제 전부 출력 후 실패
+    report = qc_report(df, jobs)
+    report.print()
+    if not report.ok:
+        # 실패한 job 은 다음 --resume 때 다시 받도록 기록 삭제
+        for job in report.failed_jobs(jobs):
+            journal.forget_job(job)
+        report.raise_if_failed()
 
-    import shutil
+    # QC 통과한 결과만 다음 증분 실행의 기준으로
+    if incremental is not None:
+        incremental.save()
 
     # 주차 파일 1개만 저장
     df.to_csv(paths["week_csv"], index=False, encoding="utf-8-sig")
     print(f"[OK] saved: {paths['week_csv']}")
+    paths["partial_csv"].unlink(missing_ok=True)
+
+    if args.parquet:
+        from src.cosme_collector.dataset import write_cosme_week
 
-    # HTML cache: run_all 인터페이스 맞추기 위해 임시 폴더만 생성 후 실행 종료 시 삭제
-    shutil.rmtree(paths["html_cache_dir"], ignore_errors=True)
-    print("[CLEANUP] html cache removed")
+        write_cosme_week(df, paths["dataset_dir"], week=args.week)
+        print(f"[OK] saved: {paths['dataset_dir']} (week={args.week})")
 
 if __name__ == "__main__":
     main()
@@ -0,0 +1,261 @@
+from __future__ import annotations
+
+import contextvars
+import functools
+import json
+import threading
+import time
+from contextlib import nullcontext
+from pathlib import Path
+
+# =========================
+# 수집 파이프라인 계측 (단계별 타이머 + 카운터, job 별)
+# - 기본은 꺼져 있음: enable() 전에는 inc/timed/... 가 전역 bool 하나만 보고 바로 반환
+# - 현재 job 은 contextvar 로 전달 (fetch / 이미지 워커 스레드에는 bind() 로 넘김)
+# - 실행 끝에 write_json / write_prometheus 로 요약 출력
+#
+# 주요 이름
+#   timer   : http.fetch, http.block_check, parse.items, parse.grouped, pipeline.rows, image.fetch
+#   counter : http.requests, http.bytes, http.retries, http.blocked, http.errors, http.not_modified,
+#             parse.items, pages, pages.journal, pages.unchanged, rows,
+#             images.downloaded, images.bytes, images.skipped, images.not_modified, images.failed,
+#             sleep.rate_limit_sec, sleep.backoff_sec
+# =========================
+
+_ENABLED = False
+_NULL = nullcontext()
+_job: contextvars.ContextVar[str] = contextvars.ContextVar("cosme_metrics_job", default="-")
+
+
+class Registry:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.timers: dict[tuple[str, str], list[float]] = {}     # (stage, job) → [count, total, max]
+        self.counters: dict[tuple[str, str], float] = {}         # (name, job) → value
+        self.gauges: dict[tuple[str, tuple], float] = {}         # (name, labels) → value
+        self.started = time.time()
+
+    def observe(self, stage: str, seconds: float, job: str):
+        key = (stage, job)
+        with self._lock:
+            t = self.timers.get(key)
+            if t is None:
+                self.timers[key] = [1, seconds, seconds]
+            else:
+                t[0] += 1
+                t[1] += seconds
+                if seconds > t[2]:
+                    t[2] = seconds
+
+    def add(self, name: str, value: float, job: str):
+        key = (name, job)
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0.0) + value
+
+    def set_gauge(self, name: str, value: float, labels: dict):
+        with self._lock:
+            self.gauges[(name, tuple(sorted(labels.items())))] = value
+
+    def reset(self):
+        with self._lock:
+            self.timers.clear()
+            self.counters.clear()
+            self.gauges.clear()
+            self.started = time.time()
+
+    # -------------------------
+    # 출력
+    # -------------------------
+    def summary(self) -> dict:
+        """{"stages": {stage: {total, jobs: {job: ...}}}, "counters": {...}, "gauges": [...]}"""
+        with self._lock:
+            timers = {k: list(v) for k, v in self.timers.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+
+        stages: dict[str, dict] = {}
+        for (stage, job), (count, total, mx) in sorted(timers.items()):
+            s = stages.setdefault(stage, {"count": 0, "total_sec": 0.0, "max_sec": 0.0, "jobs": {}})
+            s["count"] += int(count)
+            s["total_sec"] = round(s["total_sec"] + total, 6)
+            s["max_sec"] = round(max(s["max_sec"], mx), 6)
+            s["jobs"][job] = {"count": int(count), "total_sec": round(total, 6), "max_sec": round(mx, 6)}
+
+        totals: dict[str, dict] = {}
+        for (name, job), value in sorted(counters.items()):
+            c = totals.setdefault(name, {"total": 0.0, "jobs": {}})
+            c["total"] += value
+            c["jobs"][job] = value
+
+        return {
+            "started_at": self.started,
+            "elapsed_sec": round(time.time() - self.started, 3),
+            "stages": stages,
+            "counters": totals,
+            "gauges": [{"name": n, "labels": dict(lb), "value": v} for (n, lb), v in sorted(gauges.items())],
+        }
+
+    def prometheus(self, prefix: str = "cosme") -> str:
+        with self._lock:
+            timers = {k: list(v) for k, v in self.timers.items()}
+            counters = dict(self.counters)
+            gauges = dict(self.gauges)
+
+        lines = [
+            f"# HELP {prefix}_stage_seconds Time spent per pipeline stage.",
+            f"# TYPE {prefix}_stage_seconds summary",
+        ]
+        for (stage, job), (count, total, _) in sorted(timers.items()):
+            lb = _labels({"stage": stage, "job": job})
+            lines.append(f"{prefix}_stage_seconds_sum{lb} {total:.6f}")
+            lines.append(f"{prefix}_stage_seconds_count{lb} {int(count)}")
+        lines.append(f"# TYPE {prefix}_stage_seconds_max gauge")
+        for (stage, job), (_, _, mx) in sorted(timers.items()):
+            lines.append(f"{prefix}_stage_seconds_max{_labels({'stage': stage, 'job': job})} {mx:.6f}")
+
+        seen = set()
+        for (name, job), value in sorted(counters.items()):
+            metric = f"{prefix}_{_metric_name(name)}_total"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} counter")
+                seen.add(metric)
+            lines.append(f"{metric}{_labels({'job': job})} {_num(value)}")
+
+        for (name, lb), value in sorted(gauges.items()):
+            metric = f"{prefix}_{_metric_name(name)}"
+            if metric not in seen:
+                lines.append(f"# TYPE {metric} gauge")
+                seen.add(metric)
+            lines.append(f"{metric}{_labels(dict(lb))} {_num(value)}")
+        return "\n".join(lines) + "\n"
+
+
+def _metric_name(name: str) -> str:
+    return "".join(ch if ch.isalnum() else "_" for ch in name)
+
+
+def _labels(labels: dict) -> str:
+    def esc(v) -> str:
+        return str(v).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+    return "{" + ",".join(f'{k}="{esc(v)}"' for k, v in labels.items()) + "}"
+
+
+def _num(v: float) -> str:
+    return str(int(v)) if float(v).is_integer() else f"{v:.6f}"
+
+
+REGISTRY = Registry()
+
+
+# -------------------------
+# 켜기 / 끄기
+# -------------------------
+def enable(on: bool = True):
+    global _ENABLED
+    _ENABLED = on
+
+
+def enabled() -> bool:
+    return _ENABLED
+
+
+# -------------------------
+# 기록 (꺼져 있으면 바로 반환)
+# -------------------------
+def inc(name: str, value: float = 1.0):
+    if _ENABLED:
+        REGISTRY.add(name, value, _job.get())
+
+
+def observe(stage: str, seconds: float):
+    if _ENABLED:
+        REGISTRY.observe(stage, seconds, _job.get())
+
+
+def gauge(name: str, value: float, **labels):
+    if _ENABLED:
+        REGISTRY.set_gauge(name, value, labels)
+
+
+class _Timer:
+    __slots__ = ("stage", "t0")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+
+    def __enter__(self):
+        self.t0 = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        REGISTRY.observe(self.stage, time.perf_counter() - self.t0, _job.get())
+        return False
+
+
+def timed(stage: str):
+    """with timed("parse.items"): ...  (꺼져 있으면 공유 nullcontext)"""
+    return _Timer(stage) if _ENABLED else _NULL
+
+
+def instrumented(stage: str, count: str | None = None):
+    """
+    함수 실행 시간을 stage 로 기록하는 데코레이터
+    - count 를 주면 반환값 len() 을 그 카운터에 더함 (예: parse.items)
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrapper(*args, **kwargs):
+            if not _ENABLED:
+                return fn(*args, **kwargs)
+            with _Timer(stage):
+                out = fn(*args, **kwargs)
+            if count is not None:
+                REGISTRY.add(count, len(out), _job.get())
+            return out
+        return wrapper
+    return deco
+
+
+# -------------------------
+# job 컨텍스트
+# -------------------------
+def job_label(job: dict) -> str:
+    return f'{job.get("category_id")}/{job.get("ranking_type")}'
+
+
+def set_job(job: dict | None):
+    """현재 스레드(컨텍스트)의 job 설정. 반환 토큰은 reset_job 에"""
+    return _job.set(job_label(job) if job else "-")
+
+
+def reset_job(token):
+    _job.reset(token)
+
+
+def bind(fn, job: dict | None = None):
+    """
+    다른 스레드에서 실행할 fn 에 job 컨텍스트를 붙임
+    - job 을 주면 그 job, 없으면 현재 컨텍스트 그대로
+    - 꺼져 있으면 fn 그대로 반환
+    """
+    if not _ENABLED:
+        return fn
+    ctx = contextvars.copy_context()
+    if job is not None:
+        ctx.run(_job.set, job_label(job))
+    return functools.partial(ctx.run, fn)
+
+
+# -------------------------
+# 출력
+# -------------------------
+def write_json(path: Path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(REGISTRY.summary(), ensure_ascii=False, indent=2), encoding="utf-8")
+
+
+def write_prometheus(path: Path):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(REGISTRY.prometheus(), encoding="utf-8")
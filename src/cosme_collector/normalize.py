@@ -0,0 +1,98 @@
+from __future__ import annotations
+
+import re
+import unicodedata
+from functools import lru_cache
+
+import pandas as pd
+
+# =========================
+# 상품명 정규화 (ranking / 수집 파이프라인 / 리뷰 매칭 공용)
+# - 정규식은 모듈 로드 시 1번만 컴파일
+# - 스칼라: lru_cache → 같은 상품명은 1번만 처리 (크롤링 루프용)
+# - DataFrame: .str 벡터화 버전 (normalize_names / product_keys)
+#
+#   normalize_name("リップ　スリーピング（NEW）") → "リップ スリーピング()"   (ranking 비교용 표시 이름)
+#   split_product_name("LANEIGE / Lip Mask", "LANEIGE") → "Lip Mask"     (브랜드 / 상품명 분리)
+#   product_key("Lip Sleeping Mask") → "lipsleepingmask"                 (cosme / Amazon / 리뷰 매칭 키)
+# =========================
+
+_CACHE_SIZE = 65536
+
+_SPLIT_RE = re.compile(r"\s*[\/／]\s*")
+_SPACE_RE = re.compile(r"\s+")
+_TAG_RE = re.compile(r"\b(NEW|限定|人気|再入荷)\b", flags=re.IGNORECASE)
+
+_FULLWIDTH_PAREN = str.maketrans({"（": "(", "）": ")", "　": " "})
+
+
+# -------------------------
+# 표시용 이름 (ranking)
+# -------------------------
+@lru_cache(maxsize=_CACHE_SIZE)
+def _normalize_str(s: str) -> str:
+    s = s.translate(_FULLWIDTH_PAREN)
+    s = _SPACE_RE.sub(" ", s).strip()
+    s = _TAG_RE.sub("", s)
+    return _SPACE_RE.sub(" ", s).strip()
+
+
+def normalize_name(s) -> str:
+    if pd.isna(s):
+        return ""
+    return _normalize_str(str(s))
+
+
+def normalize_names(s: pd.Series) -> pd.Series:
+    """normalize_name 의 Series 버전 (결측 → "")"""
+    out = s.astype("string")
+    out = out.str.replace("（", "(", regex=False).str.replace("）", ")", regex=False)
+    out = out.str.replace("　", " ", regex=False)
+    out = out.str.replace(_SPACE_RE, " ", regex=True).str.strip()
+    out = out.str.replace(_TAG_RE, "", regex=True)
+    out = out.str.replace(_SPACE_RE, " ", regex=True).str.strip()
+    return out.fillna("").astype(object)
+
+
+# -------------------------
+# 브랜드 / 상품명 분리 (수집)
+# -------------------------
+@lru_cache(maxsize=_CACHE_SIZE)
+def _split_str(s: str, brand: str | None) -> str:
+    s = s.strip()
+    if brand is not None:
+        b = brand.strip()
+        if not (b and s.startswith(b)):
+            return s
+    parts = _SPLIT_RE.split(s, maxsplit=1)
+    return parts[1].strip() if len(parts) == 2 else s
+
+
+def split_product_name(product_name, brand_name=None):
+    """"브랜드 / 상품명" → 상품명 (브랜드를 주면 그 브랜드로 시작할 때만 분리)"""
+    if not product_name:
+        return product_name
+    return _split_str(str(product_name), str(brand_name) if brand_name else None)
+
+
+# -------------------------
+# 매칭 키 (cosme / Amazon / 리뷰)
+# -------------------------
+@lru_cache(maxsize=_CACHE_SIZE)
+def _key_str(s: str) -> str:
+    s = unicodedata.normalize("NFKC", s).casefold()
+    return _SPACE_RE.sub("", s)
+
+
+def product_key(name) -> str:
+    """전각/반각, 대소문자, 공백 차이를 없앤 상품 매칭 키"""
+    if name is None or (not isinstance(name, str) and pd.isna(name)):
+        return ""
+    return _key_str(str(name))
+
+
+def product_keys(s: pd.Series) -> pd.Series:
+    """product_key 의 Series 버전 (결측 → "")"""
+    out = s.astype("string").str.normalize("NFKC").str.casefold()
+    out = out.str.replace(_SPACE_RE, "", regex=True)
+    return out.fillna("").astype(object)
@@ -1,7 +1,13 @@
 from __future__ import annotations
 
 import re
-from bs4 import BeautifulSoup
+from typing import Protocol
+
+from src.cosme_collector import metrics
+from src.cosme_collector.document import HtmlDocument, as_document
+
+_PRODUCT_ID_RE = re.compile(r"/products/(\d+)/")
+_NON_DIGIT_RE = re.compile(r"\D")
 
 
 def absolutize(href: str | None) -> str | None:
@@ -77,7 +83,7 @@ def parse_product_block(block) -> dict:
     # product_id
     product_id = None
     if product_url:
-        m = re.search(r"/products/(\d+)/", product_url)
+        m = _PRODUCT_ID_RE.search(product_url)
         if m:
             product_id = m.group(1)
 
@@ -114,7 +120,7 @@ def parse_product_block(block) -> dict:
     review_count = None
     review_a = block.select_one("p.votes a.count")
     if review_a:
-        review_count = int(re.sub(r"\D", "", review_a.get_text()))
+        review_count = int(_NON_DIGIT_RE.sub("", review_a.get_text()))
 
     # price
     price_text = None
@@ -135,8 +141,8 @@ def parse_product_block(block) -> dict:
         "rank_change_text": rank_change_text,
     }
 
-def parse_page_items_ordered(html: str, limit: int = 10) -> list[dict]:
-    soup = BeautifulSoup(html, "lxml")
+def parse_page_items_ordered(html: str | HtmlDocument, limit: int = 10) -> list[dict]:
+    soup = as_document(html).soup
     items: list[dict] = []
 
     blocks = soup.select("dl.top3, dl.clearfix")
@@ -164,8 +170,8 @@ def parse_page_items_ordered(html: str, limit: int = 10) -> list[dict]:
     return items[:limit]
 
 
-def parse_grouped_keyword_ranking(html: str, max_each_group: int = 3) -> list[dict]:
-    soup = BeautifulSoup(html, "lxml")
+def parse_grouped_keyword_ranking(html: str | HtmlDocument, max_each_group: int = 3) -> list[dict]:
+    soup = as_document(html).soup
     rows: list[dict] = []
 
     heads = soup.select("div.keyword-ranking-head")
@@ -196,3 +202,55 @@ def parse_grouped_keyword_ranking(html: str, max_each_group: int = 3) -> list[di
             rows.append({"group_value": group_value, "group_rank": idx, **prod})
 
     return rows
+
+
+# =========================
+# 파서 백엔드
+# - "bs4"  : 위 BeautifulSoup 구현 (기준 구현)
+# - "lxml" : parsers_lxml (컴파일된 XPath, 같은 dict 반환)
+# =========================
+class ParserBackend(Protocol):
+    name: str
+
+    def parse_page_items_ordered(self, html: str | HtmlDocument, limit: int = 10) -> list[dict]: ...
+
+    def parse_grouped_keyword_ranking(self, html: str | HtmlDocument, max_each_group: int = 3) -> list[dict]: ...
+
+
+class Bs4Backend:
+    name = "bs4"
+
+    @metrics.instrumented("parse.items", count="parse.items")
+    def parse_page_items_ordered(self, html, limit=10):
+        return parse_page_items_ordered(html, limit=limit)
+
+    @metrics.instrumented("parse.grouped", count="parse.items")
+    def parse_grouped_keyword_ranking(self, html, max_each_group=3):
+        return parse_grouped_keyword_ranking(html, max_each_group=max_each_group)
+
+
+class LxmlBackend:
+    name = "lxml"
+
+    @metrics.instrumented("parse.items", count="parse.items")
+    def parse_page_items_ordered(self, html, limit=10):
+        from src.cosme_collector import parsers_lxml
+        return parsers_lxml.parse_page_items_ordered(html, limit=limit)
+
+    @metrics.instrumented("parse.grouped", count="parse.items")
+    def parse_grouped_keyword_ranking(self, html, max_each_group=3):
+        from src.cosme_collector import parsers_lxml
+        return parsers_lxml.parse_grouped_keyword_ranking(html, max_each_group=max_each_group)
+
+
+PARSER_BACKENDS: dict[str, type] = {
+    "bs4": Bs4Backend,
+    "lxml": LxmlBackend,
+}
+
+
+def get_parser_backend(name: str = "bs4") -> ParserBackend:
+    try:
+        return PARSER_BACKENDS[name]()
+    except KeyError:
+        raise ValueError(f"Unknown parser backend: {name} (choose from {sorted(PARSER_BACKENDS)})")
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import re
+
+from lxml import etree
+
+from src.cosme_collector.document import HtmlDocument, as_document
+from src.cosme_collector.parsers import absolutize
+
+# =========================
+# lxml 백엔드
+# - parsers.py(BeautifulSoup) 와 같은 dict 를 반환해야 함 (기준 구현은 parsers.py)
+# - CSS 셀렉터는 모두 모듈 로드 시 XPath 로 1번만 컴파일
+# - "A B" 형태 셀렉터는 soupsieve 와 동일하게 A 가 블록 바깥 조상이어도 매칭
+# =========================
+
+
+def _cls(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# get_text() 와 동일하게 script/style/template 안 문자열과 주석은 제외
+_TEXT = etree.XPath(".//text()[not(parent::script or parent::style or parent::template)]")
+
+# parse_page_items_ordered
+_XP_BLOCKS = etree.XPath(f"//dl[{_cls('top3')} or {_cls('clearfix')}]")
+_XP_PRODUCT_LINKS = etree.XPath("//a[contains(@href, '/products/')]")
+_XP_FALLBACK_BLOCK = etree.XPath(
+    "ancestor::*[self::dl or self::li or self::article or self::section or self::div][1]"
+)
+
+# parse_product_block
+_XP_PIC_LINK = etree.XPath(f".//a[contains(@href, '/products/')][ancestor::dd[{_cls('pic')}]]")
+_XP_IMG = etree.XPath(".//img")
+_XP_BRAND_LINK = etree.XPath(f".//a[@href][ancestor::span[{_cls('brand')}][ancestor::dd[{_cls('summary')}]]]")
+_XP_RATING = etree.XPath(f".//p[{_cls('rating')}]")
+_XP_VOTES = etree.XPath(f".//a[{_cls('count')}][ancestor::p[{_cls('votes')}]]")
+_XP_PRICE = etree.XPath(f".//p[{_cls('price')}]")
+_XP_STATUS_IN_DT = etree.XPath(f".//span[{_cls('status')}][ancestor::dt]")
+_XP_STATUS = etree.XPath(f".//span[{_cls('status')}]")
+
+# parse_grouped_keyword_ranking
+_XP_GROUP_HEADS = etree.XPath(f"//div[{_cls('keyword-ranking-head')}]")
+_XP_H4 = etree.XPath(".//h4")
+
+_PRODUCT_ID_RE = re.compile(r"/products/(\d+)/")
+_NON_DIGIT_RE = re.compile(r"\D")
+
+
+def _first(nodes):
+    return nodes[0] if nodes else None
+
+
+def _text(el, sep: str = "", strip: bool = True) -> str:
+    if not strip:
+        return sep.join(_TEXT(el))
+    return sep.join(s for s in (t.strip() for t in _TEXT(el)) if s)
+
+
+def extract_rank_change_text(block) -> str | None:
+    # lxml 요소는 자식이 없으면 False 로 평가되므로 `or` 대신 None 비교
+    status_span = _first(_XP_STATUS_IN_DT(block))
+    if status_span is None:
+        status_span = _first(_XP_STATUS(block))
+    if status_span is None:
+        return None
+
+    img = _first(_XP_IMG(status_span))
+    if img is not None:
+        alt = (img.get("alt") or "").strip()
+        title = (img.get("title") or "").strip()
+        if alt:
+            return alt
+        if title:
+            return title
+
+        src = (img.get("src") or "").lower()
+        if "ico_stay" in src:
+            return "順位変わらず"
+        if "ico_up" in src:
+            return "順位上昇"
+        if "ico_down" in src:
+            return "順位下降"
+        if "ico_new" in src:
+            return "NEW"
+
+    txt = _text(status_span, " ")
+    return txt or None
+
+
+def parse_product_block(block) -> dict:
+    a = _first(_XP_PIC_LINK(block))
+    if a is None:
+        return {}
+
+    product_url = absolutize(a.get("href"))
+
+    rank_change_text = extract_rank_change_text(block)
+
+    product_id = None
+    if product_url:
+        m = _PRODUCT_ID_RE.search(product_url)
+        if m:
+            product_id = m.group(1)
+
+    product_name = None
+    image_url = None
+    img = _first(_XP_IMG(a))
+    if img is not None:
+        product_name = img.get("alt")
+        image_url = absolutize(img.get("src") or img.get("data-src"))
+
+    brand_name = None
+    brand_url = None
+    brand_a = _first(_XP_BRAND_LINK(block))
+    if brand_a is not None:
+        brand_name = _text(brand_a)
+        brand_url = absolutize(brand_a.get("href"))
+
+    rating_score = None
+    rating_el = _first(_XP_RATING(block))
+    if rating_el is not None:
+        try:
+            rating_score = float(_text(rating_el))
+        except ValueError:
+            pass
+
+    review_count = None
+    review_a = _first(_XP_VOTES(block))
+    if review_a is not None:
+        review_count = int(_NON_DIGIT_RE.sub("", _text(review_a, strip=False)))
+
+    price_text = None
+    price_el = _first(_XP_PRICE(block))
+    if price_el is not None:
+        price_text = _text(price_el, " ")
+
+    return {
+        "product_id": product_id,
+        "product_name": product_name,
+        "product_url": product_url,
+        "brand_name": brand_name,
+        "brand_url": brand_url,
+        "rating_score": rating_score,
+        "review_count": review_count,
+        "price_text": price_text,
+        "image_url": image_url,
+        "rank_change_text": rank_change_text,
+    }
+
+
+def parse_page_items_ordered(html: str | HtmlDocument, limit: int = 10) -> list[dict]:
+    root = as_document(html).tree
+    if root is None:
+        return []
+    items: list[dict] = []
+
+    for b in _XP_BLOCKS(root):
+        row = parse_product_block(b)
+        if row.get("product_id"):
+            items.append(row)
+
+    # fallback: products 링크 주변 블록 기반
+    if not items:
+        seen = set()
+        for a in _XP_PRODUCT_LINKS(root):
+            block = _first(_XP_FALLBACK_BLOCK(a))
+            if block is None or block in seen:
+                continue
+            seen.add(block)
+
+            row = parse_product_block(block)
+            if row.get("product_id"):
+                items.append(row)
+
+    return items[:limit]
+
+
+def parse_grouped_keyword_ranking(html: str | HtmlDocument, max_each_group: int = 3) -> list[dict]:
+    root = as_document(html).tree
+    if root is None:
+        return []
+    rows: list[dict] = []
+
+    for head in _XP_GROUP_HEADS(root):
+        h4 = _first(_XP_H4(head))
+        group_value = _text(h4) if h4 is not None else None
+        if not group_value:
+            continue
+
+        items = []
+        for node in head.itersiblings():
+            if not isinstance(node.tag, str):
+                continue  # 주석 등
+            cls = (node.get("class") or "").split()
+            if "keyword-ranking-head" in cls:
+                break
+            if "keyword-ranking-item" in cls:
+                items.append(node)
+            if len(items) >= max_each_group:
+                break
+
+        for idx, item_block in enumerate(items, start=1):
+            prod = parse_product_block(item_block)
+            if not prod.get("product_id"):
+                continue
+            rows.append({"group_value": group_value, "group_rank": idx, **prod})
+
+    return rows
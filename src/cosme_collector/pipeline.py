@@ -1,24 +1,44 @@
 from __future__ import annotations
 
 import re
-import time
-from dataclasses import dataclass, asdict
+from collections import deque
+from concurrent.futures import Future
+from dataclasses import dataclass
 from datetime import datetime, timezone
 from pathlib import Path
-from typing import Optional
+from typing import Iterator, Optional
 from urllib.parse import urlparse, parse_qs
 
 import pandas as pd
-import requests
 
+from src.cosme_collector import metrics
 from src.cosme_collector.config import Settings
-from src.cosme_collector.image_downloader import download_image_safe
-from src.cosme_collector.parsers import parse_grouped_keyword_ranking, parse_page_items_ordered
+from src.cosme_collector.document import HtmlDocument, as_document
+from src.cosme_collector.fetch_engine import iter_pages
+from src.cosme_collector.image_downloader import ImageDownloadPool
+from src.cosme_collector.image_store import ImageStore
+from src.cosme_collector.incremental import IncrementalState, body_hash, page_fingerprint
+from src.cosme_collector.journal import CrawlJournal, journal_key
+from src.cosme_collector.parsers import ParserBackend, get_parser_backend
+from src.cosme_collector.qc import qc_report
+from src.cosme_collector.rowbuilder import RowColumns
+from src.cosme_collector.sinks import RowSink
+from src.cosme_collector.transport import HttpSession
 from src.cosme_collector.util import rule_split
 
 
 @dataclass
 class Row:
+    """수집 결과 1행 (__slots__ 로 인스턴스 dict 없음)"""
+
+    __slots__ = (
+        "date", "collected_at", "source", "market", "category_id", "category_name",
+        "ranking_type", "ranking_url", "global_rank", "page_rank",
+        "group_type", "group_value", "group_rank",
+        "product_id", "product_name", "brand_name", "product_url", "image_url", "image_path",
+        "rating_score", "review_count", "price_text", "rank_change_text", "brand_url",
+    )
+
     date: str
     collected_at: str
     source: str
@@ -48,6 +68,13 @@ class Row:
     rank_change_text: Optional[str]
     brand_url: Optional[str]
 
+
+# 값 종류가 적어 사전 인코딩(Categorical)으로 들고 있는 컬럼
+CATEGORICAL_COLUMNS = (
+    "date", "source", "market", "category_id", "category_name",
+    "ranking_type", "ranking_url", "group_type", "group_value", "rank_change_text",
+)
+
 _LANEIGE_PAT = re.compile(r"(laneige|라네즈|ラネージュ)", re.IGNORECASE)
 
 def is_laneige(brand_name: Optional[str]) -> bool:
@@ -76,73 +103,10 @@ def split_and_save(df: pd.DataFrame, split_out_dir: Path):
 
 def quality_checks(df: pd.DataFrame, job: dict):
     """
-    QC: job 설정(target_n)에 맞게 랭킹 개수 검증
+    QC: job 설정(target_n)에 맞게 랭킹 개수 검증 (job 1개, 실패 시 RuntimeError)
+    - 여러 job 을 한 번에 검사하려면 qc.qc_report(df, jobs)
     """
-
-    # rank 컬럼 없으면 QC 패스
-    if "global_rank" not in df.columns:
-        return
-
-    kind = job.get("kind")
-    ranking_type = job.get("ranking_type")
-    category_id = job.get("category_id")
-
-    # -------------------------
-    # topN_pages (Top100 / 테스트 Top10)
-    # -------------------------
-    if kind == "topN_pages":
-        target_n = int(job.get("target_n", 0))
-        if target_n <= 0:
-            return
-
-        sub = df[df["ranking_type"] == ranking_type]
-        ranks = set(sub["global_rank"].dropna().astype(int))
-        expected = set(range(1, target_n + 1))
-        missing = sorted(expected - ranks)
-
-        if missing:
-            raise RuntimeError(
-                f"[QC] {ranking_type} 누락: {missing[:20]} ... (총 {len(missing)}개)"
-            )
-
-    # -------------------------
-    # topN_query_pages (Top50)
-    # -------------------------
-    if kind == "topN_query_pages":
-        target_n = int(job.get("target_n", 0))
-        if target_n <= 0:
-            return
-
-        sub = df[
-            (df["category_id"] == category_id)
-            & (df["ranking_type"] == ranking_type)
-        ]
-        ranks = set(sub["global_rank"].dropna().astype(int))
-        expected = set(range(1, target_n + 1))
-        missing = sorted(expected - ranks)
-
-        if missing:
-            raise RuntimeError(
-                f"[QC] category {category_id} {ranking_type} 누락: {missing}"
-            )
-
-    # -------------------------
-    # rise (Top10)
-    # -------------------------
-    if kind == "rise":
-        sub = df[
-            (df["category_id"] == category_id)
-            & (df["ranking_type"] == ranking_type)
-        ]
-        if len(sub) > 0:
-            ranks = set(sub["global_rank"].dropna().astype(int))
-            expected = set(range(1, 11))
-            missing = sorted(expected - ranks)
-
-            if missing:
-                raise RuntimeError(
-                    f"[QC] category {category_id} {ranking_type} 누락: {missing}"
-                )
+    qc_report(df, [job]).raise_if_failed()
 
 
 def _calc_offset(job: dict, url: str) -> tuple[int, int]:
@@ -168,182 +132,375 @@ def _calc_offset(job: dict, url: str) -> tuple[int, int]:
     return 0, 1
 
 
-def run_all(
-    session: requests.Session,
+def _rel_image_path(p: Path, base_dir: Path) -> str:
+    try:
+        return str(p.relative_to(base_dir))
+    except ValueError:
+        # 실패하면 fallback
+        return str(p)
+
+
+def _parse_once(memo: dict | None, doc: HtmlDocument, key: tuple, parse):
+    """본문이 같은 페이지(예: /ranking/products 와 /page/1)는 한 실행에서 1번만 파싱"""
+    if memo is None:
+        return parse()
+    k = (body_hash(doc), *key)
+    hit = memo.get(k)
+    if hit is None:
+        hit = memo[k] = parse()
+    return hit
+
+
+def _rows_for_page(
+    settings: Settings,
+    job: dict,
+    url: str,
+    html: str | HtmlDocument,
+    parser: ParserBackend,
+    download_images: bool,
+    memo: dict | None = None,
+) -> tuple[list[Row], list[tuple[int, str, str]]]:
+    """
+    페이지 1개(html) → (Row 리스트, 이미지 작업 리스트) (문서는 1번만 파싱)
+    - 이미지 작업: (Row index, image_url, filename_stem) — 다운로드는 호출 측에서 예약
+    - memo 를 넘기면 본문이 같은 페이지의 파싱 결과를 재사용 (Row 는 url 별 offset 으로 새로 생성)
+    """
+    rows_out: list[Row] = []
+    image_jobs: list[tuple[int, str, str]] = []   # (rows_out index, url, stem)
+    kind = job["kind"]
+    doc = as_document(html, url=url)
+
+    if kind in ("topN_query_pages", "topN_pages", "rise"):
+        limit = job.get("page_size", 10)
+        items = _parse_once(memo, doc, ("items", limit), lambda: parser.parse_page_items_ordered(doc, limit=limit))
+
+        offset, _ = _calc_offset(job, url)
+
+        for i, item in enumerate(items, start=1):
+            global_rank = offset + i
+
+            if download_images and is_laneige(item.get("brand_name") or item.get("product_name")) and item.get("image_url") and item.get("product_id"):
+                stem = f'{job["category_id"]}__{job["ranking_type"]}__{global_rank}__{item["product_id"]}'
+                image_jobs.append((len(rows_out), item["image_url"], stem))
+
+            rows_out.append(
+                Row(
+                    date=settings.today,
+                    collected_at=now_iso(),
+                    source=job["source"],
+                    market=job["market"],
+                    category_id=job["category_id"],
+                    category_name=job["category_name"],
+                    ranking_type=job["ranking_type"],
+                    ranking_url=url,
+                    global_rank=global_rank,
+                    page_rank=i,
+                    group_type=None,
+                    group_value=None,
+                    group_rank=None,
+                    product_id=item.get("product_id"),
+                    product_name=rule_split(
+                        item.get("product_name"),
+                        item.get("brand_name")
+                    ),
+                    brand_name=item.get("brand_name"),
+                    product_url=item.get("product_url"),
+                    image_url=item.get("image_url"),
+                    image_path=None,
+                    rating_score=item.get("rating_score"),
+                    review_count=item.get("review_count"),
+                    price_text=item.get("price_text"),
+                    rank_change_text=item.get("rank_change_text"),
+                    brand_url=item.get("brand_url"),
+                )
+            )
+
+    elif kind == "grouped":
+        group_type = job["group_type"]
+        max_each = 2 if group_type == "cross" else 3
+
+        rows = _parse_once(
+            memo, doc, ("grouped", max_each),
+            lambda: parser.parse_grouped_keyword_ranking(doc, max_each_group=max_each),
+        )
+        for r in rows:
+            if (
+                download_images
+                and is_laneige(r.get("brand_name") or r.get("product_name"))
+                and r.get("image_url")
+                and r.get("product_id")
+            ):
+                stem = f'{job["category_id"]}__{job["ranking_type"]}__{group_type}__{r.get("group_value")}__{r.get("group_rank")}__{r["product_id"]}'
+                stem = re.sub(r"[^a-zA-Z0-9_\-]+", "_", stem)[:180]
+                image_jobs.append((len(rows_out), r["image_url"], stem))
+
+            rows_out.append(
+                Row(
+                    date=settings.today,
+                    collected_at=now_iso(),
+                    source=job["source"],
+                    market=job["market"],
+                    category_id=job["category_id"],
+                    category_name=job["category_name"],
+                    ranking_type=job["ranking_type"],
+                    ranking_url=url,
+                    global_rank=None,
+                    page_rank=None,
+                    group_type=group_type,
+                    group_value=r.get("group_value"),
+                    group_rank=r.get("group_rank"),
+                    product_id=r.get("product_id"),
+                    product_name=rule_split(
+                        r.get("product_name"),
+                        r.get("brand_name")
+                    ),
+                    brand_name=r.get("brand_name"),
+                    product_url=r.get("product_url"),
+                    image_url=r.get("image_url"),
+                    image_path=None,
+                    rating_score=r.get("rating_score"),
+                    review_count=r.get("review_count"),
+                    price_text=r.get("price_text"),
+                    rank_change_text=r.get("rank_change_text"),
+                    brand_url=r.get("brand_url"),
+                )
+            )
+    else:
+        raise ValueError(f"Unknown kind: {kind}")
+
+    return rows_out, image_jobs
+
+
+def _schedule_images(
+    rows: list[Row],
+    image_jobs: list[tuple[int, str, str]],
+    images: ImageDownloadPool | None,
+    revalidate: bool = True,
+) -> list[tuple[Row, Future | None]]:
+    """이미지 작업을 풀에 예약하고 (Row, Future|None) 로 묶음"""
+    futures: list[Future | None] = [None] * len(rows)
+    if images is not None:
+        for idx, image_url, stem in image_jobs:
+            futures[idx] = images.submit(image_url, stem, revalidate=revalidate)
+    return list(zip(rows, futures))
+
+
+DEDUP_KEY = ("date", "ranking_type", "ranking_url", "product_id")
+
+
+def _finish_page(page: list[tuple[Row, Future | None]], base_dir: Path) -> list[Row]:
+    """
+    페이지 1개 마무리
+    - 끝난 이미지 Future 결과로 image_path 채움
+      (워커 예외는 ImageDownloadPool.drain 처럼 실패로 보고 image_path 를 비워 둠)
+    - DEDUP_KEY 중복은 마지막 것만 남김 (key 에 ranking_url 이 있어 페이지 단위로 처리해도 전체와 동일)
+    """
+    rows: list[Row] = []
+    for row, fut in page:
+        if fut is not None:
+            try:
+                p = fut.result()
+            except Exception as e:
+                metrics.inc("images.failed")
+                print(f"  [IMAGE FAIL] {row.image_url} ({type(e).__name__}: {e})", flush=True)
+                p = None
+            if p:
+                row.image_path = _rel_image_path(p, base_dir)
+        rows.append(row)
+
+    last = {tuple(getattr(r, k) for k in DEDUP_KEY): i for i, r in enumerate(rows)}
+    if len(last) == len(rows):
+        return rows
+    keep = set(last.values())
+    return [r for i, r in enumerate(rows) if i in keep]
+
+
+def iter_page_rows(
+    session: HttpSession,
     settings: Settings,
     jobs: list[dict],
-    html_cache_dir: Path,
     img_dir: Path,
-    fetch_html_fn,              # lambda url: fetch_html_safe(...)
+    fetch_html_fn,              # url -> str | HtmlDocument
     download_images: bool = True,
-) -> pd.DataFrame:
-    all_rows: list[Row] = []
-    req_count = 0
+    image_store: ImageStore | None = None,
+    journal: CrawlJournal | None = None,
+    incremental: IncrementalState | None = None,
+) -> Iterator[list[Row]]:
+    """
+    페이지 단위로 Row 리스트를 yield 하는 스트리밍 API (jobs/urls 순서 유지)
+    - 페이지 요청은 fetch_engine.iter_pages 가 스레드 풀로 동시에 진행
+    - 요청 간격은 fetch_html_fn 안의 호스트별 token bucket 이 조절 (고정 sleep 없음)
+    - 파싱/Row 생성은 호출 스레드에서 페이지 순서대로 진행
+    - 이미지는 ImageDownloadPool 이 백그라운드로 받음
+      → 앞 페이지의 이미지가 모두 끝나면 image_path 를 채워서 바로 내보냄
+    - journal 이 있으면 페이지마다 결과를 기록하고, 이미 기록된 페이지는 요청 없이 재사용
+    - incremental 이 있으면 지문이 지난 실행과 같은 페이지는 지난 Row 를 그대로 사용
+      (파싱 / 이미지 재검증 없음, date / collected_at 만 갱신)
+    - 한 실행 안에서 본문이 같은 페이지는 1번만 파싱
+    """
+    parser = get_parser_backend(settings.parser_backend)
+    parse_memo: dict = {}
+
+    images = None
+    if download_images:
+        images = ImageDownloadPool(
+            session=session,
+            out_dir=img_dir,
+            workers=settings.image_workers,
+            rate_per_sec=settings.image_rate_per_sec,
+            burst=settings.image_rate_burst,
+            max_rate_per_sec=settings.image_rate_max_per_sec,
+            retry=settings.retry,
+            timeout=settings.timeout,
+            store=image_store,
+        )
 
     total_pages = sum(len(job["urls"]) for job in jobs)
     done_pages = 0
+    last_job = None
+
+    done = journal.load() if journal is not None else {}
+    if done:
+        print(f"[RESUME] {len(done)}/{total_pages} pages from journal", flush=True)
+
+    # 이미지 대기 중인 페이지 (앞에서부터 순서대로 내보냄)
+    waiting: deque[list[tuple[Row, Future | None]]] = deque()
+
+    def _ready(page) -> bool:
+        return all(fut is None or fut.done() for _, fut in page)
+
+    try:
+        pages = iter_pages(
+            jobs,
+            fetch_html_fn,
+            max_workers=settings.fetch_workers,
+            skip=lambda job, url: (journal_key(job), url) in done,
+        )
+        for job, url, html in pages:
+            if job is not last_job:
+                print(f"[JOB] {job['category_id']} / {job['ranking_type']}", flush=True)
+                last_job = job
 
-    for job in jobs:
-        print(f"[JOB] {job['category_id']} / {job['ranking_type']}", flush=True)
-        for url in job["urls"]:
             done_pages += 1
             pct = done_pages / total_pages * 100
             print(
                 f"[PROGRESS] pages {done_pages}/{total_pages} ({pct:.1f}%)",
                 flush=True,
             )
-            print(f"  [GET] {url}", flush=True)
-
-            req_count += 1
-            if req_count % settings.session_pause_every == 0:
-                print(f"  [PAUSE] {settings.session_pause_sec}s (every {settings.session_pause_every} req)", flush=True)
-                time.sleep(settings.session_pause_sec)
-
-            # html 추출 막기
-            # html = load_or_save_html(
-            #     html_cache_dir=html_cache_dir,
-            #     job=job,
-            #     url=url,
-            #     fetch_fn=fetch_html_fn,
-            #     force_refresh=False,
-            # )
-            html = fetch_html_fn(url)
-            time.sleep(settings.request_sleep_sec)
-
-            kind = job["kind"]
-
-            if kind in ("topN_query_pages", "topN_pages", "rise"):
-                limit = job.get("page_size", 10)
-                items = parse_page_items_ordered(html, limit=limit)
-
-                offset, _ = _calc_offset(job, url)
-
-                for i, item in enumerate(items, start=1):
-                    global_rank = offset + i
-
-                    image_path = None
-                    if download_images and is_laneige(item.get("brand_name") or item.get("product_name")) and item.get("image_url") and item.get("product_id"):
-                        stem = f'{job["category_id"]}__{job["ranking_type"]}__{global_rank}__{item["product_id"]}'
-                        p = download_image_safe(
-                            session=session,
-                            url=item["image_url"],
-                            out_dir=img_dir,
-                            filename_stem=stem,
-                            retry=settings.retry,
-                            timeout=settings.timeout,
-                            sleep_sec=settings.image_sleep_sec,
-                        )
-                        if p:
-                            try:
-                                image_path = str(p.relative_to(settings.base_dir))
-                            except ValueError:
-                                # 실패하면 fallback
-                                image_path = str(p)
-
-                    all_rows.append(
-                        Row(
-                            date=settings.today,
-                            collected_at=now_iso(),
-                            source=job["source"],
-                            market=job["market"],
-                            category_id=job["category_id"],
-                            category_name=job["category_name"],
-                            ranking_type=job["ranking_type"],
-                            ranking_url=url,
-                            global_rank=global_rank,
-                            page_rank=i,
-                            group_type=None,
-                            group_value=None,
-                            group_rank=None,
-                            product_id=item.get("product_id"),
-                            product_name=rule_split(
-                                item.get("product_name"),
-                                item.get("brand_name")
-                            ),
-                            brand_name=item.get("brand_name"),
-                            product_url=item.get("product_url"),
-                            image_url=item.get("image_url"),
-                            image_path=image_path,
-                            rating_score=item.get("rating_score"),
-                            review_count=item.get("review_count"),
-                            price_text=item.get("price_text"),
-                            rank_change_text=item.get("rank_change_text"),
-                            brand_url=item.get("brand_url"),
-                        )
-                    )
-
-            elif kind == "grouped":
-                group_type = job["group_type"]
-                max_each = 2 if group_type == "cross" else 3
-
-                rows = parse_grouped_keyword_ranking(html, max_each_group=max_each)
-                for r in rows:
-                    image_path = None
-
-                    if (
-                        download_images
-                        and is_laneige(r.get("brand_name") or r.get("product_name"))
-                        and r.get("image_url")
-                        and r.get("product_id")
-                    ):
-                        stem = f'{job["category_id"]}__{job["ranking_type"]}__{group_type}__{r.get("group_value")}__{r.get("group_rank")}__{r["product_id"]}'
-                        stem = re.sub(r"[^a-zA-Z0-9_\-]+", "_", stem)[:180]
-
-                        p = download_image_safe(
-                            session=session,
-                            url=r["image_url"],
-                            out_dir=img_dir,
-                            filename_stem=stem,
-                            retry=settings.retry,
-                            timeout=settings.timeout,
-                            sleep_sec=settings.image_sleep_sec,
-                        )
 
-                        if p:
-                            try:
-                                image_path = str(p.relative_to(settings.base_dir))
-                            except ValueError:
-                                image_path = str(p)
-
-                    all_rows.append(
-                        Row(
-                            date=settings.today,
-                            collected_at=now_iso(),
-                            source=job["source"],
-                            market=job["market"],
-                            category_id=job["category_id"],
-                            category_name=job["category_name"],
-                            ranking_type=job["ranking_type"],
-                            ranking_url=url,
-                            global_rank=None,
-                            page_rank=None,
-                            group_type=group_type,
-                            group_value=r.get("group_value"),
-                            group_rank=r.get("group_rank"),
-                            product_id=r.get("product_id"),
-                            product_name=rule_split(
-                                r.get("product_name"),
-                                r.get("brand_name")
-                            ),
-                            brand_name=r.get("brand_name"),
-                            product_url=r.get("product_url"),
-                            image_url=r.get("image_url"),
-                            image_path=image_path,
-                            rating_score=r.get("rating_score"),
-                            review_count=r.get("review_count"),
-                            price_text=r.get("price_text"),
-                            rank_change_text=r.get("rank_change_text"),
-                            brand_url=r.get("brand_url"),
-                        )
-                    )
+            token = metrics.set_job(job)
+            metrics.inc("pages")
+            carried = None
+            if html is None:
+                print(f"  [SKIP] {url} (journal)", flush=True)
+                metrics.inc("pages.journal")
+                rows, image_jobs = done[(journal_key(job), url)]
             else:
-                raise ValueError(f"Unknown kind: {kind}")
+                if incremental is not None:
+                    fp = page_fingerprint(html)
+                    carried = incremental.carry(job, url, fp, settings.today, now_iso())
+
+                if carried is not None:
+                    print(f"  [SAME] {url} (unchanged since last run)", flush=True)
+                    metrics.inc("pages.unchanged")
+                    rows, image_jobs = carried
+                else:
+                    print(f"  [GET] {url}", flush=True)
+                    with metrics.timed("pipeline.rows"):
+                        rows, image_jobs = _rows_for_page(
+                            settings=settings,
+                            job=job,
+                            url=url,
+                            html=html,
+                            parser=parser,
+                            download_images=download_images,
+                            memo=parse_memo,
+                        )
+                if incremental is not None:
+                    incremental.update(job, url, fp, rows, image_jobs)
+                if journal is not None:
+                    journal.record(job, url, rows, image_jobs)
+
+            metrics.inc("rows", len(rows))
+            waiting.append(_schedule_images(rows, image_jobs, images, revalidate=carried is None))
+            metrics.reset_job(token)
+
+            while waiting and _ready(waiting[0]):
+                yield _finish_page(waiting.popleft(), settings.base_dir)
+
+        if images is not None:
+            with metrics.timed("image.drain"):
+                report = images.drain()
+            print(report.summary(), flush=True)
+            print(f"[RATE] images: {images.limiter.summary()}", flush=True)
+            for failed_url in report.failed:
+                print(f"  [IMAGE FAIL] {failed_url}", flush=True)
+
+        while waiting:
+            yield _finish_page(waiting.popleft(), settings.base_dir)
+    finally:
+        if images is not None:
+            images.close()
 
-    df = pd.DataFrame([asdict(r) for r in all_rows])
+
+def iter_rows(*args, **kwargs) -> Iterator[Row]:
+    """iter_page_rows 를 Row 1개 단위로 펼친 버전 (인자 동일)"""
+    for rows in iter_page_rows(*args, **kwargs):
+        yield from rows
+
+
+def run_all(
+    session: HttpSession,
+    settings: Settings,
+    jobs: list[dict],
+    html_cache_dir: Path,
+    img_dir: Path,
+    fetch_html_fn,              # url -> str | HtmlDocument
+    download_images: bool = True,
+    image_store: ImageStore | None = None,
+    journal: CrawlJournal | None = None,
+    sinks: list[RowSink] | None = None,
+    incremental: IncrementalState | None = None,
+) -> pd.DataFrame:
+    """
+    iter_page_rows 결과를 DataFrame 으로 모아 반환 (기존 인터페이스 유지)
+    - sinks 가 있으면 페이지가 끝날 때마다 바로 기록 (CSV/Parquet/SQLite, 실행 중 부분 결과 확인용)
+    - Row 는 RowColumns 로 컬럼 배열에 바로 쌓음 (CATEGORICAL_COLUMNS 는 Categorical dtype)
+    """
+    sinks = sinks or []
+    columns = RowColumns.for_row(Row, categorical=CATEGORICAL_COLUMNS)
+
+    try:
+        for rows in iter_page_rows(
+            session=session,
+            settings=settings,
+            jobs=jobs,
+            img_dir=img_dir,
+            fetch_html_fn=fetch_html_fn,
+            download_images=download_images,
+            image_store=image_store,
+            journal=journal,
+            incremental=incremental,
+        ):
+            for sink in sinks:
+                sink.write(rows)
+            columns.extend_rows(rows)
+    finally:
+        # 중간에 예외가 나도 지금까지 쓴 부분 결과는 flush 하고 파일을 닫음
+        for sink in sinks:
+            try:
+                sink.close()
+            except Exception as e:
+                print(f"[SINK] close 실패: {type(e).__name__}: {e}", flush=True)
+
+    if not len(columns):
+        return pd.DataFrame()
+
+    df = columns.to_frame()
 
     if not df.empty:
         df = df.drop_duplicates(
-            subset=["date", "ranking_type", "ranking_url", "product_id"],
+            subset=list(DEDUP_KEY),
             keep="last",
         )
 
@@ -0,0 +1,134 @@
+from __future__ import annotations
+
+from collections import defaultdict
+from dataclasses import dataclass, field
+
+import pandas as pd
+
+# =========================
+# QC (랭킹 누락 / 중복 검증)
+# - df 를 (ranking_type, category_id, global_rank) 로 1번만 groupby
+# - 모든 job 의 target 과 한꺼번에 비교해서 문제를 전부 모은 리포트 반환
+#   (첫 실패에서 멈추지 않음 → 호출 측에서 실패 job 만 골라 처리)
+# =========================
+
+RISE_TARGET_N = 10
+
+
+@dataclass(frozen=True)
+class QCIssue:
+    category_id: str
+    ranking_type: str
+    kind: str                   # job kind (topN_pages / topN_query_pages / rise)
+    problem: str                # "missing" | "duplicate"
+    ranks: tuple[int, ...]
+    target_n: int
+
+    def message(self) -> str:
+        if self.problem == "duplicate":
+            return f"[QC] category {self.category_id} {self.ranking_type} 중복 순위: {list(self.ranks)}"
+        if self.kind == "topN_pages":
+            return f"[QC] {self.ranking_type} 누락: {list(self.ranks[:20])} ... (총 {len(self.ranks)}개)"
+        return f"[QC] category {self.category_id} {self.ranking_type} 누락: {list(self.ranks)}"
+
+
+@dataclass
+class QCReport:
+    issues: list[QCIssue] = field(default_factory=list)
+    checked: int = 0            # 검사한 job 수
+
+    @property
+    def ok(self) -> bool:
+        return not self.issues
+
+    def failed_keys(self) -> set[tuple[str, str]]:
+        return {(i.category_id, i.ranking_type) for i in self.issues}
+
+    def failed_jobs(self, jobs: list[dict]) -> list[dict]:
+        keys = self.failed_keys()
+        return [j for j in jobs if (str(j.get("category_id")), j.get("ranking_type")) in keys]
+
+    def summary(self) -> str:
+        if self.ok:
+            return f"[QC] OK ({self.checked} jobs)"
+        return f"[QC] {len(self.issues)} issues in {len(self.failed_keys())}/{self.checked} jobs"
+
+    def print(self):
+        print(self.summary())
+        for issue in self.issues:
+            print(issue.message())
+
+    def raise_if_failed(self):
+        if self.issues:
+            raise RuntimeError(self.issues[0].message())
+
+
+def _rank_counts(df: pd.DataFrame) -> dict[tuple[str, str], dict[int, int]]:
+    """{(ranking_type, category_id): {rank: 등장 횟수}}  (df 전체 1번 groupby)"""
+    ranked = df[["ranking_type", "category_id", "global_rank"]].dropna(subset=["global_rank"])
+    counts = ranked.groupby(
+        [ranked["ranking_type"], ranked["category_id"], ranked["global_rank"].astype(int)],
+        observed=True,
+        sort=False,
+    ).size()
+
+    out: dict[tuple[str, str], dict[int, int]] = defaultdict(dict)
+    for (rt, cat, rank), n in counts.items():
+        out[(str(rt), str(cat))][int(rank)] = int(n)
+    return out
+
+
+def _target_n(job: dict) -> int:
+    if job.get("kind") == "rise":
+        return RISE_TARGET_N
+    return int(job.get("target_n", 0))
+
+
+def qc_report(df: pd.DataFrame, jobs: list[dict]) -> QCReport:
+    """
+    job 설정(target_n)에 맞게 랭킹 개수 검증
+    - topN_pages        : ranking_type 전체에서 1..target_n
+    - topN_query_pages  : (category_id, ranking_type) 에서 1..target_n
+    - rise              : 결과가 있으면 1..10
+    - grouped           : 검사 없음
+    """
+    report = QCReport()
+    if df.empty or "global_rank" not in df.columns:
+        return report
+
+    counts = _rank_counts(df)
+
+    for job in jobs:
+        kind = job.get("kind")
+        if kind not in ("topN_pages", "topN_query_pages", "rise"):
+            continue
+        target_n = _target_n(job)
+        if target_n <= 0:
+            continue
+
+        ranking_type = job.get("ranking_type")
+        category_id = str(job.get("category_id"))
+
+        if kind == "topN_pages":
+            # 카테고리 구분 없이 ranking_type 기준
+            got: dict[int, int] = defaultdict(int)
+            for (rt, _cat), ranks in counts.items():
+                if rt == ranking_type:
+                    for rank, n in ranks.items():
+                        got[rank] += n
+        else:
+            got = counts.get((ranking_type, category_id), {})
+            if kind == "rise" and not got:
+                continue
+
+        report.checked += 1
+
+        missing = tuple(r for r in range(1, target_n + 1) if r not in got)
+        if missing:
+            report.issues.append(QCIssue(category_id, ranking_type, kind, "missing", missing, target_n))
+
+        dup = tuple(sorted(r for r, n in got.items() if n > 1))
+        if dup:
+            report.issues.append(QCIssue(category_id, ranking_type, kind, "duplicate", dup, target_n))
+
+    return report
@@ -1,32 +1,18 @@
 from __future__ import annotations
+import glob
 import os
 import re
+import numpy as np
 import pandas as pd
 from typing import List
 
-FILES = [
-    "output/cosme/week2/week2_cosme.csv",
-    "output/cosme/week3/week3_cosme.csv",
-]
+from src.cosme_collector.normalize import normalize_name, normalize_names  # noqa: F401
 
 OUT_DIR = "output/cosme"
 os.makedirs(OUT_DIR, exist_ok=True)
 
-OUT_WEEK2_TO_WEEK3 = os.path.join(OUT_DIR, "week2toweek3_cosme_rank.csv")
-
 KEY_COLS = ["category_id", "ranking_type", "group_type", "group_value", "product_id"]
 
-def normalize_name(s: str) -> str:
-    if pd.isna(s):
-        return ""
-    s = str(s)
-    s = s.replace("（", "(").replace("）", ")")
-    s = s.replace("\u3000", " ")
-    s = re.sub(r"\s+", " ", s).strip()
-    s = re.sub(r"\b(NEW|限定|人気|再入荷)\b", "", s, flags=re.IGNORECASE)
-    s = re.sub(r"\s+", " ", s).strip()
-    return s
-
 def week_from_path(fp: str) -> str:
     m = re.search(r"(week\d+)", fp)
     return m.group(1) if m else os.path.basename(fp)
@@ -39,7 +25,30 @@ def load_and_prepare(files: List[str]) -> pd.DataFrame:
 
         week = week_from_path(fp)
         df["snapshot"] = week  # 비교용 라벨 추가
+        dfs.append(df)
+
+    return prepare(dfs)
+
+# 순위 비교에 필요한 컬럼만 (Parquet 데이터셋에서 이 컬럼만 읽음)
+RANK_COLUMNS = KEY_COLS + ["date", "product_name", "brand_name", "group_rank", "global_rank"]
+
+def load_from_dataset(dataset_root: str, weeks: List[int]) -> pd.DataFrame:
+    """output/dataset 에서 필요한 week 파티션 + 컬럼만 읽어서 load_and_prepare 와 같은 형태로"""
+    from src.cosme_collector.dataset import read_cosme
 
+    df = read_cosme(dataset_root, weeks=weeks, columns=RANK_COLUMNS + ["week"])
+    df["__source_file"] = "dataset"
+    df["snapshot"] = "week" + df["week"].astype(str)
+    df = df.drop(columns=["week"])
+    # dictionary(categorical) 컬럼은 주차마다 카테고리가 달라서 일반 문자열로
+    for c in df.columns:
+        if isinstance(df[c].dtype, pd.CategoricalDtype):
+            df[c] = df[c].astype(object)
+    return prepare([df])
+
+def prepare(dfs: List[pd.DataFrame]) -> pd.DataFrame:
+    out = []
+    for df in dfs:
         # 원본 date는 유지 (없으면 빈값으로)
         if "date" not in df.columns:
             df["date"] = ""
@@ -55,13 +64,13 @@ def load_and_prepare(files: List[str]) -> pd.DataFrame:
         if "product_name" not in df.columns:
             df["product_name"] = ""
 
-        dfs.append(df)
+        out.append(df)
 
-    df = pd.concat(dfs, ignore_index=True)
+    df = pd.concat(out, ignore_index=True)
 
     # 상품명 정규화
     df["product_name_raw"] = df["product_name"].astype(str)
-    df["product_name_norm"] = df["product_name_raw"].apply(normalize_name)
+    df["product_name_norm"] = normalize_names(df["product_name_raw"])
 
     # rank_value
     if "group_rank" not in df.columns:
@@ -70,7 +79,8 @@ def load_and_prepare(files: List[str]) -> pd.DataFrame:
         df["global_rank"] = pd.NA
 
     df["rank_value"] = df["group_rank"].where(df["group_rank"].notna(), df["global_rank"])
-    df["rank_value"] = pd.to_numeric(df["rank_value"], errors="coerce")
+    # Parquet 의 nullable Int64 도 float 로 (NA 비교가 bool 이 아닌 NA 가 되지 않게)
+    df["rank_value"] = pd.to_numeric(df["rank_value"], errors="coerce").astype("float64")
 
     # snapshot별 중복 제거
     df = df.sort_values(["snapshot", "rank_value"]).drop_duplicates(
@@ -79,61 +89,231 @@ def load_and_prepare(files: List[str]) -> pd.DataFrame:
     )
     return df
 
-def between_dates_table(panel: pd.DataFrame) -> pd.DataFrame:
-    snaps = sorted(
-        panel["snapshot"].unique(),
-        key=lambda x: int(re.search(r"\d+", x).group()) if re.search(r"\d+", x) else 0
+# =========================
+# 순위 이력 엔진
+# - 스냅샷 개수 제한 없음 (glob / 날짜 범위로 선택)
+# - 모든 (이전, 현재) 쌍 + 임의 lag 를 outer merge 1번으로 계산 (쌍마다 merge X)
+# - status 는 np.select 로 벡터화 (row 단위 apply X)
+# - 증분: 새 스냅샷 1개만 저장된 최신 스냅샷과 비교해서 이력에 추가
+# =========================
+
+DIFF_VALUE_COLS = ["rank_value", "product_name", "brand_name", "date"]
+
+HISTORY_COLUMNS = (
+    KEY_COLS
+    + [f"{c}_prev" for c in DIFF_VALUE_COLS]
+    + [f"{c}_cur" for c in DIFF_VALUE_COLS]
+    + ["_merge", "status", "rank_value_diff", "rank_value_moved_by", "from_snapshot", "to_snapshot"]
+)
+
+
+def snapshot_sort_key(label: str) -> int:
+    m = re.search(r"\d+", str(label))
+    return int(m.group()) if m else 0
+
+
+def discover_snapshot_files(pattern: str = "output/cosme/week*_cosme.csv") -> List[str]:
+    """glob 으로 스냅샷 CSV 찾기 (week 번호 순)"""
+    return sorted(glob.glob(pattern), key=lambda fp: snapshot_sort_key(week_from_path(fp)))
+
+
+def filter_snapshot_dates(panel: pd.DataFrame, since: str | None = None, until: str | None = None) -> pd.DataFrame:
+    """스냅샷 날짜(date 최솟값)가 [since, until] 안인 스냅샷만"""
+    if since is None and until is None:
+        return panel
+    snap_date = panel.groupby("snapshot")["date"].transform("min")
+    keep = pd.Series(True, index=panel.index)
+    if since is not None:
+        keep &= snap_date >= since
+    if until is not None:
+        keep &= snap_date <= until
+    return panel[keep]
+
+
+def _diff_frame(panel: pd.DataFrame, suffix: str) -> pd.DataFrame:
+    out = panel[KEY_COLS + DIFF_VALUE_COLS + ["snapshot"]].rename(
+        columns={c: f"{c}_{suffix}" for c in DIFF_VALUE_COLS}
     )
-    rows = []
-
-    for i in range(1, len(snaps)):
-        prev_d, cur_d = snaps[i - 1], snaps[i]
-        prev = panel[panel["snapshot"] == prev_d].copy()
-        cur  = panel[panel["snapshot"] == cur_d].copy()
-
-        prev_small = prev[KEY_COLS + ["rank_value", "product_name", "brand_name", "date"]].rename(
-            columns={
-                "rank_value": "rank_value_prev",
-                "product_name": "product_name_prev",
-                "brand_name": "brand_name_prev",
-                "date": "date_prev",
-            }
-        )
-        cur_small = cur[KEY_COLS + ["rank_value", "product_name", "brand_name", "date"]].rename(
-            columns={
-                "rank_value": "rank_value_cur",
-                "product_name": "product_name_cur",
-                "brand_name": "brand_name_cur",
-                "date": "date_cur",
-            }
-        )
+    # 키 타입 통일 (CSV: int / 데이터셋: str 이 섞여도 같은 키로 매칭)
+    for c in KEY_COLS:
+        out[c] = out[c].astype("string")
+    return out
 
-        merged = prev_small.merge(cur_small, on=KEY_COLS, how="outer", indicator=True)
 
-        def status(row):
-            if row["_merge"] == "left_only":
-                return "dropped"
-            if row["_merge"] == "right_only":
-                return "new"
-            if row["rank_value_cur"] == row["rank_value_prev"]:
-                return "same"
-            return "up" if row["rank_value_cur"] < row["rank_value_prev"] else "down"
+def rank_history(panel: pd.DataFrame, lags: tuple[int, ...] = (1,)) -> pd.DataFrame:
+    """
+    스냅샷 N개 → (from_snapshot, to_snapshot) 모든 쌍의 순위 변화 (lag 별)
+    - lag=1: 연속 스냅샷, lag=4: 4개 전 스냅샷과 비교 ...
+    - 결과 컬럼: HISTORY_COLUMNS + lag
+    """
+    snaps = sorted(panel["snapshot"].unique(), key=snapshot_sort_key)
+    if len(snaps) < 2:
+        return pd.DataFrame(columns=HISTORY_COLUMNS + ["lag"])
 
-        merged["status"] = merged.apply(status, axis=1)
-        merged["rank_value_diff"] = merged["rank_value_cur"] - merged["rank_value_prev"]
-        merged["rank_value_moved_by"] = merged["rank_value_diff"].abs()
+    order = {s: i for i, s in enumerate(snaps)}
+    n = len(snaps)
+    lags = tuple(sorted({int(l) for l in lags if 0 < int(l) < n}))
 
-        merged["from_snapshot"] = prev_d
-        merged["to_snapshot"] = cur_d
+    prev_base = _diff_frame(panel, "prev")
+    cur_base = _diff_frame(panel, "cur")
+    prev_idx = prev_base.pop("snapshot").map(order).to_numpy()
+    cur_idx = cur_base.pop("snapshot").map(order).to_numpy()
 
-        rows.append(merged)
+    # lag 별로 "비교 대상 스냅샷 번호(to_idx)" 를 붙여서 한 번에 merge
+    prevs, curs = [], []
+    for lag in lags:
+        p = prev_base[prev_idx + lag < n].assign(lag=lag)
+        p["to_idx"] = prev_idx[prev_idx + lag < n] + lag
+        c = cur_base[cur_idx - lag >= 0].assign(lag=lag)
+        c["to_idx"] = cur_idx[cur_idx - lag >= 0]
+        prevs.append(p)
+        curs.append(c)
+
+    merged = pd.concat(prevs, ignore_index=True).merge(
+        pd.concat(curs, ignore_index=True),
+        on=["lag", "to_idx"] + KEY_COLS,
+        how="outer",
+        indicator=True,
+    )
+
+    cur_v = merged["rank_value_cur"]
+    prev_v = merged["rank_value_prev"]
+    merged["status"] = np.select(
+        [
+            merged["_merge"] == "left_only",
+            merged["_merge"] == "right_only",
+            cur_v == prev_v,
+            cur_v < prev_v,
+        ],
+        ["dropped", "new", "same", "up"],
+        default="down",
+    )
+    merged["rank_value_diff"] = cur_v - prev_v
+    merged["rank_value_moved_by"] = merged["rank_value_diff"].abs()
+
+    labels = np.asarray(snaps, dtype=object)
+    to_idx = merged["to_idx"].to_numpy()
+    merged["from_snapshot"] = labels[to_idx - merged["lag"].to_numpy()]
+    merged["to_snapshot"] = labels[to_idx]
+
+    merged = merged.sort_values(["lag", "to_idx"] + KEY_COLS, kind="stable", ignore_index=True)
+    return merged[HISTORY_COLUMNS + ["lag"]]
+
+
+def rank_history_duckdb(
+    glob_pattern: str | None = None,
+    dataset_root: str | None = None,
+    weeks: List[int] | None = None,
+    lags: tuple[int, ...] = (1,),
+    since: str | None = None,
+    until: str | None = None,
+) -> pd.DataFrame:
+    """
+    rank_history 와 같은 결과를 DuckDB 쿼리(src/database/analytics.py)로 계산
+    - CSV / Parquet 를 DataFrame 으로 다 올리지 않고 DuckDB 가 직접 읽음
+    - duckdb 가 없으면 RuntimeError
+    """
+    from src.database.analytics import COSME_GLOB, connect, rank_history as duckdb_rank_history
+
+    con = connect(dataset_dir=dataset_root, cosme_glob=glob_pattern or COSME_GLOB, db_path=None)
+    try:
+        return duckdb_rank_history(con, lags=lags, since=since, until=until, weeks=weeks)
+    finally:
+        con.close()
+
+
+def between_dates_table(panel: pd.DataFrame) -> pd.DataFrame:
+    """연속 스냅샷 쌍의 순위 변화 (기존 인터페이스, rank_history lag=1)"""
+    return rank_history(panel, lags=(1,)).drop(columns=["lag"])
+
+
+# -------------------------
+# 증분 갱신
+# -------------------------
+def append_snapshot(
+    new_panel: pd.DataFrame,
+    latest_path: str,
+    history_path: str,
+) -> pd.DataFrame:
+    """
+    새 스냅샷 1개를 저장된 최신 스냅샷(latest_path)과만 비교해서 history_path 에 추가
+    - 반환: 이번에 추가된 diff
+    - latest_path 는 새 스냅샷으로 교체 (처음이면 diff 없이 저장만)
+    """
+    if os.path.exists(latest_path):
+        latest = pd.read_csv(latest_path, encoding="utf-8-sig")
+        latest_snap = latest["snapshot"].iloc[0] if len(latest) else None
+        new_snaps = set(new_panel["snapshot"].unique())
+        if latest_snap in new_snaps:
+            print(f"[RANK] {latest_snap} 은 이미 최신 스냅샷 → 건너뜀")
+            return pd.DataFrame(columns=HISTORY_COLUMNS)
+        diff = between_dates_table(pd.concat([latest, new_panel], ignore_index=True))
+        write_header = not os.path.exists(history_path)
+        diff.to_csv(history_path, mode="a", header=write_header, index=False, encoding="utf-8-sig")
+    else:
+        diff = pd.DataFrame(columns=HISTORY_COLUMNS)
+
+    new_panel.to_csv(latest_path, index=False, encoding="utf-8-sig")
+    return diff
+
+
+def save_pairs(history: pd.DataFrame, out_dir: str = OUT_DIR) -> List[str]:
+    """lag=1 결과를 쌍마다 week{a}toweek{b}_cosme_rank.csv 로 저장"""
+    saved = []
+    pairs = history[["from_snapshot", "to_snapshot"]].drop_duplicates().itertuples(index=False)
+    for prev_d, cur_d in pairs:
+        out = history[(history["from_snapshot"] == prev_d) & (history["to_snapshot"] == cur_d)]
+        fp = os.path.join(out_dir, f"{prev_d}to{cur_d}_cosme_rank.csv")
+        out.to_csv(fp, index=False, encoding="utf-8-sig")
+        saved.append(fp)
+    return saved
 
-    return pd.concat(rows, ignore_index=True)
 
 if __name__ == "__main__":
-    base = load_and_prepare(FILES)
-    between = between_dates_table(base)
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--glob", default=os.path.join(OUT_DIR, "week*_cosme.csv"), help="스냅샷 CSV glob")
+    parser.add_argument("--dataset", default=None, help="CSV 대신 Parquet 데이터셋(output/dataset)에서 읽기")
+    parser.add_argument("--weeks", type=int, nargs="+", default=None, help="--dataset 에서 읽을 week 목록")
+    parser.add_argument("--since", default=None, help="스냅샷 날짜 시작 (YYYY-MM-DD)")
+    parser.add_argument("--until", default=None, help="스냅샷 날짜 끝 (YYYY-MM-DD)")
+    parser.add_argument("--lags", type=int, nargs="+", default=[1], help="비교할 스냅샷 간격 (예: 1 4)")
+    parser.add_argument("--history", default=None, help="전체 이력을 한 CSV 로 저장 (lag 컬럼 포함)")
+    parser.add_argument("--incremental", default=None, metavar="CSV", help="새 스냅샷 CSV 1개만 저장된 최신 스냅샷과 비교")
+    parser.add_argument("--engine", choices=["auto", "duckdb", "pandas"], default="auto",
+                        help="이력 계산 엔진 (auto: duckdb 가 있으면 duckdb, 없으면 pandas)")
+    args = parser.parse_args()
+
+    if args.incremental:
+        diff = append_snapshot(
+            load_and_prepare([args.incremental]),
+            latest_path=os.path.join(OUT_DIR, "_rank_latest.csv"),
+            history_path=os.path.join(OUT_DIR, "cosme_rank_history.csv"),
+        )
+        print(f"[RANK] +{len(diff)} rows -> {os.path.join(OUT_DIR, 'cosme_rank_history.csv')}")
+    else:
+        history = None
+        if args.engine != "pandas":
+            try:
+                history = rank_history_duckdb(
+                    glob_pattern=args.glob, dataset_root=args.dataset, weeks=args.weeks,
+                    lags=tuple(args.lags), since=args.since, until=args.until,
+                )
+            except RuntimeError as e:
+                if args.engine == "duckdb":
+                    raise
+                print(f"[RANK] {e} → pandas 로 계산")
 
-    out = between[(between["from_snapshot"] == "week2") & (between["to_snapshot"] == "week3")].copy()
-    out.to_csv(OUT_WEEK2_TO_WEEK3, index=False, encoding="utf-8-sig")
-    print("saved:", OUT_WEEK2_TO_WEEK3)
+        if history is None:
+            if args.dataset:
+                base = load_from_dataset(args.dataset, weeks=args.weeks)
+            else:
+                base = load_and_prepare(discover_snapshot_files(args.glob))
+            base = filter_snapshot_dates(base, args.since, args.until)
+            history = rank_history(base, lags=tuple(args.lags))
+        for fp in save_pairs(history[history["lag"] == 1].drop(columns=["lag"])):
+            print("saved:", fp)
+        if args.history:
+            history.to_csv(args.history, index=False, encoding="utf-8-sig")
+            print("saved:", args.history)
@@ -0,0 +1,305 @@
+from __future__ import annotations
+
+import random
+import threading
+import time
+from dataclasses import dataclass, field
+from urllib.parse import urlparse
+
+
+class TokenBucket:
+    """
+    토큰 버킷 레이트 리미터 (스레드 안전)
+    - rate  : 초당 보충되는 토큰 수 (= 평균 요청 속도)
+    - burst : 버킷 최대 크기 (= 순간적으로 연속 허용되는 요청 수)
+    """
+
+    def __init__(self, rate: float, burst: float):
+        if rate <= 0:
+            raise ValueError(f"rate must be > 0: {rate}")
+        self.rate = float(rate)
+        self.capacity = max(1.0, float(burst))
+        self._tokens = self.capacity
+        self._last = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _refill(self, now: float):
+        self._tokens = min(self.capacity, self._tokens + (now - self._last) * self.rate)
+        self._last = now
+
+    def set_rate(self, rate: float):
+        """속도 변경 (지금까지 쌓인 토큰은 이전 속도로 정산)"""
+        with self._lock:
+            self._refill(time.monotonic())
+            self.rate = max(1e-6, float(rate))
+
+    def acquire(self, n: float = 1.0) -> float:
+        """
+        토큰 n개를 얻을 때까지 대기
+        반환값: 실제로 대기한 시간(초)
+        """
+        slept = 0.0
+        while True:
+            with self._lock:
+                self._refill(time.monotonic())
+                if self._tokens >= n:
+                    self._tokens -= n
+                    return slept
+                wait = (n - self._tokens) / self.rate
+            time.sleep(wait)
+            slept += wait
+
+
+class HostRateLimiter:
+    """
+    호스트별 토큰 버킷 묶음
+    - www.cosme.net / cache-cdn.cosme.net 처럼 호스트가 다르면 버킷도 따로 사용
+    """
+
+    def __init__(self, rate: float, burst: float):
+        self.rate = rate
+        self.burst = burst
+        self._buckets: dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            b = self._buckets.get(host)
+            if b is None:
+                b = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = b
+            return b
+
+    def acquire(self, url: str) -> float:
+        return self.bucket_for(url).acquire()
+
+    # 고정 속도 리미터는 결과를 보지 않음 (AdaptiveHostLimiter 와 같은 호출 형태 유지용)
+    def observe_response(self, url: str, response) -> None:
+        pass
+
+    def observe_failure(self, url: str, response) -> bool:
+        return False
+
+    def observe_success(self, url: str, response) -> None:
+        pass
+
+    def record_failure(self, url: str, kind: str = "error", retry_after: float | None = None) -> None:
+        pass
+
+    def metrics(self) -> dict:
+        return {host: {"rate": b.rate} for host, b in self._buckets.items()}
+
+
+# =========================
+# 적응형 속도 조절 (AIMD) + 호스트별 서킷 브레이커
+# - 응답이 정상이고 지연이 latency_target 이하 → 속도 += increase (가산 증가)
+# - 429 / 5xx / 차단 페이지 / 네트워크 오류 → 속도 *= decrease (곱셈 감소)
+# - 연속 실패 breaker_failures 번 → 서킷 open: cooldown 동안 요청 자체를 막음
+#   cooldown 이 지나면 half-open: 요청 1개만 통과시켜 보고 성공하면 close, 실패하면 다시 open
+#   (연속 trip 마다 cooldown 2배, 최대 breaker_max_cooldown)
+# =========================
+
+THROTTLED = "throttled"     # 429 / 5xx
+BLOCKED = "blocked"         # 403 / 로그인 페이지 등
+ERROR = "error"             # timeout / 연결 오류
+
+
+class CircuitOpenError(RuntimeError):
+    """서킷이 열려 있어 요청하지 않음. retry_in 초 뒤에 다시 시도 가능"""
+
+    def __init__(self, host: str, retry_in: float):
+        super().__init__(f"CIRCUIT OPEN: {host} (retry in {retry_in:.1f}s)")
+        self.host = host
+        self.retry_in = retry_in
+
+
+def is_throttle_status(status_code: int) -> bool:
+    return status_code == 429 or status_code >= 500
+
+
+def parse_retry_after(value: str | None) -> float | None:
+    """Retry-After 헤더 (초 단위만 지원, HTTP-date 는 무시)"""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        return None
+
+
+def backoff_delay(attempt: int, base: float = 1.0, cap: float = 30.0) -> float:
+    """재시도 대기: 지수 증가 + jitter (base * 2^attempt, 최대 cap)"""
+    return min(cap, base * (2 ** attempt)) * random.uniform(0.5, 1.0)
+
+
+@dataclass
+class _HostState:
+    bucket: TokenBucket
+    rate: float
+    state: str = "closed"               # closed / open / half_open
+    failures: int = 0                   # 연속 실패 수
+    trips_in_row: int = 0
+    open_until: float = 0.0
+    pause_until: float = 0.0            # Retry-After
+    probe_inflight: bool = False
+    counts: dict = field(default_factory=lambda: {"ok": 0, THROTTLED: 0, BLOCKED: 0, ERROR: 0, "trips": 0})
+    lock: threading.Lock = field(default_factory=threading.Lock)
+
+
+class AdaptiveHostLimiter(HostRateLimiter):
+    """
+    호스트별 AIMD 속도 조절 + 서킷 브레이커
+    - acquire(url)              : 서킷 확인 후 토큰 대기 (open 이면 CircuitOpenError)
+    - observe_response(url, r)  : 응답 상태/지연으로 속도 조절 (= observe_failure + observe_success)
+    - observe_failure(url, r)   : 상태 코드만 보고 실패(429/5xx/403)면 기록 → True
+    - observe_success(url, r)   : 본문 검사까지 끝난 뒤 성공 기록 (차단 페이지 200 을 성공으로 세지 않도록)
+    - record_failure(url, kind) : 차단 페이지 / 네트워크 오류 등 응답 밖의 실패
+    - metrics()                 : 호스트별 현재 속도, 서킷 상태, 결과별 횟수 + trip 이벤트
+    """
+
+    def __init__(
+        self,
+        rate: float,
+        burst: float,
+        min_rate: float = 0.2,
+        max_rate: float | None = None,
+        increase: float = 0.1,
+        decrease: float = 0.5,
+        latency_target: float = 3.0,
+        breaker_failures: int = 5,
+        breaker_cooldown: float = 30.0,
+        breaker_max_cooldown: float = 600.0,
+    ):
+        super().__init__(rate=rate, burst=burst)
+        self.min_rate = min(min_rate, rate)
+        self.max_rate = max(max_rate or rate * 2, rate)
+        self.increase = increase
+        self.decrease = decrease
+        self.latency_target = latency_target
+        self.breaker_failures = max(1, breaker_failures)
+        self.breaker_cooldown = breaker_cooldown
+        self.breaker_max_cooldown = breaker_max_cooldown
+        self._hosts: dict[str, _HostState] = {}
+        self.events: list[dict] = []    # 서킷 상태 변화 기록
+
+    def _host(self, url: str) -> tuple[str, _HostState]:
+        host = urlparse(url).netloc.lower()
+        with self._lock:
+            st = self._hosts.get(host)
+            if st is None:
+                bucket = TokenBucket(self.rate, self.burst)
+                self._buckets[host] = bucket
+                st = self._hosts[host] = _HostState(bucket=bucket, rate=self.rate)
+            return host, st
+
+    def bucket_for(self, url: str) -> TokenBucket:
+        return self._host(url)[1].bucket
+
+    def _event(self, host: str, state: str, st: _HostState):
+        self.events.append({"ts": time.time(), "host": host, "state": state, "rate": round(st.rate, 3)})
+        print(f"[BREAKER] {host} -> {state} (rate={st.rate:.2f}/s)", flush=True)
+
+    # -------------------------
+    # 요청 전
+    # -------------------------
+    def acquire(self, url: str) -> float:
+        host, st = self._host(url)
+        with st.lock:
+            now = time.monotonic()
+            if st.state == "open":
+                if now < st.open_until:
+                    raise CircuitOpenError(host, st.open_until - now)
+                st.state = "half_open"
+                st.probe_inflight = False
+                self._event(host, "half_open", st)
+            if st.state == "half_open":
+                if st.probe_inflight:
+                    raise CircuitOpenError(host, max(1.0, self.breaker_cooldown / 4))
+                st.probe_inflight = True
+            pause = st.pause_until - now
+
+        slept = 0.0
+        if pause > 0:
+            time.sleep(pause)
+            slept += pause
+        return slept + st.bucket.acquire()
+
+    # -------------------------
+    # 요청 후
+    # -------------------------
+    def observe_response(self, url: str, response) -> None:
+        if not self.observe_failure(url, response):
+            self.observe_success(url, response)
+
+    def observe_failure(self, url: str, response) -> bool:
+        code = getattr(response, "status_code", 0) or 0
+        if is_throttle_status(code):
+            retry_after = parse_retry_after(getattr(response, "headers", {}).get("Retry-After"))
+            self.record_failure(url, THROTTLED, retry_after=retry_after)
+            return True
+        if code == 403:
+            self.record_failure(url, BLOCKED)
+            return True
+        return False
+
+    def observe_success(self, url: str, response) -> None:
+        code = getattr(response, "status_code", 0) or 0
+        if code < 400:
+            elapsed = getattr(response, "elapsed", None)
+            self.record_success(url, elapsed.total_seconds() if elapsed is not None else 0.0)
+        else:
+            # 그 외 4xx(404 등): 호스트는 응답하고 있음 → 서킷만 정상 처리, 속도는 유지
+            self.record_success(url, latency=float("inf"))
+
+    def record_success(self, url: str, latency: float = 0.0) -> None:
+        host, st = self._host(url)
+        with st.lock:
+            st.counts["ok"] += 1
+            st.failures = 0
+            if st.state != "closed":
+                st.state = "closed"
+                st.trips_in_row = 0
+                st.probe_inflight = False
+                self._event(host, "closed", st)
+            if latency <= self.latency_target:
+                st.rate = min(self.max_rate, st.rate + self.increase)
+                st.bucket.set_rate(st.rate)
+
+    def record_failure(self, url: str, kind: str = ERROR, retry_after: float | None = None) -> None:
+        host, st = self._host(url)
+        with st.lock:
+            st.counts[kind] = st.counts.get(kind, 0) + 1
+            st.failures += 1
+            st.rate = max(self.min_rate, st.rate * self.decrease)
+            st.bucket.set_rate(st.rate)
+            now = time.monotonic()
+            if retry_after:
+                st.pause_until = max(st.pause_until, now + retry_after)
+
+            if st.state == "half_open" or st.failures >= self.breaker_failures:
+                cooldown = min(self.breaker_max_cooldown, self.breaker_cooldown * (2 ** st.trips_in_row))
+                st.state = "open"
+                st.open_until = now + max(cooldown, retry_after or 0.0)
+                st.trips_in_row += 1
+                st.failures = 0
+                st.probe_inflight = False
+                st.counts["trips"] += 1
+                self._event(host, "open", st)
+
+    def metrics(self) -> dict:
+        out = {}
+        with self._lock:
+            hosts = list(self._hosts.items())
+        for host, st in hosts:
+            with st.lock:
+                out[host] = {"rate": round(st.rate, 3), "state": st.state, **st.counts}
+        return out
+
+    def summary(self) -> str:
+        parts = [
+            f"{host} rate={m['rate']}/s state={m['state']} ok={m['ok']} "
+            f"throttled={m[THROTTLED]} blocked={m[BLOCKED]} error={m[ERROR]} trips={m['trips']}"
+            for host, m in self.metrics().items()
+        ]
+        return "; ".join(parts) if parts else "-"
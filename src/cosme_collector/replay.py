@@ -0,0 +1,240 @@
+from __future__ import annotations
+
+import argparse
+import hashlib
+import json
+import os
+import random
+import threading
+import time
+from datetime import timedelta
+from pathlib import Path
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+from requests.utils import get_encoding_from_headers
+
+# =========================
+# HTTP 녹화 / 재생 (cosme.net 없이 run_all / fetch_html_safe / download_image_safe 실행)
+#
+# fixture archive (디렉터리)
+#   index.json               url → {status, reason, headers, sha256}
+#   bodies/ab/<sha256>       응답 본문 (디코딩된 바이트, 같은 내용은 1개)
+#
+# - RecordingAdapter : 실제 요청 결과를 archive 에 저장 (main.py --record DIR)
+# - ReplayAdapter    : archive 에서 응답 재생 (main.py --replay DIR, bench.py)
+#     latency_ms / jitter_ms : 요청마다 지연
+#     error_rate             : 503 응답 비율
+#     drop_rate              : 연결 오류(ConnectionError) 비율
+#     If-None-Match / If-Modified-Since 가 맞으면 304
+# - 둘 다 transport.Transport(adapter=...) 로 끼워서 사용 → 호출 코드는 그대로
+# =========================
+
+# 본문은 디코딩해서 저장하므로 전송 관련 헤더는 버림
+_DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding", "connection", "set-cookie"}
+
+
+class FixtureArchive:
+    def __init__(self, root: Path):
+        self.root = Path(root)
+        self.body_dir = self.root / "bodies"
+        self.index_path = self.root / "index.json"
+        self._index: dict[str, dict] = {}
+        if self.index_path.exists():
+            self._index = json.loads(self.index_path.read_text(encoding="utf-8"))
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._index)
+
+    def urls(self) -> list[str]:
+        return list(self._index)
+
+    def get(self, url: str) -> dict | None:
+        return self._index.get(url)
+
+    def body(self, entry: dict) -> bytes:
+        sha = entry["sha256"]
+        return (self.body_dir / sha[:2] / sha).read_bytes()
+
+    def put(self, url: str, status: int, reason: str, headers: dict, body: bytes):
+        sha = hashlib.sha256(body).hexdigest()
+        p = self.body_dir / sha[:2] / sha
+        if not p.exists():
+            p.parent.mkdir(parents=True, exist_ok=True)
+            tmp = p.with_name(p.name + f".{threading.get_ident()}.tmp")
+            tmp.write_bytes(body)
+            os.replace(tmp, p)
+        with self._lock:
+            self._index[url] = {
+                "status": status,
+                "reason": reason,
+                "headers": {k: v for k, v in headers.items() if k.lower() not in _DROP_HEADERS},
+                "sha256": sha,
+            }
+
+    def save(self):
+        self.root.mkdir(parents=True, exist_ok=True)
+        with self._lock:
+            data = json.dumps(self._index, ensure_ascii=False, indent=1)
+        tmp = self.index_path.with_suffix(".json.tmp")
+        tmp.write_text(data, encoding="utf-8")
+        os.replace(tmp, self.index_path)
+
+
+class RecordingAdapter(HTTPAdapter):
+    """
+    실제로 요청하고 결과(200/404 등 최종 상태 그대로)를 archive 에 기록
+    - 조건부 요청 헤더는 떼고 보냄 → 캐시 / 이미지 저장소 재검증도 304 대신 본문째 녹화
+      (받는 쪽은 200 을 새 응답으로 처리하므로 동작은 같음)
+    """
+
+    _CONDITIONAL_HEADERS = ("If-None-Match", "If-Modified-Since")
+
+    def __init__(self, archive: FixtureArchive, **kwargs):
+        super().__init__(**kwargs)
+        self.archive = archive
+
+    def send(self, request, **kwargs):
+        for h in self._CONDITIONAL_HEADERS:
+            request.headers.pop(h, None)
+        r = super().send(request, **kwargs)
+        if r.status_code != 304:
+            # stream=True 요청이어도 여기서 본문을 읽어둠 (이후 iter_content 는 읽은 본문을 나눠서 줌)
+            self.archive.put(request.url, r.status_code, r.reason or "", dict(r.headers), r.content)
+        return r
+
+
+class ReplayAdapter(HTTPAdapter):
+    """archive 의 응답을 네트워크 없이 돌려줌 (archive 에 없는 url 은 404)"""
+
+    def __init__(
+        self,
+        archive: FixtureArchive,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        drop_rate: float = 0.0,
+        seed: int | None = 0,
+    ):
+        super().__init__()
+        self.archive = archive
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.drop_rate = drop_rate
+        self._rng = random.Random(seed)
+        self._lock = threading.Lock()
+        self.stats = {"requests": 0, "served": 0, "not_modified": 0, "missing": 0, "errors": 0, "drops": 0}
+
+    def _roll(self) -> tuple[float, float]:
+        with self._lock:
+            return self._rng.random(), self._rng.uniform(0.0, self.jitter_ms)
+
+    def _count(self, key: str):
+        with self._lock:
+            self.stats[key] += 1
+
+    def _response(self, request, status: int, reason: str, headers: dict, body: bytes, elapsed: float):
+        r = requests.Response()
+        r.status_code = status
+        r.reason = reason
+        r.headers = CaseInsensitiveDict(headers)
+        r._content = body
+        r._content_consumed = True
+        r.encoding = get_encoding_from_headers(r.headers)
+        r.url = request.url
+        r.request = request
+        r.connection = self
+        r.elapsed = timedelta(seconds=elapsed)
+        return r
+
+    def send(self, request, **kwargs):
+        self._count("requests")
+        roll, jitter = self._roll()
+        delay = (self.latency_ms + jitter) / 1000.0
+        if delay > 0:
+            time.sleep(delay)
+
+        if roll < self.drop_rate:
+            self._count("drops")
+            raise requests.ConnectionError(f"replay: injected connection drop ({request.url})", request=request)
+        if roll < self.drop_rate + self.error_rate:
+            self._count("errors")
+            return self._response(request, 503, "Service Unavailable", {"Retry-After": "0"}, b"", delay)
+
+        entry = self.archive.get(request.url)
+        if entry is None:
+            self._count("missing")
+            return self._response(request, 404, "Not Found", {}, b"", delay)
+
+        headers = entry["headers"]
+        etag = headers.get("ETag")
+        last_modified = headers.get("Last-Modified")
+        if (etag and request.headers.get("If-None-Match") == etag) or (
+            last_modified and request.headers.get("If-Modified-Since") == last_modified
+        ):
+            self._count("not_modified")
+            return self._response(request, 304, "Not Modified", headers, b"", delay)
+
+        self._count("served")
+        return self._response(request, entry["status"], entry["reason"], headers, self.archive.body(entry), delay)
+
+    def close(self):
+        pass
+
+
+# -------------------------
+# 기존 캐시 → archive (실제 녹화 없이 fixture 만들기)
+# -------------------------
+def import_html_cache(archive: FixtureArchive, html_cache_dir: Path) -> int:
+    """output/cosme/_html (HtmlCache) 의 페이지를 archive 로"""
+    n = 0
+    for meta_path in Path(html_cache_dir).glob("*/*.json"):
+        meta = json.loads(meta_path.read_text(encoding="utf-8"))
+        html_path = meta_path.with_suffix(".html")
+        if not html_path.exists() or not meta.get("url"):
+            continue
+        headers = {"Content-Type": "text/html; charset=utf-8"}
+        if meta.get("etag"):
+            headers["ETag"] = meta["etag"]
+        if meta.get("last_modified"):
+            headers["Last-Modified"] = meta["last_modified"]
+        archive.put(meta["url"], 200, "OK", headers, html_path.read_bytes())
+        n += 1
+    return n
+
+
+def import_image_store(archive: FixtureArchive, image_store_dir: Path) -> int:
+    """output/cosme/_images (ImageStore) 의 이미지를 archive 로"""
+    index_path = Path(image_store_dir) / "index.json"
+    if not index_path.exists():
+        return 0
+    n = 0
+    for url, e in json.loads(index_path.read_text(encoding="utf-8")).items():
+        blob = Path(image_store_dir) / "blobs" / e["sha256"][:2] / f'{e["sha256"]}{e["ext"]}'
+        if not blob.exists():
+            continue
+        headers = {}
+        if e.get("etag"):
+            headers["ETag"] = e["etag"]
+        if e.get("last_modified"):
+            headers["Last-Modified"] = e["last_modified"]
+        archive.put(url, 200, "OK", headers, blob.read_bytes())
+        n += 1
+    return n
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HtmlCache / ImageStore → replay fixture archive")
+    parser.add_argument("archive", type=Path)
+    # main.py 와 같은 base_dir(src/) → HtmlCache(_html) / ImageStore(_images) 는 src/output/cosme 아래
+    parser.add_argument("--output-dir", type=Path, default=Path(__file__).resolve().parents[1] / "output" / "cosme")
+    args = parser.parse_args()
+
+    archive = FixtureArchive(args.archive)
+    pages = import_html_cache(archive, args.output_dir / "_html")
+    images = import_image_store(archive, args.output_dir / "_images")
+    archive.save()
+    print(f"[REPLAY] archive={args.archive} pages={pages} images={images} total={len(archive)}")
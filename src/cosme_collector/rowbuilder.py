@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from array import array
+from dataclasses import fields
+from operator import attrgetter
+from typing import Iterable, Sequence
+
+import numpy as np
+import pandas as pd
+
+
+class RowColumns:
+    """
+    컬럼 단위 Row 빌더
+    - 값은 컬럼별 배열에 바로 추가 (Row → dict → DataFrame 변환 없음)
+    - categorical 컬럼(source, date, ranking_type ...)은 사전 인코딩:
+      값 → 정수 코드(array('i')), None → -1
+      → pandas Categorical / Arrow DictionaryArray 로 그대로 넘김
+    """
+
+    def __init__(self, columns: Sequence[str], categorical: Iterable[str] = ()):
+        cat = set(categorical)
+        self.columns = list(columns)
+        self._dicts: list[dict | None] = [{} if c in cat else None for c in self.columns]
+        self._data: list = [array("i") if d is not None else [] for d in self._dicts]
+        self._n = 0
+        self._getter = attrgetter(*self.columns)
+
+    @classmethod
+    def for_row(cls, row_cls, categorical: Iterable[str] = ()) -> "RowColumns":
+        return cls([f.name for f in fields(row_cls)], categorical=categorical)
+
+    def __len__(self) -> int:
+        return self._n
+
+    def append(self, values: Sequence):
+        """columns 순서의 값 1행 추가"""
+        for data, d, v in zip(self._data, self._dicts, values):
+            if d is None:
+                data.append(v)
+            elif v is None:
+                data.append(-1)
+            else:
+                code = d.get(v)
+                if code is None:
+                    code = d[v] = len(d)
+                data.append(code)
+        self._n += 1
+
+    def extend_rows(self, rows: Iterable):
+        """Row(dataclass/slots) 객체들을 속성에서 바로 읽어 추가"""
+        for r in rows:
+            self.append(self._getter(r))
+
+    def clear(self):
+        for i, d in enumerate(self._dicts):
+            if d is None:
+                self._data[i] = []
+            else:
+                # 코드 사전은 유지 (다음 배치에서도 같은 코드)
+                self._data[i] = array("i")
+        self._n = 0
+
+    def to_frame(self) -> pd.DataFrame:
+        out = {}
+        for name, data, d in zip(self.columns, self._data, self._dicts):
+            if d is None:
+                out[name] = data
+            else:
+                out[name] = pd.Categorical.from_codes(
+                    np.asarray(data, dtype=np.int32),
+                    categories=list(d),
+                )
+        return pd.DataFrame(out, columns=self.columns)
+
+    def to_arrow(self, schema=None):
+        """pyarrow.Table (categorical 컬럼은 dictionary 타입)"""
+        import pyarrow as pa
+
+        arrays = []
+        for name, data, d in zip(self.columns, self._data, self._dicts):
+            if d is None:
+                tp = schema.field(name).type if schema is not None else None
+                arrays.append(pa.array(data, type=tp))
+            else:
+                codes = np.asarray(data, dtype=np.int32)
+                indices = pa.array(codes, mask=codes < 0, type=pa.int32())
+                arrays.append(pa.DictionaryArray.from_arrays(indices, pa.array(list(d), type=pa.string())))
+        if schema is not None:
+            return pa.Table.from_arrays(arrays, schema=schema)
+        return pa.Table.from_arrays(arrays, names=self.columns)
@@ -0,0 +1,193 @@
+from __future__ import annotations
+
+import csv
+import sqlite3
+import typing
+from dataclasses import fields
+from pathlib import Path
+from typing import Protocol
+
+from src.cosme_collector.rowbuilder import RowColumns
+
+# =========================
+# Row 싱크
+# - pipeline.iter_page_rows 가 페이지마다 내보내는 Row 리스트를 바로 기록
+# - 크롤링 도중에도 결과 파일/테이블에서 부분 결과 확인 가능
+# - Row 는 dataclass 이기만 하면 됨 (pipeline 을 import 하지 않음)
+# =========================
+
+
+class RowSink(Protocol):
+    def write(self, rows: list) -> None: ...
+
+    def close(self) -> None: ...
+
+
+def row_field_types(row_cls) -> list[tuple[str, type]]:
+    """dataclass 필드 → [(이름, 기본 타입)]  (Optional[int] → int)"""
+    hints = typing.get_type_hints(row_cls)
+    out = []
+    for f in fields(row_cls):
+        tp = hints[f.name]
+        if typing.get_origin(tp) is typing.Union:
+            tp = next(a for a in typing.get_args(tp) if a is not type(None))
+        out.append((f.name, tp))
+    return out
+
+
+def arrow_schema(row_cls, categorical: tuple[str, ...] = ()):
+    """Row 타입 힌트 → pyarrow 스키마 (categorical 컬럼은 dictionary<int32, string>)"""
+    import pyarrow as pa
+
+    to_pa = {int: pa.int64(), float: pa.float64(), str: pa.string()}
+    out = []
+    for name, tp in row_field_types(row_cls):
+        if name in categorical:
+            out.append((name, pa.dictionary(pa.int32(), pa.string())))
+        else:
+            out.append((name, to_pa.get(tp, pa.string())))
+    return pa.schema(out)
+
+
+class CsvSink:
+    """CSV 에 페이지마다 이어쓰기 (utf-8-sig, 헤더는 처음 1번)"""
+
+    def __init__(self, path: Path, encoding: str = "utf-8-sig"):
+        self.path = Path(path)
+        self.encoding = encoding
+        self._f = None
+        self._w = None
+        self._cols: list[str] = []
+
+    def write(self, rows: list):
+        if not rows:
+            return
+        if self._f is None:
+            self._cols = [f.name for f in fields(rows[0])]
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._f = open(self.path, "w", encoding=self.encoding, newline="")
+            self._w = csv.writer(self._f)
+            self._w.writerow(self._cols)
+        self._w.writerows(
+            ["" if v is None else v for v in (getattr(r, c) for c in self._cols)]
+            for r in rows
+        )
+        self._f.flush()
+
+    def close(self):
+        if self._f is not None:
+            self._f.close()
+            self._f = None
+
+
+class ParquetSink:
+    """
+    Parquet 파일에 row group 단위로 기록 (pyarrow 필요)
+    - 스키마는 Row 타입 힌트에서 고정 (전부 None 인 배치가 와도 타입 유지)
+    - categorical 컬럼은 dictionary 타입으로 기록
+    - 배치는 RowColumns 에 컬럼 단위로 모았다가 Arrow Table 로 변환
+    """
+
+    def __init__(
+        self,
+        path: Path,
+        row_group_size: int = 5000,
+        compression: str = "zstd",
+        categorical: tuple[str, ...] = (),
+    ):
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError as e:
+            raise RuntimeError("ParquetSink 는 pyarrow 가 필요합니다: pip install pyarrow") from e
+        self.path = Path(path)
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.categorical = tuple(categorical)
+        self._buf: RowColumns | None = None
+        self._writer = None
+        self._schema = None
+
+    def _flush(self):
+        if self._buf is None or not len(self._buf):
+            return
+        import pyarrow.parquet as pq
+
+        if self._writer is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._writer = pq.ParquetWriter(self.path, self._schema, compression=self.compression)
+
+        self._writer.write_table(self._buf.to_arrow(self._schema), row_group_size=self.row_group_size)
+        self._buf.clear()
+
+    def write(self, rows: list):
+        if not rows:
+            return
+        if self._buf is None:
+            self._schema = arrow_schema(type(rows[0]), self.categorical)
+            self._buf = RowColumns.for_row(type(rows[0]), categorical=self.categorical)
+        self._buf.extend_rows(rows)
+        if len(self._buf) >= self.row_group_size:
+            self._flush()
+
+    def close(self):
+        self._flush()
+        if self._writer is not None:
+            self._writer.close()
+            self._writer = None
+
+
+class SqliteSink:
+    """
+    SQLite 테이블(기본: cosme)에 페이지마다 INSERT + commit
+    - laneige.db 스키마 테이블(src/database/schema.py 의 cosme / amazon)이면
+      migrate 후 INSERT OR REPLACE (natural key 중복은 1행) + source_file 기록
+      → source_file 에 같은 수집의 주차 CSV 경로(loader 의 manifest 경로)를 주면
+        나중에 loader 가 그 CSV 를 적재할 때 이 행들도 파일 단위로 교체됨
+    - 그 외 테이블은 Row 타입대로 만들고 INSERT
+    """
+
+    _SQL_TYPES = {int: "INTEGER", float: "REAL", str: "TEXT"}
+
+    def __init__(self, db_path: Path, table: str = "cosme", source_file: str | None = None):
+        self.db_path = Path(db_path)
+        self.table = table
+        self.source_file = source_file or f"sink:{self.db_path.name}"
+        self._conn: sqlite3.Connection | None = None
+        self._insert_sql = ""
+        self._cols: list[str] = []
+        self._to_params = None
+
+    def _open(self, row_cls):
+        from src.database.schema import TABLES, csv_insert, migrate
+
+        self._conn = sqlite3.connect(self.db_path)
+        types = row_field_types(row_cls)
+        self._cols = [name for name, _ in types]
+
+        spec = TABLES.get(self.table)
+        if spec is not None:
+            migrate(self._conn)
+            cols = [c for c in self._cols if c in spec.column_names]
+            self._insert_sql, to_params = csv_insert(spec, cols, {"source_file": self.source_file})
+            self._to_params = lambda r: to_params([getattr(r, c) for c in cols])
+            return
+
+        col_defs = ", ".join(f'"{name}" {self._SQL_TYPES.get(tp, "TEXT")}' for name, tp in types)
+        self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{self.table}" ({col_defs})')
+        col_names = ", ".join(f'"{c}"' for c in self._cols)
+        placeholders = ", ".join("?" for _ in self._cols)
+        self._insert_sql = f'INSERT INTO "{self.table}" ({col_names}) VALUES ({placeholders})'
+        self._to_params = lambda r: [getattr(r, c) for c in self._cols]
+
+    def write(self, rows: list):
+        if not rows:
+            return
+        if self._conn is None:
+            self._open(type(rows[0]))
+        with self._conn:
+            self._conn.executemany(self._insert_sql, (self._to_params(r) for r in rows))
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
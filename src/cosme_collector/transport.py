@@ -0,0 +1,149 @@
+from __future__ import annotations
+
+import hashlib
+import os
+import threading
+from pathlib import Path
+from typing import Union
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# =========================
+# 공유 HTTP 전송 계층
+# - 커넥션 풀(HTTPAdapter)은 프로세스에 하나 → 모든 워커가 keep-alive 연결 재사용
+#   (urllib3 풀은 스레드 안전, requests.Session 은 아니므로 Session 은 스레드별로 만들고 adapter/cookie 만 공유)
+# - 호스트별 풀 크기 지정 가능 (www.cosme.net = 페이지 워커 수, 그 외 = 기본값)
+# - Accept-Encoding: gzip/deflate (+ brotli 패키지가 있으면 br)
+# - 큰 응답(이미지)은 stream_to_file 로 청크 단위 디스크 기록 (r.content 로 메모리에 올리지 않음)
+# =========================
+
+DEFAULT_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) "
+        "AppleWebKit/537.36 (KHTML, like Gecko) "
+        "Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8",
+    "Accept-Language": "ja,en-US;q=0.9,en;q=0.8,ko;q=0.7",
+    "Connection": "keep-alive",
+    "Upgrade-Insecure-Requests": "1",
+}
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+
+def accept_encoding() -> str:
+    """urllib3 가 실제로 풀 수 있는 인코딩만 광고 (br 은 brotli / brotlicffi 필요)"""
+    encodings = ["gzip", "deflate"]
+    try:
+        import brotli  # noqa: F401
+        encodings.append("br")
+    except ImportError:
+        try:
+            import brotlicffi  # noqa: F401
+            encodings.append("br")
+        except ImportError:
+            pass
+    return ", ".join(encodings)
+
+
+class Transport:
+    """
+    스레드 안전 공유 HTTP 클라이언트 (requests.Session 의 get/head 와 같은 형태)
+    - pool_maxsize       : 호스트당 유지할 연결 수 (기본)
+    - host_pool_sizes    : {"www.cosme.net": 4, ...} 호스트별 연결 수
+    - pool_block=True 이면 풀이 꽉 찼을 때 새 연결을 만들지 않고 대기
+    - adapter 를 넘기면 모든 요청이 그 adapter 로 감 (replay.RecordingAdapter / ReplayAdapter)
+    """
+
+    def __init__(
+        self,
+        headers: dict | None = None,
+        pool_connections: int = 10,
+        pool_maxsize: int = 10,
+        host_pool_sizes: dict[str, int] | None = None,
+        pool_block: bool = False,
+        adapter: HTTPAdapter | None = None,
+    ):
+        self.headers = {**DEFAULT_HEADERS, **(headers or {})}
+        self.headers["Accept-Encoding"] = accept_encoding()
+        self.cookies = requests.cookies.RequestsCookieJar()   # CookieJar 는 내부 lock 으로 스레드 안전
+
+        self._default = adapter or HTTPAdapter(
+            pool_connections=pool_connections,
+            pool_maxsize=pool_maxsize,
+            pool_block=pool_block,
+        )
+        self._host_adapters = {} if adapter is not None else {
+            host.lower(): HTTPAdapter(pool_connections=1, pool_maxsize=size, pool_block=pool_block)
+            for host, size in (host_pool_sizes or {}).items()
+        }
+        self._local = threading.local()
+        self._sessions: list[requests.Session] = []
+        self._lock = threading.Lock()
+
+    def session(self) -> requests.Session:
+        """현재 스레드 전용 Session (adapter / cookie / header 는 공유)"""
+        s = getattr(self._local, "session", None)
+        if s is None:
+            s = requests.Session()
+            s.headers.update(self.headers)
+            s.cookies = self.cookies
+            s.mount("http://", self._default)
+            s.mount("https://", self._default)
+            for host, adapter in self._host_adapters.items():
+                s.mount(f"https://{host}", adapter)
+                s.mount(f"http://{host}", adapter)
+            self._local.session = s
+            with self._lock:
+                self._sessions.append(s)
+        return s
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.session().get(url, **kwargs)
+
+    def head(self, url: str, **kwargs) -> requests.Response:
+        return self.session().head(url, **kwargs)
+
+    def close(self):
+        with self._lock:
+            sessions, self._sessions = self._sessions, []
+        for s in sessions:
+            # mount 된 adapter 는 공유라서 Session.close() 대신 adapter 를 한 번씩만 닫음
+            s.adapters.clear()
+        self._default.close()
+        for adapter in self._host_adapters.values():
+            adapter.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+# 기존 requests.Session 을 넘기는 호출(테스트 등)도 그대로 허용
+HttpSession = Union[requests.Session, Transport]
+
+
+def stream_to_file(r: requests.Response, out_path: Path, chunk_size: int = STREAM_CHUNK_SIZE) -> tuple[str, int]:
+    """
+    stream=True 응답 본문을 out_path 에 청크 단위로 기록 (임시 파일 → rename)
+    반환값: (sha256, 바이트 수)
+    """
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = out_path.with_name(out_path.name + f".{threading.get_ident()}.part")
+    h = hashlib.sha256()
+    size = 0
+    try:
+        with open(tmp, "wb") as f:
+            for chunk in r.iter_content(chunk_size=chunk_size):
+                if chunk:
+                    f.write(chunk)
+                    h.update(chunk)
+                    size += len(chunk)
+        os.replace(tmp, out_path)
+    finally:
+        tmp.unlink(missing_ok=True)
+    return h.hexdigest(), size
@@ -1,28 +1,16 @@
 from __future__ import annotations
 
-import re
 from pathlib import Path
 from typing import Union
 
+from src.cosme_collector.normalize import split_product_name
+
 
 # -------------------------
 # 상품명 split
 # -------------------------
 def rule_split(product_name, brand_name=None):
-    if not product_name:
-        return product_name
-
-    s = str(product_name).strip()
-
-    if brand_name:
-        b = str(brand_name).strip()
-        if b and s.startswith(b):
-            parts = re.split(r"\s*[\/／]\s*", s, maxsplit=1)
-            return parts[1].strip() if len(parts) == 2 else s
-        return s
-
-    parts = re.split(r"\s*[\/／]\s*", s, maxsplit=1)
-    return parts[1].strip() if len(parts) == 2 else s
+    return split_product_name(product_name, brand_name)
 
 
 # -------------------------
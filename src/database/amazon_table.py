@@ -1,10 +1,9 @@
 # src/database/cosme_table.py
 # amazon 테이블에 CSV 데이터를 적재하는 스크립트
-# 기존에 있던 amazon 테이블을 삭제하고, output/amazon 폴더의 모든 CSV 파일을 읽어와서 amazon 테이블에 적재함
+# output/amazon 폴더의 CSV 중 새로 생기거나 바뀐 파일만 amazon 테이블에 적재함 (src/database/loader.py)
 
 import sqlite3
 from pathlib import Path
-import pandas as pd
 
 
 # =========================
@@ -13,46 +12,89 @@ import pandas as pd
 BASE_DIR = Path(__file__).resolve().parents[2]  # AMORE
 OUTPUT_DIR = BASE_DIR / "output" / "amazon"
 DB_PATH = BASE_DIR / "laneige.db"
+DATASET_DIR = BASE_DIR / "output" / "dataset"
 
 
 # =========================
 # DB 저장 로직
 # =========================
-def save_csvs_to_sqlite():
-    print(f"[INFO] DB 경로: {DB_PATH}")
+def save_csvs_to_sqlite(full: bool = False):
+    """
+    output/amazon 의 CSV 적재 (src/database/loader.py 로 증분 적재)
+    - 새로 생기거나 바뀐 CSV 만, 그 파일의 행만 교체
+    - amazon 스키마가 아닌 CSV 는 건너뜀
+    - full=True 면 테이블을 지우고 전부 다시 적재
+    """
+    import sys
+    sys.path.insert(0, str(BASE_DIR))
+    from src.database.loader import load_all
+
     print(f"[INFO] CSV 폴더: {OUTPUT_DIR}")
+    load_all(["amazon"], db_path=DB_PATH, full=full)
+
+
+def save_dataset_to_sqlite():
+    """
+    CSV 대신 Parquet 데이터셋(output/dataset/source=amazon)에서 적재
+    - 타입이 스키마대로 유지됨 (product_id 등 id 는 문자열)
+    - 파티션 컬럼 week 는 테이블 컬럼이 아니므로 읽지 않음
+    """
+    import sys
+    sys.path.insert(0, str(BASE_DIR))
+    from src.database.loader import forget_table
+    from src.database.schema import insert_frame, migrate
+    from src.database.summary import refresh_product_summary
+    from src.cosme_collector.dataset import read_amazon, AMAZON_FIELDS
+
+    print(f"[INFO] DB 경로: {DB_PATH}")
+    print(f"[INFO] 데이터셋: {DATASET_DIR}")
 
-    csv_files = list(OUTPUT_DIR.glob("*.csv"))
-    if not csv_files:
-        print("[WARN] CSV 파일이 없습니다.")
+    df = read_amazon(DATASET_DIR, columns=[c for c, _ in AMAZON_FIELDS])
+    if df.empty:
+        print("[WARN] 데이터셋이 비어 있습니다.")
         return
 
     conn = sqlite3.connect(DB_PATH)
-    cursor = conn.cursor()
-
-    # 기존 테이블 삭제
-    print("[INFO] 기존 amazon 테이블 삭제")
-    cursor.execute("DROP TABLE IF EXISTS amazon")
-    conn.commit()
+    try:
+        migrate(conn)
+        # 교체 / manifest 초기화 / 요약 갱신을 한 트랜잭션으로 → 중간에 실패하면 전부 롤백
+        with conn:
+            conn.execute("DELETE FROM amazon")
+            insert_frame(conn, "amazon", df)
+            # CSV manifest 는 더 이상 테이블 내용과 맞지 않음 → 다음 CSV 적재 때 전체 다시
+            forget_table(conn, "amazon")
+            refresh_product_summary(conn, "amazon")
+    finally:
+        conn.close()
+    print(f"[DONE] amazon 테이블 데이터셋으로 교체 완료 ({len(df)} rows)")
 
-    # CSV → DB
-    for csv_file in csv_files:
-        print(f"[LOAD] {csv_file.name}")
-        df = pd.read_csv(csv_file)
 
-        df.to_sql(
-            name="amazon",
-            con=conn,
-            if_exists="append",
-            index=False
-        )
+def update_xref():
+    """적재 후 cosme ↔ amazon 상품 연결(product_xref) 증분 갱신"""
+    import sys
+    sys.path.insert(0, str(BASE_DIR))
+    from src.database.product_xref import update_product_xref
 
-    conn.close()
-    print("[DONE] cosme 테이블 재생성 및 CSV 적재 완료")
+    conn = sqlite3.connect(DB_PATH)
+    try:
+        update_product_xref(conn)
+    finally:
+        conn.close()
 
 
 # =========================
 # 실행
 # =========================
 if __name__ == "__main__":
-    save_csvs_to_sqlite()
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--parquet", action="store_true", help="CSV 대신 output/dataset 에서 적재")
+    parser.add_argument("--full", action="store_true", help="CSV 증분 적재 대신 전부 다시 적재")
+    args = parser.parse_args()
+
+    if args.parquet:
+        save_dataset_to_sqlite()
+        update_xref()
+    else:
+        save_csvs_to_sqlite(full=args.full)
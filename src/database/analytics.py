@@ -0,0 +1,479 @@
+# src/database/analytics.py
+# 주차를 넘나드는 분석 쿼리 모음 (DuckDB, duckdb 패키지 필요)
+# output/ 의 주차 CSV / Parquet 데이터셋과 laneige.db 를 DuckDB 뷰로 등록하고,
+# 순위 이동 / 브랜드 점유율 / 카테고리 커버리지 같은 쿼리를 파라미터만 바꿔 실행함
+# (파일 전체를 pandas 로 올리지 않고 DuckDB 가 컬럼 단위로 읽음, 메모리가 모자라면 임시 파일 사용)
+#
+#   python -m src.database.analytics movers --top 20
+#   python -m src.database.analytics share --source amazon --top-n 50
+#   python -m src.database.analytics coverage --brand laneige
+#   python -m src.database.analytics distribution --brand laneige
+#
+# 뷰
+#   cosme / amazon      : 주차 스냅샷 행 (snapshot = "week3" ...), output/dataset 이 있으면 Parquet, 없으면 CSV
+#   cosme_ranked        : 스냅샷 x 순위 키별 1행 (rank_value = group_rank, 없으면 global_rank)
+#   amazon_ranked       : 스냅샷 x 카테고리 x 상품 1행 (중복 수집 행 제거, brand = BrandResolver 로 찾은 브랜드 키)
+#   db_<테이블>         : laneige.db 테이블 (--db 를 줬고 DuckDB sqlite 확장이 설치돼 있을 때만)
+
+import glob
+import sys
+import tempfile
+from pathlib import Path
+
+
+# =========================
+# 경로 설정
+# =========================
+BASE_DIR = Path(__file__).resolve().parents[2]  # AMORE
+OUTPUT_DIR = BASE_DIR / "output"
+DATASET_DIR = OUTPUT_DIR / "dataset"
+DB_PATH = BASE_DIR / "laneige.db"
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.database.product_xref import BRAND_ALIASES, BrandResolver  # noqa: E402
+
+COSME_GLOB = str(OUTPUT_DIR / "cosme" / "week*_cosme.csv")
+AMAZON_GLOB = str(OUTPUT_DIR / "amazon" / "*_amazon.csv")
+
+# ranking.py 의 KEY_COLS 와 같은 순위 키
+KEY_COLS = ["category_id", "ranking_type", "group_type", "group_value", "product_id"]
+
+# 메모리 한도를 넘는 정렬 / 조인은 이 폴더에 임시 파일로
+TEMP_DIR = Path(tempfile.gettempdir()) / "laneige_duckdb"
+
+# CSV 에서 숫자로 추론되면 안 되는 컬럼
+COSME_CSV_TYPES = {"product_id": "VARCHAR", "category_id": "VARCHAR", "group_value": "VARCHAR", "date": "VARCHAR"}
+AMAZON_CSV_TYPES = {"productcode": "VARCHAR", "category_id": "VARCHAR", "crawldate": "VARCHAR"}
+
+# 소스별 브랜드 / 순위 컬럼
+# (Amazon 은 brandname 이 대부분 비어 있어서 product_xref 와 같은 BrandResolver 로 상품명 앞머리에서 찾은 brand 사용)
+SOURCE_COLUMNS = {
+    "cosme": {
+        "view": "cosme_ranked",
+        "rank": "rank_value",
+        "brand": "brand_name",
+        "name": "product_name",
+        "product": "product_id",
+        "category": "category_name",
+    },
+    "amazon": {
+        "view": "amazon_ranked",
+        "rank": "rank",
+        "brand": "brand",
+        "name": "productname",
+        "product": "productcode",
+        "category": "category",
+    },
+}
+
+
+def _require_duckdb():
+    try:
+        import duckdb
+    except ImportError as e:
+        raise RuntimeError("분석 쿼리는 duckdb 가 필요합니다: pip install duckdb") from e
+    return duckdb
+
+
+def _sql_str(s: str) -> str:
+    return "'" + str(s).replace("'", "''") + "'"
+
+
+def _sql_list(paths: list) -> str:
+    return "[" + ", ".join(_sql_str(p) for p in paths) + "]"
+
+
+# =========================
+# 연결 + 뷰 등록
+# =========================
+def _has_parquet(root: Path) -> bool:
+    return root.exists() and next(root.rglob("*.parquet"), None) is not None
+
+
+def _register_cosme(con, dataset_dir: Path | None, cosme_glob: str) -> str | None:
+    root = Path(dataset_dir or "") / "source=cosme"
+    if dataset_dir is not None and _has_parquet(root):
+        con.execute(f"""
+            CREATE OR REPLACE VIEW cosme AS
+            SELECT * EXCLUDE (week), 'week' || week AS snapshot, week
+            FROM read_parquet({_sql_str(root / '**' / '*.parquet')}, hive_partitioning = true,
+                              hive_types = {{'week': INTEGER, 'category_id': VARCHAR}})
+        """)
+        return str(root)
+
+    files = sorted(glob.glob(cosme_glob))
+    if not files:
+        return None
+    con.execute(f"""
+        CREATE OR REPLACE VIEW cosme AS
+        SELECT * EXCLUDE (filename), snapshot, TRY_CAST(substr(snapshot, 5) AS INTEGER) AS week
+        FROM (
+            SELECT *, regexp_extract(parse_filename(filename), '(week\\d+)', 1) AS snapshot
+            FROM read_csv({_sql_list(files)}, union_by_name = true, filename = true,
+                          types = {COSME_CSV_TYPES})
+        )
+    """)
+    return cosme_glob
+
+
+def _register_amazon(con, dataset_dir: Path | None, amazon_glob: str) -> str | None:
+    root = Path(dataset_dir or "") / "source=amazon"
+    if dataset_dir is not None and _has_parquet(root):
+        con.execute(f"""
+            CREATE OR REPLACE VIEW amazon AS
+            SELECT * EXCLUDE (week), 'week' || week AS snapshot, week, substr(crawldate, 1, 10) AS day
+            FROM read_parquet({_sql_str(root / '**' / '*.parquet')}, hive_partitioning = true,
+                              hive_types = {{'week': INTEGER, 'category': VARCHAR}})
+        """)
+        return str(root)
+
+    files = sorted(glob.glob(amazon_glob))
+    if not files:
+        return None
+    con.execute(f"""
+        CREATE OR REPLACE VIEW amazon AS
+        SELECT * EXCLUDE (filename), snapshot, TRY_CAST(substr(snapshot, 5) AS INTEGER) AS week,
+               substr(crawldate, 1, 10) AS day
+        FROM (
+            SELECT *, regexp_extract(lower(parse_filename(filename)), '(week\\d+)', 1) AS snapshot
+            FROM read_csv({_sql_list(files)}, union_by_name = true, filename = true,
+                          types = {AMAZON_CSV_TYPES})
+        )
+    """)
+    return amazon_glob
+
+
+def _register_amazon_brands(con, has_cosme: bool):
+    """
+    amazon (productname, brandname) → brand 키 테이블 (amazon_brand)
+    - brandname 이 있으면 resolve, 없으면 상품명 앞머리에서 detect (cosme 브랜드 + BRAND_ALIASES 기준)
+    - 모르는 브랜드는 NULL ("Burt's Bees ..." 를 "Burt's" 로 세지 않음)
+    """
+    cosme_brands = [
+        r[0] for r in con.execute("SELECT DISTINCT brand_name FROM cosme WHERE brand_name IS NOT NULL").fetchall()
+    ] if has_cosme else []
+    brands = BrandResolver(cosme_brands)
+
+    rows = []
+    for name, brandname in con.execute(
+        "SELECT DISTINCT CAST(productname AS VARCHAR), CAST(brandname AS VARCHAR) FROM amazon"
+    ).fetchall():
+        key = brands.resolve(brandname) if brandname else brands.detect(name or "")[0]
+        rows.append((name, brandname, key or None))
+    con.execute("CREATE OR REPLACE TEMP TABLE amazon_brand (productname VARCHAR, brandname VARCHAR, brand VARCHAR)")
+    if rows:
+        con.executemany("INSERT INTO amazon_brand VALUES (?, ?, ?)", rows)
+
+
+def _sqlite_extension_installed(con) -> bool:
+    """sqlite 확장이 이미 설치돼 있는지 (없으면 ATTACH 가 매번 다운로드를 시도하므로 미리 확인)"""
+    row = con.execute(
+        "SELECT installed OR loaded FROM duckdb_extensions() WHERE extension_name = 'sqlite_scanner'"
+    ).fetchone()
+    return bool(row and row[0])
+
+
+def _register_db(con, db_path: Path) -> list:
+    """laneige.db 를 읽기 전용으로 붙이고 테이블마다 db_<이름> 뷰 (sqlite 확장이 없으면 건너뜀)"""
+    if not Path(db_path).exists():
+        return []
+    if not _sqlite_extension_installed(con):
+        print("[ANALYTICS] laneige.db 연결 건너뜀: DuckDB sqlite 확장이 설치되어 있지 않음 (INSTALL sqlite)")
+        return []
+    try:
+        con.execute(f"ATTACH {_sql_str(db_path)} AS laneige (TYPE sqlite, READ_ONLY)")
+    except Exception as e:
+        print(f"[ANALYTICS] laneige.db 연결 건너뜀 (DuckDB sqlite 확장 필요): {str(e).splitlines()[0]}")
+        return []
+    tables = [
+        r[0] for r in con.execute(
+            "SELECT table_name FROM information_schema.tables WHERE table_catalog = 'laneige'"
+        ).fetchall()
+    ]
+    for t in tables:
+        con.execute(f'CREATE OR REPLACE VIEW "db_{t}" AS SELECT * FROM laneige."{t}"')
+    return tables
+
+
+def connect(
+    dataset_dir: Path | None = DATASET_DIR,
+    cosme_glob: str = COSME_GLOB,
+    amazon_glob: str = AMAZON_GLOB,
+    db_path: Path | None = None,
+    memory_limit: str | None = None,
+):
+    """
+    인메모리 DuckDB 연결 + 뷰 등록
+    - dataset_dir 에 Parquet 이 있으면 그걸, 없으면 *_glob 의 CSV 를 읽음 (dataset_dir=None 이면 항상 CSV)
+    - db_path 를 주면 laneige.db 를 db_<테이블> 뷰로 붙임 (기본: 붙이지 않음)
+    """
+    duckdb = _require_duckdb()
+    con = duckdb.connect()
+    TEMP_DIR.mkdir(parents=True, exist_ok=True)
+    con.execute(f"SET temp_directory = {_sql_str(TEMP_DIR)}")
+    if memory_limit:
+        con.execute(f"SET memory_limit = {_sql_str(memory_limit)}")
+
+    cosme_src = _register_cosme(con, dataset_dir, cosme_glob)
+    amazon_src = _register_amazon(con, dataset_dir, amazon_glob)
+    if cosme_src:
+        keys = ", ".join(KEY_COLS)
+        con.execute(f"""
+            CREATE OR REPLACE VIEW cosme_ranked AS
+            SELECT * EXCLUDE (rn)
+            FROM (
+                SELECT *, COALESCE(group_rank, global_rank) AS rank_value,
+                       ROW_NUMBER() OVER (
+                           PARTITION BY snapshot, {keys}
+                           ORDER BY COALESCE(group_rank, global_rank) NULLS LAST
+                       ) AS rn
+                FROM cosme
+            )
+            WHERE rn = 1
+        """)
+    if amazon_src:
+        _register_amazon_brands(con, cosme_src is not None)
+        # 수집 CSV 에 같은 페이지가 두 번 들어간 중복 행이 있음 → 스냅샷 x 카테고리 x 상품 1행
+        con.execute("""
+            CREATE OR REPLACE VIEW amazon_ranked AS
+            SELECT * EXCLUDE (rn)
+            FROM (
+                SELECT a.*, b.brand, ROW_NUMBER() OVER (
+                           PARTITION BY a.snapshot, a.category, a.productcode
+                           ORDER BY a.rank NULLS LAST, a.crawldate DESC
+                       ) AS rn
+                FROM amazon a
+                LEFT JOIN amazon_brand b
+                  ON b.productname IS NOT DISTINCT FROM CAST(a.productname AS VARCHAR)
+                 AND b.brandname IS NOT DISTINCT FROM CAST(a.brandname AS VARCHAR)
+            )
+            WHERE rn = 1
+        """)
+    db_tables = _register_db(con, db_path) if db_path else []
+    print(f"[ANALYTICS] cosme={cosme_src} amazon={amazon_src} laneige.db={len(db_tables)} tables")
+    return con
+
+
+def _brand_filter(expr: str, brand: str) -> tuple:
+    """brand 키(laneige) 또는 표기 → (SQL 조건, 파라미터) / BRAND_ALIASES 의 모든 표기를 부분 일치로"""
+    aliases = BRAND_ALIASES.get(brand.lower(), [brand])
+    cond = " OR ".join(f"{expr} ILIKE ?" for _ in aliases)
+    return f"({cond})", [f"%{a}%" for a in aliases]
+
+
+def _snapshot_order(con, view: str) -> list:
+    return [
+        r[0] for r in con.execute(
+            f"SELECT DISTINCT snapshot, week FROM {view} WHERE snapshot <> '' ORDER BY week"
+        ).fetchall()
+    ]
+
+
+# =========================
+# 쿼리
+# =========================
+def rank_history(con, lags=(1,), since: str | None = None, until: str | None = None, weeks=None):
+    """
+    ranking.rank_history 의 DuckDB 버전 (같은 컬럼: HISTORY_COLUMNS + lag)
+    - 스냅샷 날짜(date 최솟값)가 [since, until] 안인 스냅샷만, weeks 를 주면 그 주차만
+    - 모든 (lag, 비교 대상 스냅샷) 쌍을 FULL OUTER JOIN 1번으로
+    """
+    weeks = [int(w) for w in weeks] if weeks is not None else None
+    keys = ", ".join(KEY_COLS)
+    key_match = " AND ".join(f"p.{c} IS NOT DISTINCT FROM c.{c}" for c in KEY_COLS)
+    key_out = ", ".join(f"CAST(COALESCE(p.{c}, c.{c}) AS VARCHAR) AS {c}" for c in KEY_COLS)
+    vals = ("rank_value", "product_name", "brand_name", "date")
+    prev_cols = ", ".join(f"p.{v} AS {v}_prev" for v in vals)
+    cur_cols = ", ".join(f"c.{v} AS {v}_cur" for v in vals)
+    return con.execute(f"""
+        WITH snaps AS (
+            SELECT snapshot, ROW_NUMBER() OVER (ORDER BY week) - 1 AS idx, COUNT(*) OVER () AS n
+            FROM (
+                SELECT snapshot, MIN(week) AS week, MIN(CAST(date AS VARCHAR)) AS snap_date
+                FROM cosme_ranked
+                GROUP BY snapshot
+            )
+            WHERE (? IS NULL OR snap_date >= ?) AND (? IS NULL OR snap_date <= ?)
+              AND (?::INTEGER[] IS NULL OR list_contains(?::INTEGER[], week))
+        ),
+        panel AS (
+            SELECT s.idx, s.n, {keys}, rank_value, product_name, brand_name, CAST(date AS VARCHAR) AS date
+            FROM cosme_ranked JOIN snaps s USING (snapshot)
+        ),
+        lags AS (SELECT UNNEST(?::INTEGER[]) AS lag),
+        p AS (SELECT panel.*, lag, idx + lag AS to_idx FROM panel, lags WHERE lag > 0 AND idx + lag < n),
+        c AS (SELECT panel.*, lag, idx AS to_idx FROM panel, lags WHERE lag > 0 AND idx - lag >= 0),
+        merged AS (
+            SELECT {key_out}, {prev_cols}, {cur_cols},
+                   CASE WHEN c.to_idx IS NULL THEN 'left_only'
+                        WHEN p.to_idx IS NULL THEN 'right_only'
+                        ELSE 'both' END AS _merge,
+                   COALESCE(p.lag, c.lag) AS lag,
+                   COALESCE(p.to_idx, c.to_idx) AS to_idx
+            FROM p FULL OUTER JOIN c
+              ON p.lag = c.lag AND p.to_idx = c.to_idx AND {key_match}
+        )
+        SELECT m.* EXCLUDE (to_idx, lag),
+               CASE WHEN _merge = 'left_only' THEN 'dropped'
+                    WHEN _merge = 'right_only' THEN 'new'
+                    WHEN rank_value_cur = rank_value_prev THEN 'same'
+                    WHEN rank_value_cur < rank_value_prev THEN 'up'
+                    ELSE 'down' END AS status,
+               rank_value_cur - rank_value_prev AS rank_value_diff,
+               abs(rank_value_cur - rank_value_prev) AS rank_value_moved_by,
+               f.snapshot AS from_snapshot,
+               t.snapshot AS to_snapshot,
+               m.lag
+        FROM merged m
+        JOIN snaps f ON f.idx = m.to_idx - m.lag
+        JOIN snaps t ON t.idx = m.to_idx
+        ORDER BY m.lag, m.to_idx, {keys}
+    """, [since, since, until, until, weeks, weeks, [int(l) for l in lags]]).df()
+
+
+def rank_movers(
+    con,
+    from_snapshot: str | None = None,
+    to_snapshot: str | None = None,
+    top: int = 20,
+    category_id: str | None = None,
+    brand: str | None = None,
+):
+    """두 스냅샷(기본: 마지막 2개) 사이 cosme 순위가 가장 많이 움직인 항목 (moved > 0 = 상승)"""
+    snaps = _snapshot_order(con, "cosme_ranked")
+    if to_snapshot is None:
+        to_snapshot = snaps[-1] if snaps else None
+    if from_snapshot is None and to_snapshot in snaps and snaps.index(to_snapshot) > 0:
+        from_snapshot = snaps[snaps.index(to_snapshot) - 1]
+    if from_snapshot is None or to_snapshot is None:
+        raise ValueError("비교할 스냅샷이 2개 이상 필요합니다")
+
+    where, params = ["c.snapshot = ?"], [from_snapshot, to_snapshot]
+    if category_id is not None:
+        where.append("c.category_id = ?")
+        params.append(str(category_id))
+    if brand is not None:
+        cond, p = _brand_filter("c.brand_name", brand)
+        where.append(cond)
+        params += p
+    on = " AND ".join(f"p.{c} IS NOT DISTINCT FROM c.{c}" for c in KEY_COLS)
+    return con.execute(f"""
+        SELECT c.category_id, c.category_name, c.ranking_type, c.group_type, c.group_value,
+               c.product_id, c.product_name, c.brand_name,
+               p.rank_value AS rank_prev, c.rank_value AS rank_cur,
+               p.rank_value - c.rank_value AS moved
+        FROM cosme_ranked c
+        JOIN cosme_ranked p ON p.snapshot = ? AND {on}
+        WHERE {' AND '.join(where)}
+          AND p.rank_value IS NOT NULL AND c.rank_value IS NOT NULL
+          AND p.rank_value <> c.rank_value
+        ORDER BY abs(p.rank_value - c.rank_value) DESC, c.rank_value
+        LIMIT ?
+    """, params + [int(top)]).df()
+
+
+def brand_share(con, source: str = "cosme", top_n: int = 100, ranking_type: str | None = "products_top100"):
+    """
+    스냅샷별 상위 top_n 안 브랜드 점유율
+    - cosme 는 ranking_type 하나(기본: 종합 Top100)만 셈 (카테고리별 랭킹이 겹치지 않게)
+    - amazon 은 카테고리 구분 없이 rank <= top_n
+      (브랜드를 못 찾은 상품은 brand = NULL 1행으로 묶어 스냅샷 마지막에)
+    """
+    cols = SOURCE_COLUMNS[source]
+    where, params = [f"{cols['rank']} <= ?"], [int(top_n)]
+    if source == "cosme" and ranking_type is not None:
+        where.append("ranking_type = ?")
+        params.append(ranking_type)
+    return con.execute(f"""
+        SELECT snapshot, brand, items,
+               round(items / SUM(items) OVER (PARTITION BY snapshot), 4) AS share,
+               best_rank
+        FROM (
+            SELECT snapshot, MIN(week) AS week, {cols['brand']} AS brand,
+                   COUNT(DISTINCT {cols['product']}) AS items, MIN({cols['rank']}) AS best_rank
+            FROM {cols['view']}
+            WHERE {' AND '.join(where)}
+            GROUP BY snapshot, brand
+        )
+        ORDER BY week, brand IS NULL, share DESC, best_rank
+    """, params).df()
+
+
+def category_coverage(con, brand: str = "laneige", source: str = "cosme"):
+    """스냅샷 x 카테고리별 전체 상품 수 / 브랜드 상품 수 / 브랜드 최고 순위"""
+    cols = SOURCE_COLUMNS[source]
+    cond, params = _brand_filter(cols["brand"] if source == "cosme" else cols["name"], brand)
+    return con.execute(f"""
+        SELECT snapshot, {cols['category']} AS category,
+               COUNT(DISTINCT {cols['product']}) AS products,
+               COUNT(DISTINCT {cols['product']}) FILTER (WHERE {cond}) AS brand_products,
+               MIN({cols['rank']}) FILTER (WHERE {cond}) AS brand_best_rank
+        FROM {cols['view']}
+        GROUP BY snapshot, category
+        ORDER BY MIN(week), category
+    """, params + params).df()
+
+
+def rank_distribution(con, brand: str = "laneige", source: str = "cosme", buckets=(10, 50, 100)):
+    """스냅샷별 브랜드 순위 분포 (순위 구간별 건수 + 최고 / 중앙 / 최저 순위)"""
+    cols = SOURCE_COLUMNS[source]
+    cond, params = _brand_filter(cols["brand"] if source == "cosme" else cols["name"], brand)
+    bounds = sorted(int(b) for b in buckets)
+    parts, lo = [], 0
+    for hi in bounds:
+        parts.append(f"COUNT(*) FILTER (WHERE r > {lo} AND r <= {hi}) AS \"rank_{lo + 1}_{hi}\"")
+        lo = hi
+    parts.append(f"COUNT(*) FILTER (WHERE r > {lo}) AS \"rank_{lo + 1}_\"")
+    return con.execute(f"""
+        SELECT snapshot, COUNT(*) AS entries, {', '.join(parts)},
+               MIN(r) AS best_rank, median(r) AS median_rank, MAX(r) AS worst_rank
+        FROM (
+            SELECT snapshot, week, {cols['rank']} AS r
+            FROM {cols['view']}
+            WHERE {cond} AND {cols['rank']} IS NOT NULL
+        )
+        GROUP BY snapshot
+        ORDER BY MIN(week)
+    """, params).df()
+
+
+# =========================
+# 실행
+# =========================
+if __name__ == "__main__":
+    import argparse
+
+    import pandas as pd
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("query", choices=["movers", "share", "coverage", "distribution"])
+    parser.add_argument("--source", choices=list(SOURCE_COLUMNS), default="cosme")
+    parser.add_argument("--brand", default="laneige")
+    parser.add_argument("--top", type=int, default=20, help="movers: 출력 행 수")
+    parser.add_argument("--top-n", type=int, default=100, help="share: 상위 N위 안만")
+    parser.add_argument("--from-snapshot", default=None)
+    parser.add_argument("--to-snapshot", default=None)
+    parser.add_argument("--category-id", default=None)
+    parser.add_argument("--csv", action="store_true", help="output/dataset 이 있어도 CSV 에서 읽기")
+    parser.add_argument("--db", action="store_true", help="laneige.db 도 db_<테이블> 뷰로 붙임 (DuckDB sqlite 확장 필요)")
+    parser.add_argument("--out", default=None, help="결과 CSV 경로")
+    args = parser.parse_args()
+
+    con = connect(dataset_dir=None if args.csv else DATASET_DIR, db_path=DB_PATH if args.db else None)
+    if args.query == "movers":
+        df = rank_movers(con, args.from_snapshot, args.to_snapshot, top=args.top, category_id=args.category_id)
+    elif args.query == "share":
+        df = brand_share(con, source=args.source, top_n=args.top_n)
+    elif args.query == "coverage":
+        df = category_coverage(con, brand=args.brand, source=args.source)
+    else:
+        df = rank_distribution(con, brand=args.brand, source=args.source)
+
+    if args.out:
+        df.to_csv(args.out, index=False, encoding="utf-8-sig")
+        print("saved:", args.out)
+    else:
+        with pd.option_context("display.max_rows", 200, "display.width", 200):
+            print(df)
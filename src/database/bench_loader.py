@@ -0,0 +1,144 @@
+# src/database/bench_loader.py
+# SQLite 적재 속도 비교: 예전 방식(파일마다 read_csv → to_sql) vs loader.py (배치 executemany)
+# output/ 의 주차 CSV 를 날짜만 바꿔 --scale 배로 복제한 임시 폴더로 빈 DB 에 각각 적재함
+#
+#   python -m src.database.bench_loader               # --scale 20
+#   python -m src.database.bench_loader --scale 100
+
+import contextlib
+import io
+import shutil
+import sqlite3
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from datetime import datetime, timedelta
+from pathlib import Path
+
+import pandas as pd
+
+BASE_DIR = Path(__file__).resolve().parents[2]  # AMORE
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.database.loader import SOURCES, bulk_pragmas, load_source  # noqa: E402
+
+# 소스별 날짜 컬럼 (복제본마다 DAY_STEP 일씩 밀어서 natural key 가 겹치지 않게)
+DATE_COLUMNS = {"cosme": "date", "amazon": "crawldate"}
+DAY_STEP = 1000   # 원본 주차끼리 날짜 차이(수 일)보다 훨씬 크게
+
+
+# =========================
+# 데이터 준비
+# =========================
+def _shift(value, days: int):
+    if not isinstance(value, str) or len(value) < 10:
+        return value
+    d = datetime.strptime(value[:10], "%Y-%m-%d") + timedelta(days=days)
+    return d.strftime("%Y-%m-%d") + value[10:]
+
+
+def make_scaled_sources(work_dir: Path, scale: int) -> dict:
+    """SOURCES 의 적재 대상 CSV 를 scale 배로 복제 → {name: 임시 폴더를 가리키는 Source}"""
+    out = {}
+    for name, src in SOURCES.items():
+        dst = work_dir / name
+        dst.mkdir(parents=True)
+        date_col = DATE_COLUMNS[name]
+        for path in sorted(src.directory.glob(src.pattern)):
+            if any(path.match(p) for p in src.exclude):
+                continue
+            df = pd.read_csv(path, encoding="utf-8-sig", dtype={date_col: "string"})
+            if any(c not in df.columns for c in src.required):
+                continue
+            for i in range(scale):
+                copy = df.copy()
+                copy[date_col] = copy[date_col].map(lambda v, i=i: _shift(v, DAY_STEP * i))
+                copy.to_csv(dst / f"{path.stem}_x{i:04d}.csv", index=False, encoding="utf-8-sig")
+        out[name] = replace(src, directory=dst)
+    return out
+
+
+# =========================
+# 적재 방식
+# =========================
+def load_to_sql(db_path: Path, sources: dict) -> int:
+    """예전 cosme_table / amazon_table 방식: 파일마다 read_csv → to_sql (기본 journal, 인덱스 없음)"""
+    conn = sqlite3.connect(db_path)
+    rows = 0
+    try:
+        for src in sources.values():
+            for path in sorted(src.directory.glob(src.pattern)):
+                df = pd.read_csv(path)
+                df.to_sql(name=src.table, con=conn, if_exists="append", index=False)
+                rows += len(df)
+    finally:
+        conn.close()
+    return rows
+
+
+def load_bulk(db_path: Path, sources: dict) -> int:
+    """loader.load_source: 배치 executemany + 트랜잭션 1개 + 적재 후 인덱스 생성 + 적재용 PRAGMA"""
+    conn = sqlite3.connect(db_path)
+    try:
+        with bulk_pragmas(conn):
+            for src in sources.values():
+                load_source(conn, src)
+        return sum(conn.execute(f'SELECT COUNT(*) FROM "{s.table}"').fetchone()[0] for s in sources.values())
+    finally:
+        conn.close()
+
+
+def _input_rows(sources: dict) -> int:
+    return sum(
+        len(pd.read_csv(p, usecols=[0]))
+        for src in sources.values()
+        for p in src.directory.glob(src.pattern)
+    )
+
+
+def run(scale: int) -> dict:
+    work = Path(tempfile.mkdtemp(prefix="laneige-bench-"))
+    try:
+        sources = make_scaled_sources(work / "csv", scale)
+        n_input = _input_rows(sources)
+        results = {"scale": scale, "input_rows": n_input}
+
+        for name, fn in (("to_sql", load_to_sql), ("bulk", load_bulk)):
+            db = work / f"{name}.db"
+            t0 = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                stored = fn(db, sources)
+            sec = time.perf_counter() - t0
+            results[name] = {
+                "sec": round(sec, 3),
+                "rows_per_sec": round(n_input / sec) if sec > 0 else None,
+                "stored_rows": stored,
+                "db_mb": round(sum(p.stat().st_size for p in work.glob(f"{name}.db*")) / 2**20, 1),
+            }
+        results["speedup"] = round(results["to_sql"]["sec"] / results["bulk"]["sec"], 2)
+        return results
+    finally:
+        shutil.rmtree(work, ignore_errors=True)
+
+
+# =========================
+# 실행
+# =========================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--scale", type=int, default=20, help="주차 CSV 복제 배수")
+    args = parser.parse_args()
+
+    r = run(args.scale)
+    print(f"[BENCH] input rows: {r['input_rows']} (scale x{r['scale']})")
+    for name in ("to_sql", "bulk"):
+        x = r[name]
+        print(
+            f"[BENCH] {name:6s}: {x['sec']:.2f}s  {x['rows_per_sec']} rows/s  "
+            f"stored={x['stored_rows']}  db={x['db_mb']}MB"
+        )
+    print(f"[BENCH] speedup: x{r['speedup']} (bulk 는 natural key 중복 제거 + 인덱스 생성 포함)")
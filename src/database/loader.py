@@ -0,0 +1,347 @@
+# src/database/loader.py
+# output/ 의 CSV 를 laneige.db 에 증분 적재하는 스크립트
+# 적재한 파일 목록(_load_manifest: 경로/크기/mtime/sha256)을 DB 에 남기고,
+# 새로 생기거나 내용이 바뀐 파일만 그 파일의 행을 통째로 교체함 (실행 1번 = 트랜잭션 1개)
+# 행이 바뀐 상품은 요약 테이블도 같이 갱신 (src/database/summary.py)
+#
+#   python -m src.database.loader            # cosme + amazon
+#   python -m src.database.loader cosme      # cosme 만
+#   python -m src.database.loader --full     # manifest 무시하고 전부 다시
+
+import csv
+import hashlib
+import sqlite3
+import sys
+from contextlib import contextmanager
+from dataclasses import dataclass
+from datetime import datetime
+from itertools import islice
+from pathlib import Path
+
+
+# =========================
+# 경로 설정
+# =========================
+BASE_DIR = Path(__file__).resolve().parents[2]  # AMORE
+OUTPUT_DIR = BASE_DIR / "output"
+DB_PATH = BASE_DIR / "laneige.db"
+
+MANIFEST_TABLE = "_load_manifest"
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.database.schema import TABLES, create_indexes, drop_indexes, csv_insert, insert_rows, migrate  # noqa: E402
+from src.database.summary import SOURCES as SUMMARY_SOURCES, refresh_product_summary  # noqa: E402
+
+
+# =========================
+# 적재 대상
+# - required: 이 컬럼이 다 있는 CSV 만 적재 (week2toweek3_cosme_rank.csv 같은 파생 파일은 건너뜀)
+# - exclude: 수집 중간 산출물
+# =========================
+@dataclass(frozen=True)
+class Source:
+    table: str
+    directory: Path
+    pattern: str
+    required: tuple
+    exclude: tuple = ()
+
+
+SOURCES = {
+    "cosme": Source(
+        table="cosme",
+        directory=OUTPUT_DIR / "cosme",
+        pattern="*.csv",
+        required=("date", "collected_at", "ranking_type", "ranking_url", "product_id", "product_name", "brand_name"),
+        exclude=("*.partial.csv",),
+    ),
+    "amazon": Source(
+        table="amazon",
+        directory=OUTPUT_DIR / "amazon",
+        pattern="*.csv",
+        required=("crawldate", "productcode", "productname", "rank"),
+    ),
+}
+
+
+# =========================
+# manifest
+# =========================
+def ensure_manifest(conn: sqlite3.Connection):
+    conn.execute(
+        f"""
+        CREATE TABLE IF NOT EXISTS {MANIFEST_TABLE} (
+            path       TEXT PRIMARY KEY,   -- BASE_DIR 기준 상대 경로
+            table_name TEXT NOT NULL,
+            size       INTEGER NOT NULL,
+            mtime_ns   INTEGER NOT NULL,
+            sha256     TEXT NOT NULL,
+            rows       INTEGER NOT NULL,
+            loaded_at  TEXT NOT NULL
+        )
+        """
+    )
+
+
+def forget_table(conn: sqlite3.Connection, table: str):
+    """테이블을 다른 경로(Parquet 등)로 다시 만들었을 때 manifest 비우기 (commit 은 호출한 쪽에서)"""
+    ensure_manifest(conn)
+    conn.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE table_name = ?", (table,))
+
+
+def file_sha256(path: Path) -> str:
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+
+def _rel(path: Path) -> str:
+    try:
+        return path.resolve().relative_to(BASE_DIR).as_posix()
+    except ValueError:
+        return path.resolve().as_posix()
+
+
+def _matches(path: Path, patterns: tuple) -> bool:
+    return any(path.match(p) for p in patterns)
+
+
+def _prepare_table(conn: sqlite3.Connection, table: str, full: bool):
+    """
+    manifest 없이 행만 있는 테이블(예전 DROP 후 전체 적재 / Parquet 적재)이면 한 번 비우고 다시 적재
+    (행이 어느 파일에서 왔는지 몰라서 파일 단위 교체를 할 수 없음)
+    """
+    has_manifest = conn.execute(
+        f"SELECT 1 FROM {MANIFEST_TABLE} WHERE table_name = ? LIMIT 1", (table,)
+    ).fetchone() is not None
+    has_rows = conn.execute(f'SELECT 1 FROM "{table}" LIMIT 1').fetchone() is not None
+    if has_rows and (full or not has_manifest):
+        print(f"[LOADER] {table}: {'--full' if full else 'manifest 없는 기존 행'} → 비우고 다시 적재")
+        with conn:
+            conn.execute(f'DELETE FROM "{table}"')
+            conn.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE table_name = ?", (table,))
+
+
+# =========================
+# 적재
+# - CSV 는 csv.reader 로 BATCH_ROWS 행씩 읽어서 executemany
+#   (타입은 테이블 컬럼 affinity 로 변환 → pandas 타입 추론 / DataFrame 변환 없음, 파일 전체를 메모리에 올리지 않음)
+# - 한 번 실행(load_source)에서 바뀐 파일 전부를 트랜잭션 1개로
+# - 빈 테이블 / --full 이면 보조 인덱스를 지우고 적재 후 다시 만듦 (행마다 인덱스 갱신 X)
+# =========================
+BATCH_ROWS = 50_000
+
+# 적재 중에만 쓰는 PRAGMA (journal_mode=WAL 은 DB 파일에 유지됨)
+LOAD_PRAGMAS = {
+    "journal_mode": "WAL",
+    "synchronous": "NORMAL",
+    "cache_size": -64 * 1024,   # KiB 단위 (64MB)
+    "temp_store": "MEMORY",
+}
+
+
+@contextmanager
+def bulk_pragmas(conn: sqlite3.Connection):
+    """적재용 PRAGMA 설정, 끝나면 synchronous / cache_size / temp_store 원래대로"""
+    keep = ("synchronous", "cache_size", "temp_store")
+    prev = {k: conn.execute(f"PRAGMA {k}").fetchone()[0] for k in keep}
+    for k, v in LOAD_PRAGMAS.items():
+        conn.execute(f"PRAGMA {k} = {v}")
+    try:
+        yield
+    finally:
+        for k, v in prev.items():
+            conn.execute(f"PRAGMA {k} = {v}")
+
+
+def read_header(path: Path) -> list:
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def iter_batches(path: Path, table: str, constants: dict, batch_rows: int = BATCH_ROWS):
+    """CSV → (INSERT 문, 파라미터 tuple batch_rows 개) 반복 (pandas 거치지 않음)"""
+    with open(path, encoding="utf-8-sig", newline="") as f:
+        reader = csv.reader(f)
+        sql, to_params = csv_insert(TABLES[table], next(reader, []), constants)
+        while True:
+            batch = [to_params(r) for r in islice(reader, batch_rows) if r]
+            if not batch:
+                return
+            yield sql, batch
+
+
+def _file_products(conn: sqlite3.Connection, table: str, rel: str) -> set:
+    """파일 1개에서 온 상품 id (product_summary 갱신 대상)"""
+    col = SUMMARY_SOURCES[table].product_id
+    return {
+        str(r[0]) for r in conn.execute(f'SELECT DISTINCT "{col}" FROM "{table}" WHERE source_file = ?', (rel,))
+    }
+
+
+def _delete_file_rows(conn: sqlite3.Connection, table: str, rel: str, products: set):
+    products |= _file_products(conn, table, rel)
+    conn.execute(f'DELETE FROM "{table}" WHERE source_file = ?', (rel,))
+
+
+def _replace_file_rows(conn: sqlite3.Connection, src: Source, path: Path, rel: str, header: list, stat, sha: str,
+                       products: set) -> tuple:
+    """파일 1개의 행 교체 + manifest 갱신 (commit 은 load_source 에서) → (읽은 행, 남은 행)
+    교체 전후의 상품 id 를 products 에 추가"""
+    extra = [c for c in header if c not in TABLES[src.table].column_names]
+    if extra:
+        print(f"[SCHEMA] {src.table}: 스키마에 없는 컬럼 무시 ({', '.join(extra)})")
+
+    _delete_file_rows(conn, src.table, rel, products)
+    read = 0
+    for sql, batch in iter_batches(path, src.table, {"source_file": rel}):
+        insert_rows(conn, sql, batch)
+        read += len(batch)
+    # natural key 중복은 1행으로 합쳐지므로 실제 행 수를 다시 셈
+    rows = conn.execute(f'SELECT COUNT(*) FROM "{src.table}" WHERE source_file = ?', (rel,)).fetchone()[0]
+    _record(conn, rel, src.table, stat, sha, rows)
+    products |= _file_products(conn, src.table, rel)
+    return read, rows
+
+
+def _record(conn: sqlite3.Connection, rel: str, table: str, stat, sha: str, rows: int):
+    conn.execute(
+        f"INSERT OR REPLACE INTO {MANIFEST_TABLE} VALUES (?, ?, ?, ?, ?, ?, ?)",
+        (rel, table, stat.st_size, stat.st_mtime_ns, sha, rows, datetime.now().isoformat(timespec="seconds")),
+    )
+
+
+def load_source(conn: sqlite3.Connection, src: Source, full: bool = False) -> dict:
+    """
+    src.directory 의 CSV 를 증분 적재
+    - 크기/mtime 이 manifest 와 같으면 읽지 않음
+    - 다르면 sha256 비교 → 내용이 같으면 mtime 만 갱신
+    - 테이블 스키마가 아닌 파일은 rows=-1 로 기록 (파일이 바뀌기 전까지 다시 읽지 않음)
+    - 디스크에서 사라진 파일은 그 파일의 행과 manifest 항목 삭제
+    - 행이 바뀐 상품은 product_summary / product_rank_history 도 같은 트랜잭션에서 다시 계산
+      (적재 전 테이블이 비어 있었으면 전체) → 요약 갱신이 실패하면 적재도 롤백되어 다음 실행 때 다시 시도
+    반환: {"loaded", "unchanged", "skipped", "removed", "rows"}
+    """
+    migrate(conn)
+    ensure_manifest(conn)
+    _prepare_table(conn, src.table, full)
+
+    stats = {"loaded": 0, "unchanged": 0, "skipped": 0, "removed": 0, "rows": 0}
+    products = set()
+    manifest = {
+        path: (size, mtime_ns, sha)
+        for path, size, mtime_ns, sha in conn.execute(
+            f"SELECT path, size, mtime_ns, sha256 FROM {MANIFEST_TABLE} WHERE table_name = ?", (src.table,)
+        )
+    }
+
+    # 1) 바뀐 파일 찾기 (헤더만 읽음)
+    seen, touched, changed = set(), [], []
+    for path in sorted(src.directory.glob(src.pattern)):
+        if _matches(path, src.exclude):
+            continue
+        rel = _rel(path)
+        seen.add(rel)
+        stat = path.stat()
+
+        prev = manifest.get(rel)
+        if prev and prev[0] == stat.st_size and prev[1] == stat.st_mtime_ns:
+            stats["unchanged"] += 1
+            continue
+
+        sha = file_sha256(path)
+        if prev and prev[2] == sha:
+            touched.append((stat, rel))
+            stats["unchanged"] += 1
+            continue
+
+        header = read_header(path)
+        missing = [c for c in src.required if c not in header]
+        if missing:
+            print(f"[SKIP] {path.name}: {src.table} 스키마 아님 (없는 컬럼: {', '.join(missing)})")
+            changed.append((path, rel, None, stat, sha))
+            stats["skipped"] += 1
+            continue
+        changed.append((path, rel, header, stat, sha))
+
+    gone = [rel for rel in manifest if rel not in seen]
+
+    # 2) 적재 (트랜잭션 1개)
+    spec = TABLES[src.table]
+    empty = conn.execute(f'SELECT 1 FROM "{src.table}" LIMIT 1').fetchone() is None
+    defer = bool(changed) and empty
+    with conn:
+        for stat, rel in touched:
+            conn.execute(
+                f"UPDATE {MANIFEST_TABLE} SET size = ?, mtime_ns = ? WHERE path = ?",
+                (stat.st_size, stat.st_mtime_ns, rel),
+            )
+        if defer:
+            drop_indexes(conn, spec)
+
+        for path, rel, header, stat, sha in changed:
+            if header is None:
+                _delete_file_rows(conn, src.table, rel, products)
+                _record(conn, rel, src.table, stat, sha, -1)
+                continue
+            read, rows = _replace_file_rows(conn, src, path, rel, header, stat, sha, products)
+            print(f"[LOAD] {path.name} ({read} rows → {rows})")
+            stats["loaded"] += 1
+            stats["rows"] += rows
+
+        for rel in gone:
+            print(f"[REMOVE] {rel}")
+            _delete_file_rows(conn, src.table, rel, products)
+            conn.execute(f"DELETE FROM {MANIFEST_TABLE} WHERE path = ?", (rel,))
+        stats["removed"] = len(gone)
+
+        if defer:
+            create_indexes(conn, spec)
+
+        # 빈 테이블에 적재했으면 요약도 전체 (비운 뒤 적재가 실패했던 경우 남아 있는 예전 요약까지 정리)
+        refresh_product_summary(conn, src.table, None if empty else products)
+
+    print(
+        f"[DONE] {src.table}: loaded={stats['loaded']} unchanged={stats['unchanged']} "
+        f"skipped={stats['skipped']} removed={stats['removed']} rows={stats['rows']}"
+    )
+    return stats
+
+
+def load_all(names=("cosme", "amazon"), db_path: Path = DB_PATH, full: bool = False, xref: bool = True) -> dict:
+    """여러 소스 적재 후, 바뀐 게 있으면 product_xref 증분 갱신"""
+    print(f"[INFO] DB 경로: {db_path}")
+    conn = sqlite3.connect(db_path)
+    try:
+        with bulk_pragmas(conn):
+            results = {name: load_source(conn, SOURCES[name], full=full) for name in names}
+        changed = any(r["loaded"] or r["removed"] for r in results.values())
+        if xref and changed:
+            from src.database.product_xref import update_product_xref
+            update_product_xref(conn)
+        return results
+    finally:
+        conn.close()
+
+
+# =========================
+# 실행
+# =========================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("sources", nargs="*", help="cosme / amazon (기본: 둘 다)")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    parser.add_argument("--full", action="store_true", help="manifest 무시하고 테이블 다시 만들기")
+    parser.add_argument("--no-xref", action="store_true", help="product_xref 갱신 안 함")
+    args = parser.parse_args()
+
+    unknown = [s for s in args.sources if s not in SOURCES]
+    if unknown:
+        parser.error(f"알 수 없는 소스: {', '.join(unknown)} (가능: {', '.join(SOURCES)})")
+    load_all(args.sources or list(SOURCES), db_path=args.db, full=args.full, xref=not args.no_xref)
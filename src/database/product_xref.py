@@ -0,0 +1,367 @@
+# src/database/product_xref.py
+# cosme product_id ↔ Amazon productcode 연결 테이블(product_xref)을 만드는 스크립트
+# cosme / amazon 테이블을 읽어서 같은 상품으로 보이는 쌍을 product_xref 에 저장함
+# (바뀐 상품만 다시 계산하므로 주차 데이터를 적재할 때마다 실행해도 됨)
+
+import csv
+import hashlib
+import re
+import sqlite3
+import sys
+import unicodedata
+from collections import Counter, defaultdict
+from dataclasses import dataclass, field
+from datetime import datetime
+from pathlib import Path
+
+
+# =========================
+# 경로 설정
+# =========================
+BASE_DIR = Path(__file__).resolve().parents[2]  # AMORE
+DB_PATH = BASE_DIR / "laneige.db"
+COSME_INFO_PATH = BASE_DIR / "src" / "review_collector" / "cosme_info.csv"
+
+if str(BASE_DIR) not in sys.path:
+    sys.path.insert(0, str(BASE_DIR))
+
+from src.cosme_collector.normalize import product_key  # noqa: E402
+
+
+# =========================
+# 매칭 설정
+# - blocking: 같은 브랜드 안에서, 이름 n-gram 을 1개 이상 공유하는 후보만 점수 계산
+# - 점수: n-gram Dice 계수 (2|A∩B| / (|A|+|B|)), MIN_SCORE 이상 중 최고점 1개
+# - cosme 상품명은 일본어라 영어 이름과 글자가 겹치지 않음
+#   → cosme_info.csv 의 eng_name 을 해당 product_id 의 별칭으로 추가
+# =========================
+MIN_SCORE = 0.75
+
+# cosme_info.csv 는 라네즈 상품 목록 → 랭킹에 없던 상품도 이 브랜드로 추가
+COSME_INFO_BRAND = "laneige"
+
+# 브랜드 표기 별칭 (영문 / 일본어 / 한국어). 첫 번째가 대표 키
+BRAND_ALIASES = {
+    "laneige": ["LANEIGE", "ラネージュ", "라네즈"],
+    "sulwhasoo": ["Sulwhasoo", "雪花秀", "ソルファス", "설화수"],
+    "innisfree": ["innisfree", "イニスフリー", "이니스프리"],
+    "etude": ["ETUDE", "ETUDE HOUSE", "エチュード", "エチュードハウス", "에뛰드"],
+    "hera": ["HERA", "ヘラ", "헤라"],
+    "mamonde": ["Mamonde", "マモンド", "마몽드"],
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS product_xref (
+    cosme_product_id   TEXT NOT NULL,
+    amazon_productcode TEXT NOT NULL,
+    brand_key          TEXT NOT NULL,
+    score              REAL NOT NULL,
+    method             TEXT NOT NULL,   -- eng_alias (cosme_info.csv) / ngram (상품명)
+    matched_name       TEXT,
+    updated_at         TEXT NOT NULL,
+    PRIMARY KEY (amazon_productcode, cosme_product_id)
+);
+CREATE INDEX IF NOT EXISTS idx_product_xref_cosme ON product_xref (cosme_product_id);
+
+-- 마지막 계산 때 상품별 서명 (이름/브랜드/별칭이 바뀐 상품만 다시 계산)
+CREATE TABLE IF NOT EXISTS product_xref_state (
+    source    TEXT NOT NULL,
+    entity_id TEXT NOT NULL,
+    sig       TEXT NOT NULL,
+    PRIMARY KEY (source, entity_id)
+);
+"""
+
+_HEAD_SPLIT_RE = re.compile(r"\s*(?::|\s[-–—|]\s|,)\s*")
+_BRAND_PARTS_RE = re.compile(r"[()（）/／]")
+
+
+# =========================
+# n-gram
+# =========================
+def _is_cjk(key: str) -> bool:
+    return any(ord(ch) >= 0x3000 for ch in key)
+
+
+def ngrams(key: str) -> frozenset:
+    """매칭 키 → 문자 n-gram (한중일 글자는 2-gram, 나머지 3-gram)"""
+    n = 2 if _is_cjk(key) else 3
+    if len(key) <= n:
+        return frozenset([key]) if key else frozenset()
+    return frozenset(key[i:i + n] for i in range(len(key) - n + 1))
+
+
+@dataclass
+class Entity:
+    entity_id: str
+    name: str
+    brand_key: str
+    aliases: list = field(default_factory=list)   # [(method, 원래 이름, n-gram)]
+
+    def sig(self) -> str:
+        raw = "|".join([self.brand_key, self.name] + [a for _, a, _ in self.aliases])
+        return hashlib.sha1(raw.encode("utf-8")).hexdigest()
+
+
+class NgramIndex:
+    """브랜드별 n-gram → (entity 번호, 별칭 번호) 역색인"""
+
+    def __init__(self, entities: list):
+        self.entities = entities
+        self.postings = defaultdict(lambda: defaultdict(list))   # brand → gram → [(ei, ai)]
+        for ei, e in enumerate(entities):
+            for ai, (_, _, grams) in enumerate(e.aliases):
+                for g in grams:
+                    self.postings[e.brand_key][g].append((ei, ai))
+
+    def candidates(self, brand_key: str, grams: frozenset) -> Counter:
+        """같은 브랜드 안에서 gram 을 공유하는 (ei, ai) → 공유 gram 수"""
+        block = self.postings.get(brand_key)
+        shared = Counter()
+        if not block:
+            return shared
+        for g in grams:
+            for hit in block.get(g, ()):
+                shared[hit] += 1
+        return shared
+
+
+# =========================
+# 브랜드
+# =========================
+def _id(v) -> str:
+    if isinstance(v, float) and v.is_integer():
+        return str(int(v))
+    return str(v).strip()
+
+
+def brand_parts(brand_name) -> list:
+    """"LANEIGE(ラネージュ)" → ["LANEIGE", "ラネージュ"]"""
+    if not brand_name:
+        return []
+    return [p.strip() for p in _BRAND_PARTS_RE.split(str(brand_name)) if p.strip()]
+
+
+class BrandResolver:
+    """브랜드 표기 → 대표 키, Amazon 상품명 앞머리에서 브랜드 찾기"""
+
+    def __init__(self, cosme_brands):
+        self.canonical = {}
+        for key, names in BRAND_ALIASES.items():
+            for n in names:
+                self.canonical[product_key(n)] = key
+        for b in cosme_brands:
+            parts = brand_parts(b)
+            if not parts:
+                continue
+            keys = [product_key(p) for p in parts]
+            canon = next((self.canonical[k] for k in keys if k in self.canonical), keys[0])
+            for k in keys:
+                self.canonical.setdefault(k, canon)
+
+        # 긴 이름부터 (ETUDE HOUSE 가 ETUDE 보다 먼저)
+        raw = sorted(
+            {self._fold(n) for names in BRAND_ALIASES.values() for n in names}
+            | {self._fold(p) for b in cosme_brands for p in brand_parts(b)},
+            key=len, reverse=True,
+        )
+        raw = [r for r in raw if len(r) >= 2]
+        self._prefix_re = re.compile(
+            r"^(" + "|".join(re.escape(r) for r in raw) + r")(?![a-z0-9])"
+        ) if raw else None
+
+    @staticmethod
+    def _fold(s: str) -> str:
+        return unicodedata.normalize("NFKC", str(s)).casefold().strip()
+
+    def resolve(self, brand_name) -> str:
+        parts = brand_parts(brand_name)
+        for p in parts:
+            k = product_key(p)
+            if k in self.canonical:
+                return self.canonical[k]
+        return product_key(parts[0]) if parts else ""
+
+    def detect(self, title: str) -> tuple:
+        """Amazon 상품명 → (브랜드 키, 브랜드를 뗀 나머지)"""
+        if not self._prefix_re:
+            return "", title
+        folded = self._fold(title)
+        m = self._prefix_re.match(folded)
+        if not m:
+            return "", title
+        return self.canonical.get(product_key(m.group(1)), product_key(m.group(1))), folded[m.end():]
+
+
+def amazon_head(rest: str) -> str:
+    """브랜드 뗀 Amazon 상품명에서 설명 앞부분만 ("Lip Sleeping Mask: Nourish, ..." → "Lip Sleeping Mask")"""
+    return _HEAD_SPLIT_RE.split(rest.strip(" -–—:"), maxsplit=1)[0].strip()
+
+
+# =========================
+# 상품 로드
+# =========================
+def load_eng_aliases(path: Path = COSME_INFO_PATH) -> dict:
+    """cosme_info.csv → {product_id: [eng_name, ...]}"""
+    out = defaultdict(list)
+    if not Path(path).exists():
+        return out
+    with open(path, encoding="utf-8-sig") as f:
+        for row in csv.DictReader(f):
+            row = {k.strip(): (v or "").strip() for k, v in row.items()}
+            if row.get("product_id") and row.get("eng_name"):
+                out[row["product_id"]].append(row["eng_name"])
+    return out
+
+
+def _table_exists(conn, name: str) -> bool:
+    return conn.execute("SELECT 1 FROM sqlite_master WHERE type='table' AND name=?", (name,)).fetchone() is not None
+
+
+def load_entities(conn, eng_aliases: dict) -> tuple:
+    """cosme / amazon 테이블 → (cosme Entity 목록, amazon Entity 목록). 상품별 최신 이름 사용"""
+    cosme_rows = conn.execute(
+        "SELECT product_id, product_name, brand_name, MAX(date) FROM cosme "
+        "WHERE product_id IS NOT NULL GROUP BY product_id"
+    ).fetchall()
+    amazon_rows = conn.execute(
+        "SELECT productcode, productname, brandname, MAX(crawldate) FROM amazon "
+        "WHERE productcode IS NOT NULL GROUP BY productcode"
+    ).fetchall()
+
+    brands = BrandResolver({r[2] for r in cosme_rows if r[2]})
+
+    cosme = []
+    for pid, name, brand, _ in cosme_rows:
+        pid = _id(pid)
+        e = Entity(pid, name or "", brands.resolve(brand))
+        for method, alias in [("ngram", name or "")] + [("eng_alias", a) for a in eng_aliases.get(pid, [])]:
+            grams = ngrams(product_key(alias))
+            if grams:
+                e.aliases.append((method, alias, grams))
+        cosme.append(e)
+
+    # 랭킹(cosme 테이블)에 아직 안 나온 cosme_info 상품
+    seen = {e.entity_id for e in cosme}
+    for pid, names in eng_aliases.items():
+        if pid in seen:
+            continue
+        e = Entity(pid, names[0], COSME_INFO_BRAND)
+        for alias in names:
+            grams = ngrams(product_key(alias))
+            if grams:
+                e.aliases.append(("eng_alias", alias, grams))
+        cosme.append(e)
+
+    amazon = []
+    for code, name, brand, _ in amazon_rows:
+        if brand:
+            brand_key, rest = brands.resolve(brand), brands.detect(name or "")[1]
+        else:
+            brand_key, rest = brands.detect(name or "")
+        head = amazon_head(rest)
+        e = Entity(_id(code), name or "", brand_key)
+        if head:
+            e.aliases.append(("head", head, ngrams(product_key(head))))
+        amazon.append(e)
+    return cosme, amazon
+
+
+# =========================
+# 매칭
+# =========================
+def best_match(index: NgramIndex, a: Entity):
+    """Amazon 상품 1개 → (cosme Entity, 점수, method, 맞은 별칭) / 없으면 None"""
+    if not a.brand_key or not a.aliases:
+        return None
+    grams = a.aliases[0][2]
+    best = None
+    for (ei, ai), shared in index.candidates(a.brand_key, grams).items():
+        c = index.entities[ei]
+        method, alias, cgrams = c.aliases[ai]
+        score = 2 * shared / (len(grams) + len(cgrams))
+        if score >= MIN_SCORE and (best is None or score > best[1]):
+            best = (c, score, method, alias)
+    return best
+
+
+def update_product_xref(conn: sqlite3.Connection, full: bool = False) -> dict:
+    """
+    product_xref 갱신 (기본: 증분)
+    - 다시 계산하는 Amazon 상품
+      = 새로 생기거나 이름/브랜드가 바뀐 Amazon 상품
+      + 새로 생기거나 바뀐 cosme 상품과 같은 브랜드의 Amazon 상품
+    - full=True 면 전체 다시 계산
+    """
+    stats = {"cosme": 0, "amazon": 0, "rechecked": 0, "candidates": 0, "linked": 0}
+    if not (_table_exists(conn, "cosme") and _table_exists(conn, "amazon")):
+        print("[XREF] cosme / amazon 테이블이 모두 있어야 합니다 → 건너뜀")
+        return stats
+
+    conn.executescript(SCHEMA)
+    cosme, amazon = load_entities(conn, load_eng_aliases())
+    stats["cosme"], stats["amazon"] = len(cosme), len(amazon)
+
+    prev = {} if full else {
+        (src, eid): sig for src, eid, sig in conn.execute("SELECT source, entity_id, sig FROM product_xref_state")
+    }
+    dirty_brands = {c.brand_key for c in cosme if prev.get(("cosme", c.entity_id)) != c.sig()}
+    recheck = [
+        a for a in amazon
+        if full or a.brand_key in dirty_brands or prev.get(("amazon", a.entity_id)) != a.sig()
+    ]
+    stats["rechecked"] = len(recheck)
+
+    index = NgramIndex(cosme)
+    now = datetime.now().isoformat(timespec="seconds")
+    links = []
+    for a in recheck:
+        if a.brand_key and a.aliases:
+            stats["candidates"] += len(index.candidates(a.brand_key, a.aliases[0][2]))
+        m = best_match(index, a)
+        if m:
+            c, score, method, alias = m
+            links.append((c.entity_id, a.entity_id, a.brand_key, round(score, 4), method, alias, now))
+    stats["linked"] = len(links)
+
+    with conn:
+        if full:
+            conn.execute("DELETE FROM product_xref")
+        else:
+            conn.executemany(
+                "DELETE FROM product_xref WHERE amazon_productcode = ?", [(a.entity_id,) for a in recheck]
+            )
+        conn.executemany("INSERT OR REPLACE INTO product_xref VALUES (?, ?, ?, ?, ?, ?, ?)", links)
+        conn.executemany(
+            "INSERT OR REPLACE INTO product_xref_state VALUES (?, ?, ?)",
+            [("cosme", c.entity_id, c.sig()) for c in cosme] + [("amazon", a.entity_id, a.sig()) for a in amazon],
+        )
+
+    print(
+        f"[XREF] cosme={stats['cosme']} amazon={stats['amazon']} rechecked={stats['rechecked']} "
+        f"candidates={stats['candidates']} linked={stats['linked']}"
+    )
+    return stats
+
+
+# =========================
+# 실행
+# =========================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", default=str(DB_PATH))
+    parser.add_argument("--full", action="store_true", help="저장된 상태를 무시하고 전체 다시 계산")
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        update_product_xref(conn, full=args.full)
+        for row in conn.execute(
+            "SELECT cosme_product_id, amazon_productcode, score, method, matched_name FROM product_xref "
+            "ORDER BY brand_key, cosme_product_id"
+        ):
+            print("  ", row)
+    finally:
+        conn.close()
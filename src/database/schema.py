@@ -0,0 +1,359 @@
+# src/database/schema.py
+# laneige.db 테이블 스키마 + 버전별 마이그레이션
+# cosme / amazon 테이블을 pandas.to_sql 자동 생성 대신 타입이 정해진 테이블로 만들고,
+# PRAGMA user_version 으로 DB 파일의 스키마 버전을 관리함 (이미 있는 DB 도 그 자리에서 올림)
+#
+#   python -m src.database.schema              # laneige.db 를 최신 버전으로
+#   python -m src.database.schema --db other.db
+
+import sqlite3
+from dataclasses import dataclass
+from operator import itemgetter
+from pathlib import Path
+
+import pandas as pd
+
+
+# =========================
+# 경로 설정
+# =========================
+BASE_DIR = Path(__file__).resolve().parents[2]  # AMORE
+DB_PATH = BASE_DIR / "laneige.db"
+
+
+# =========================
+# 테이블 정의
+# - id 계열(product_id, productcode, category_id)은 TEXT (API 가 문자열로 조회)
+# - 순위는 INTEGER, 평점/가격은 REAL
+# - natural_key: 같은 키의 행이 다시 들어오면 교체 (INSERT OR REPLACE)
+# =========================
+@dataclass(frozen=True)
+class TableSpec:
+    name: str
+    columns: tuple          # ((컬럼, 타입), ...)
+    natural_key: tuple      # UNIQUE 인덱스 (SQL 식 가능)
+    indexes: dict           # 보조 인덱스 이름 → 컬럼 (SQL 식)
+
+    @property
+    def column_names(self) -> list:
+        return [c for c, _ in self.columns]
+
+
+COSME = TableSpec(
+    name="cosme",
+    columns=(
+        ("date", "TEXT NOT NULL"),
+        ("collected_at", "TEXT"),
+        ("source", "TEXT"),
+        ("market", "TEXT"),
+        ("category_id", "TEXT"),
+        ("category_name", "TEXT"),
+        ("ranking_type", "TEXT NOT NULL"),
+        ("ranking_url", "TEXT NOT NULL"),
+        ("global_rank", "INTEGER"),
+        ("page_rank", "INTEGER"),
+        ("group_type", "TEXT"),
+        ("group_value", "TEXT"),
+        ("group_rank", "INTEGER"),
+        ("product_id", "TEXT NOT NULL"),
+        ("product_name", "TEXT"),
+        ("brand_name", "TEXT"),
+        ("product_url", "TEXT"),
+        ("image_url", "TEXT"),
+        ("image_path", "TEXT"),
+        ("rating_score", "REAL"),
+        ("review_count", "INTEGER"),
+        ("price_text", "TEXT"),
+        ("rank_change_text", "TEXT"),
+        ("brand_url", "TEXT"),
+        ("source_file", "TEXT"),
+    ),
+    # 키워드 랭킹(grouped)은 같은 url 안에서 그룹별로 같은 상품이 나올 수 있음 → group_value 포함
+    natural_key=("date", "ranking_type", "ranking_url", "COALESCE(group_value, '')", "product_id"),
+    indexes={
+        # /api/summary: WHERE product_id = ? ORDER BY date → 테이블 안 읽고 인덱스만으로
+        "idx_cosme_product_date": (
+            "product_id", "date", "global_rank", "group_rank", "rating_score", "review_count",
+            "product_name", "brand_name",
+        ),
+        "idx_cosme_source_file": ("source_file",),
+    },
+)
+
+AMAZON = TableSpec(
+    name="amazon",
+    columns=(
+        ("crawldate", "TEXT NOT NULL"),
+        ("platform", "TEXT"),
+        ("category_id", "TEXT"),
+        ("category", "TEXT"),
+        ("priceoriginal", "REAL"),
+        ("discountrate", "REAL"),
+        ("imageurl", "TEXT"),
+        ("producturl", "TEXT"),
+        ("badges", "TEXT"),
+        ("rank", "INTEGER"),
+        ("rank_change_text", "TEXT"),
+        ("productcode", "TEXT NOT NULL"),
+        ("productname", "TEXT"),
+        ("brandname", "TEXT"),
+        ("rating", "REAL"),
+        ("reviewcount", "INTEGER"),
+        ("source", "TEXT"),
+        ("source_file", "TEXT"),
+    ),
+    # 수집 CSV 에 같은 페이지가 두 번 들어간 완전 중복 행이 있음 → 이 키로 1개만
+    natural_key=("crawldate", "COALESCE(category, '')", "productcode"),
+    indexes={
+        "idx_amazon_product_date": ("productcode", "crawldate", "rank", "rating", "reviewcount", "productname"),
+        "idx_amazon_source_file": ("source_file",),
+    },
+)
+
+TABLES = {t.name: t for t in (COSME, AMAZON)}
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def _table_columns(conn: sqlite3.Connection, name: str) -> list:
+    return [r[1] for r in conn.execute(f'PRAGMA table_info("{name}")')]
+
+
+def create_table_sql(spec: TableSpec, name: str | None = None) -> str:
+    cols = ",\n    ".join(f'"{c}" {t}' for c, t in spec.columns)
+    return f'CREATE TABLE IF NOT EXISTS "{name or spec.name}" (\n    {cols}\n)'
+
+
+def natural_key_sql(spec: TableSpec) -> str:
+    return (
+        f'CREATE UNIQUE INDEX IF NOT EXISTS "ux_{spec.name}_natural_key" '
+        f'ON "{spec.name}" ({", ".join(spec.natural_key)})'
+    )
+
+
+def index_sql(spec: TableSpec) -> list:
+    return [
+        f'CREATE INDEX IF NOT EXISTS "{name}" ON "{spec.name}" ({", ".join(cols)})'
+        for name, cols in spec.indexes.items()
+    ]
+
+
+def _cast_expr(col: str, sqltype: str, present: bool) -> str:
+    """예전(to_sql) 테이블 값 → 새 타입. REAL 로 들어간 id(10165317.0)는 정수 문자열로"""
+    if not present:
+        return "NULL"
+    base = sqltype.split()[0]
+    q = f'"{col}"'
+    if base == "TEXT":
+        return (
+            f"CASE WHEN typeof({q}) = 'real' AND {q} = CAST({q} AS INTEGER) "
+            f"THEN CAST(CAST({q} AS INTEGER) AS TEXT) ELSE CAST({q} AS TEXT) END"
+        )
+    if base == "INTEGER":
+        return f"CAST({q} AS INTEGER)"
+    if base == "REAL":
+        return f"CAST({q} AS REAL)"
+    return q
+
+
+# =========================
+# 마이그레이션
+# - 번호 순서대로 한 번씩, 각각 한 트랜잭션 안에서 실행 후 user_version 갱신
+# - 새 변경은 함수 하나 추가 + MIGRATIONS 에 등록
+# =========================
+def _v1_typed_tables(conn: sqlite3.Connection):
+    """
+    cosme / amazon 을 타입 있는 테이블 + natural key 로
+    - 예전 테이블이 있으면 값을 변환해서 옮김 (natural key 가 같은 행은 마지막 것만)
+    """
+    for spec in TABLES.values():
+        if not _table_exists(conn, spec.name):
+            conn.execute(create_table_sql(spec))
+            conn.execute(natural_key_sql(spec))
+            continue
+
+        old_cols = set(_table_columns(conn, spec.name))
+        tmp = f"{spec.name}__v1"
+        conn.execute(f'DROP TABLE IF EXISTS "{tmp}"')
+        conn.execute(create_table_sql(spec, name=tmp))
+        conn.execute(
+            f'CREATE UNIQUE INDEX "ux_{tmp}" ON "{tmp}" ({", ".join(spec.natural_key)})'
+        )
+        select = ", ".join(_cast_expr(c, t, c in old_cols) for c, t in spec.columns)
+        # NOT NULL 키가 비어 있는 행은 옮기지 않음
+        required = [c for c, t in spec.columns if "NOT NULL" in t and c in old_cols]
+        where = " AND ".join(f'"{c}" IS NOT NULL' for c in required) or "1"
+        conn.execute(
+            f'INSERT OR REPLACE INTO "{tmp}" ({", ".join(f"{chr(34)}{c}{chr(34)}" for c in spec.column_names)}) '
+            f'SELECT {select} FROM "{spec.name}" WHERE {where} ORDER BY rowid'
+        )
+        moved = conn.execute(f'SELECT COUNT(*) FROM "{tmp}"').fetchone()[0]
+        before = conn.execute(f'SELECT COUNT(*) FROM "{spec.name}"').fetchone()[0]
+        conn.execute(f'DROP TABLE "{spec.name}"')
+        conn.execute(f'ALTER TABLE "{tmp}" RENAME TO "{spec.name}"')
+        conn.execute(f'DROP INDEX "ux_{tmp}"')
+        conn.execute(natural_key_sql(spec))
+        print(f"[SCHEMA] {spec.name}: {before} → {moved} rows (중복 {before - moved} 제거)")
+
+
+def _v2_covering_indexes(conn: sqlite3.Connection):
+    """상품별 이력 조회용 커버링 인덱스 + 파일 단위 교체용 source_file 인덱스"""
+    for spec in TABLES.values():
+        create_indexes(conn, spec)
+
+
+MIGRATIONS = [
+    (1, _v1_typed_tables),
+    (2, _v2_covering_indexes),
+]
+
+SCHEMA_VERSION = MIGRATIONS[-1][0]
+
+
+def user_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection) -> int:
+    """DB 를 SCHEMA_VERSION 까지 올림. 반환: 최종 버전"""
+    current = user_version(conn)
+    for version, fn in MIGRATIONS:
+        if version <= current:
+            continue
+        print(f"[SCHEMA] v{current} → v{version}: {fn.__doc__.strip().splitlines()[0]}")
+        # DDL 까지 한 트랜잭션으로 (sqlite3 기본 동작은 DDL 앞에서 자동 commit 하지 않음)
+        conn.execute("BEGIN")
+        try:
+            fn(conn)
+            conn.execute(f"PRAGMA user_version = {version}")
+            conn.execute("COMMIT")
+        except Exception:
+            conn.execute("ROLLBACK")
+            raise
+        current = version
+    return current
+
+
+# =========================
+# 적재 헬퍼
+# =========================
+def coerce_frame(spec: TableSpec, df: pd.DataFrame) -> pd.DataFrame:
+    """DataFrame → 테이블 컬럼 순서/타입 (없는 컬럼은 NULL, 테이블에 없는 컬럼은 버림)"""
+    out = pd.DataFrame(index=df.index)
+    for col, sqltype in spec.columns:
+        base = sqltype.split()[0]
+        if col not in df.columns:
+            out[col] = None
+            continue
+        s = df[col]
+        if base == "INTEGER":
+            s = pd.to_numeric(s, errors="coerce").round().astype("Int64")
+        elif base == "REAL":
+            s = pd.to_numeric(s, errors="coerce").astype("float64")
+        else:
+            num = pd.to_numeric(s, errors="coerce") if s.dtype.kind == "f" else None
+            if num is not None and (num.dropna() % 1 == 0).all():
+                s = num.astype("Int64").astype("string")   # 10165317.0 → "10165317"
+            else:
+                s = s.astype("string")
+        out[col] = s.astype(object).where(s.notna(), None)
+    return out
+
+
+def insert_sql(spec: TableSpec) -> str:
+    cols = ", ".join(f'"{c}"' for c in spec.column_names)
+    marks = ", ".join("?" for _ in spec.column_names)
+    return f'INSERT OR REPLACE INTO "{spec.name}" ({cols}) VALUES ({marks})'
+
+
+def insert_frame(conn: sqlite3.Connection, table: str, df: pd.DataFrame, warn: bool = True) -> int:
+    """타입 맞춘 행을 executemany 로 INSERT OR REPLACE (commit 은 호출한 쪽에서)"""
+    spec = TABLES[table]
+    extra = [c for c in df.columns if c not in spec.column_names]
+    if extra and warn:
+        print(f"[SCHEMA] {table}: 스키마에 없는 컬럼 무시 ({', '.join(extra)})")
+    df = coerce_frame(spec, df)
+    conn.executemany(insert_sql(spec), df.itertuples(index=False, name=None))
+    return len(df)
+
+
+def csv_insert(spec: TableSpec, header: list, constants: dict | None = None) -> tuple:
+    """
+    CSV 행(문자열 list)을 변환 없이 넣는 INSERT 문 + 행 → 파라미터 함수
+    - 타입 변환은 SQLite 컬럼 affinity 에 맡김 ('2' → INTEGER 2, '4.6' → REAL 4.6, id 는 TEXT 그대로)
+    - 빈 문자열은 NULLIF 로 NULL
+    - 헤더에 없는 컬럼은 constants 값 (없으면 NULL)
+    반환: (sql, to_params)
+    """
+    pos = {c: i for i, c in enumerate(header)}
+    constants = constants or {}
+    n = len(header)
+    const_values = list(constants.values())
+    const_pos = {c: n + k for k, c in enumerate(constants)}   # 행 뒤에 constants 를 붙여서 같은 itemgetter 로
+
+    exprs, take = [], []
+    for col in spec.column_names:
+        if col in const_pos:
+            exprs.append("?")
+            take.append(const_pos[col])
+        elif col in pos:
+            exprs.append("NULLIF(?, '')")
+            take.append(pos[col])
+        else:
+            exprs.append("NULL")
+
+    cols = ", ".join(f'"{c}"' for c in spec.column_names)
+    sql = f'INSERT OR REPLACE INTO "{spec.name}" ({cols}) VALUES ({", ".join(exprs)})'
+
+    getter = itemgetter(*take) if len(take) > 1 else (lambda r, i=take[0]: (r[i],))
+
+    def to_params(row: list) -> tuple:
+        if len(row) != n:   # 열 개수가 다른 행은 빈 값으로 맞춤
+            row = (row + [""] * n)[:n]
+        return getter(row + const_values)
+
+    return sql, to_params
+
+
+def insert_rows(conn: sqlite3.Connection, sql: str, params) -> None:
+    """csv_insert 의 sql / 파라미터로 executemany (commit 은 호출한 쪽에서)"""
+    conn.executemany(sql, params)
+
+
+def drop_indexes(conn: sqlite3.Connection, spec: TableSpec):
+    """
+    대량 적재 전 보조 인덱스 삭제
+    - natural key: 중복 제거에 필요해서 유지
+    - source_file: 파일 단위 교체(DELETE / COUNT)에 필요해서 유지
+    """
+    for name, cols in spec.indexes.items():
+        if tuple(cols) != ("source_file",):
+            conn.execute(f'DROP INDEX IF EXISTS "{name}"')
+
+
+def create_indexes(conn: sqlite3.Connection, spec: TableSpec):
+    for sql in index_sql(spec):
+        conn.execute(sql)
+
+
+# =========================
+# 실행
+# =========================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        before = user_version(conn)
+        after = migrate(conn)
+        print(f"[DONE] {args.db}: schema v{before} → v{after}")
+    finally:
+        conn.close()
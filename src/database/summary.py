@@ -0,0 +1,243 @@
+# src/database/summary.py
+# 상품별 요약 테이블(product_summary)과 날짜별 순위 이력(product_rank_history)을 만드는 스크립트
+# 요약 API(src/app/api_summary.py)가 상품 1개를 조회할 때 이력 전체를 읽지 않도록
+# 적재(src/database/loader.py) 때 바뀐 상품만 다시 계산해 둠
+#
+#   python -m src.database.summary              # cosme + amazon 전체 다시 계산
+
+import sqlite3
+from dataclasses import dataclass
+from pathlib import Path
+
+
+# =========================
+# 경로 설정
+# =========================
+BASE_DIR = Path(__file__).resolve().parents[2]  # AMORE
+DB_PATH = BASE_DIR / "laneige.db"
+
+
+# =========================
+# 소스별 컬럼
+# - 같은 날 여러 행(카테고리 / 랭킹 종류별, Amazon 은 하루 2번 수집)이 있으면 하루 1점으로 합침
+#   순위는 그날 가장 좋은 순위(MIN), 나머지는 MAX
+# =========================
+@dataclass(frozen=True)
+class SummarySource:
+    table: str
+    product_id: str
+    day: str          # 날짜 (SQL 식)
+    rank: str
+    product_name: str
+    brand_name: str
+    rating: str
+    review_count: str
+
+
+SOURCES = {
+    "cosme": SummarySource(
+        table="cosme",
+        product_id="product_id",
+        day="date",
+        rank="global_rank",
+        product_name="product_name",
+        brand_name="brand_name",
+        rating="rating_score",
+        review_count="review_count",
+    ),
+    "amazon": SummarySource(
+        table="amazon",
+        product_id="productcode",
+        day="substr(crawldate, 1, 10)",   # 2025-12-21-18-58 → 2025-12-21
+        rank="rank",
+        product_name="productname",
+        brand_name="brandname",
+        rating="rating",
+        review_count="reviewcount",
+    ),
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS product_rank_history (
+    source     TEXT NOT NULL,
+    product_id TEXT NOT NULL,
+    day        TEXT NOT NULL,
+    rank       INTEGER,
+    PRIMARY KEY (source, product_id, day)
+) WITHOUT ROWID;
+
+CREATE TABLE IF NOT EXISTS product_summary (
+    source       TEXT NOT NULL,
+    product_id   TEXT NOT NULL,
+    product_name TEXT,
+    brand_name   TEXT,
+    latest_day   TEXT,
+    latest_rank  INTEGER,
+    prev_rank    INTEGER,
+    rank_change  INTEGER,   -- prev_rank - latest_rank (양수 = 상승)
+    rating       REAL,
+    review_count INTEGER,
+    days         INTEGER,   -- 이력 일수
+    PRIMARY KEY (source, product_id)
+) WITHOUT ROWID;
+"""
+
+
+# =========================
+# SQL
+# =========================
+def days_sql(src: SummarySource, where: str) -> str:
+    """원본 테이블 → 상품 x 날짜 1행 (product_id, day, rank, product_name, brand_name, rating, review_count)"""
+    return f"""
+        SELECT CAST({src.product_id} AS TEXT) AS product_id, {src.day} AS day,
+               CAST(MIN({src.rank}) AS INTEGER) AS rank,
+               MAX({src.product_name}) AS product_name, MAX({src.brand_name}) AS brand_name,
+               MAX({src.rating}) AS rating, MAX({src.review_count}) AS review_count
+        FROM "{src.table}"
+        WHERE {where}
+        GROUP BY 1, 2
+    """
+
+
+def summary_sql(days: str) -> str:
+    """상품 x 날짜 행 → 상품 1행 (product_summary 컬럼 순서, source 제외)"""
+    return f"""
+        SELECT product_id, product_name, brand_name, day, rank, prev_rank,
+               prev_rank - rank AS rank_change,
+               rating, review_count, days
+        FROM (
+            SELECT d.*,
+                   LEAD(rank) OVER w AS prev_rank,
+                   ROW_NUMBER() OVER w AS rn,
+                   COUNT(*) OVER (PARTITION BY product_id) AS days
+            FROM ({days}) d
+            WINDOW w AS (PARTITION BY product_id ORDER BY day DESC)
+        )
+        WHERE rn = 1
+    """
+
+
+def _table_exists(conn: sqlite3.Connection, name: str) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+# =========================
+# 갱신
+# =========================
+def ensure_schema(conn: sqlite3.Connection):
+    """요약 테이블 생성 (executescript 와 달리 열린 트랜잭션을 커밋하지 않음)"""
+    for stmt in SCHEMA.split(";"):
+        if stmt.strip():
+            conn.execute(stmt)
+
+
+def refresh_product_summary(conn: sqlite3.Connection, source: str, product_ids=None) -> int:
+    """
+    source 의 상품 요약 / 순위 이력 갱신 (커밋하지 않음 → 호출한 쪽 트랜잭션 안에서 실행)
+    - product_ids 를 주면 그 상품만 다시 계산 (원본에서 사라진 상품은 요약에서도 삭제)
+    - None 이면 source 전체 다시 계산
+    - 요약이 아직 없는 DB 면 product_ids 와 관계없이 전체
+    반환: 다시 계산한 상품 수
+    """
+    src = SOURCES[source]
+    if not _table_exists(conn, src.table):
+        return 0
+    ensure_schema(conn)
+
+    if product_ids is not None and conn.execute(
+        "SELECT 1 FROM product_summary WHERE source = ? LIMIT 1", (source,)
+    ).fetchone() is None:
+        product_ids = None
+    full = product_ids is None
+    if not full and not product_ids:
+        return 0
+
+    if full:
+        where = "1"
+        conn.execute("DELETE FROM product_rank_history WHERE source = ?", (source,))
+        conn.execute("DELETE FROM product_summary WHERE source = ?", (source,))
+    else:
+        conn.execute("CREATE TEMP TABLE IF NOT EXISTS _summary_ids (product_id TEXT PRIMARY KEY)")
+        conn.execute("DELETE FROM _summary_ids")
+        conn.executemany("INSERT OR IGNORE INTO _summary_ids VALUES (?)", [(str(p),) for p in product_ids])
+        where = f"{src.product_id} IN (SELECT product_id FROM _summary_ids)"
+        for t in ("product_rank_history", "product_summary"):
+            conn.execute(
+                f"DELETE FROM {t} WHERE source = ? AND product_id IN (SELECT product_id FROM _summary_ids)",
+                (source,),
+            )
+
+    conn.execute("DROP TABLE IF EXISTS _summary_days")
+    conn.execute(f"CREATE TEMP TABLE _summary_days AS {days_sql(src, where)}")
+    conn.execute(
+        "INSERT INTO product_rank_history SELECT ?, product_id, day, rank FROM _summary_days",
+        (source,),
+    )
+    n = conn.execute(
+        f"INSERT INTO product_summary SELECT ?, * FROM ({summary_sql('SELECT * FROM _summary_days')})",
+        (source,),
+    ).rowcount
+    conn.execute("DROP TABLE _summary_days")
+
+    print(f"[SUMMARY] {source}: {'전체' if full else '변경 상품'} {n}개 갱신")
+    return n
+
+
+def update_product_summary(conn: sqlite3.Connection, source: str, product_ids=None) -> int:
+    """refresh_product_summary 를 트랜잭션 1개로 실행 (단독 실행 / Parquet 경로용)"""
+    with conn:
+        return refresh_product_summary(conn, source, product_ids)
+
+
+# =========================
+# 조회 (api_summary)
+# =========================
+def read_product_summary(conn: sqlite3.Connection, source: str, product_id: str, history: int):
+    """
+    (요약 1행 dict, 최근 history 일 [(day, rank)] 오래된 순) / 상품이 없으면 (None, [])
+    요약 테이블이 없는 DB(로더로 적재하기 전)는 원본 테이블에서 같은 식으로 계산
+    """
+    src = SOURCES[source]
+    cols = ("product_id", "product_name", "brand_name", "latest_day", "latest_rank",
+            "prev_rank", "rank_change", "rating", "review_count", "days")
+    try:
+        row = conn.execute(
+            f"SELECT {', '.join(cols)} FROM product_summary WHERE source = ? AND product_id = ?",
+            (source, product_id),
+        ).fetchone()
+        points = conn.execute(
+            "SELECT day, rank FROM product_rank_history WHERE source = ? AND product_id = ? "
+            "ORDER BY day DESC LIMIT ?",
+            (source, product_id, history),
+        ).fetchall()
+    except sqlite3.OperationalError:
+        days = days_sql(src, f"{src.product_id} = ?")
+        row = conn.execute(summary_sql(days), (product_id,)).fetchone()
+        points = conn.execute(
+            f"SELECT day, rank FROM ({days}) ORDER BY day DESC LIMIT ?", (product_id, history)
+        ).fetchall()
+
+    if row is None:
+        return None, []
+    return dict(zip(cols, tuple(row))), [tuple(p) for p in reversed(points)]
+
+
+# =========================
+# 실행
+# =========================
+if __name__ == "__main__":
+    import argparse
+
+    parser = argparse.ArgumentParser()
+    parser.add_argument("sources", nargs="*", help="cosme / amazon (기본: 둘 다)")
+    parser.add_argument("--db", type=Path, default=DB_PATH)
+    args = parser.parse_args()
+
+    conn = sqlite3.connect(args.db)
+    try:
+        for name in args.sources or list(SOURCES):
+            update_product_summary(conn, name)
+    finally:
+        conn.close()
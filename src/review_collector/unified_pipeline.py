@@ -1,9 +1,18 @@
 import csv
 import os
+import sys
 from datetime import datetime, timedelta
 import cosme_crawler
 from unified_analyzer import analyze_reviews
 
+# 상품 매칭 키는 cosme / Amazon / ranking 과 같은 정규화 사용
+# (이 폴더에서 스크립트로 실행하면 repo 루트가 sys.path 에 없음)
+try:
+    from src.cosme_collector.normalize import product_key
+except ImportError:
+    sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+    from src.cosme_collector.normalize import product_key
+
 
 # =========================
 # @COSME 제품 정보 로드
@@ -20,7 +29,7 @@ def load_cosme_info(csv_path):
         for row in reader:
             clean_row = {k.strip(): v.strip() for k, v in row.items()}
             if "eng_name" in clean_row and "product_id" in clean_row:
-                key = clean_row["eng_name"].lower().replace(" ", "")
+                key = product_key(clean_row["eng_name"])
                 info_map[key] = clean_row["product_id"]
 
     return info_map
@@ -36,6 +45,8 @@ def load_amazon_reviews_by_product(csv_path, target_key, days=None):
         print(f"❌ Amazon CSV 파일 없음: {csv_path}")
         return reviews
 
+    target_key = product_key(target_key)
+
     # 🔥 인코딩 자동 대응
     encodings = ["utf-8-sig", "cp949", "euc-kr"]
 
@@ -46,7 +57,7 @@ def load_amazon_reviews_by_product(csv_path, target_key, days=None):
 
                 for row in reader:
                     try:
-                        product_name = row["product_name"].strip().lower().replace(" ", "")
+                        product_name = product_key(row["product_name"])
                         review_text = row["review_text"].strip()
                         review_date_str = row["review_date"].strip()
                     except Exception:
@@ -101,7 +112,7 @@ def main():
     days = {"1": 7, "2": 30, "3": 90, "4": 180, "5": None}.get(period_choice, None)
 
     target_product_raw = input("\n분석할 제품명(영문)을 입력하세요: ").strip()
-    target_key = target_product_raw.lower().replace(" ", "")
+    target_key = product_key(target_product_raw)
 
     # 항상 이 파일이 있는 폴더 기준
     base_dir = os.path.dirname(os.path.abspath(__file__))
@@ -1,5 +1,6 @@
 import os
 import re
+from functools import lru_cache
 from googleapiclient.discovery import build
 from datetime import datetime, timedelta
 from typing import List, Dict, Any
@@ -25,6 +26,15 @@ def contains_target_language(text: str, region_code: str) -> bool:
         return True
 
 
+# -------------------------
+# API 클라이언트: 호출마다 build 하지 않고 프로세스에서 재사용
+# (디스커버리 문서 로드 + HTTP 연결을 한 번만)
+# -------------------------
+@lru_cache(maxsize=None)
+def _youtube_client(api_key: str):
+    return build("youtube", "v3", developerKey=api_key)
+
+
 # -------------------------
 # 핵심: 유튜브 결과를 "문서 리스트"로 반환
 # -------------------------
@@ -45,7 +55,7 @@ def get_youtube_results(
     if not youtube_api_key:
         raise RuntimeError("YOUTUBE_API_KEY 환경변수가 설정되지 않았습니다.")
 
-    youtube = build("youtube", "v3", developerKey=youtube_api_key)
+    youtube = _youtube_client(youtube_api_key)
 
     # 검색 범위(기간) 설정
     published_after = (
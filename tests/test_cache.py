@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+from src.cosme_collector.cache import HtmlCache, cache_key, load_or_save_html
+
+URL = "https://www.cosme.net/ranking/products/"
+CRLF_HTML = "<html>\r\n<head><title>ランキング</title></head>\r\n<body>ok\r</body>\r\n</html>\r\n"
+
+
+def test_crlf_body_round_trips(tmp_path):
+    cache = HtmlCache(tmp_path)
+    cache.put(URL, CRLF_HTML)
+
+    hit = cache.get(URL)
+
+    assert hit is not None
+    assert hit[0] == CRLF_HTML
+    assert all(p.exists() for p in cache._paths(cache_key(URL)))
+
+
+def test_load_or_save_html_hits_crlf_page(tmp_path):
+    calls = []
+
+    def fetch(url):
+        calls.append(url)
+        return CRLF_HTML
+
+    assert load_or_save_html(tmp_path, {}, URL, fetch) == CRLF_HTML
+    assert load_or_save_html(tmp_path, {}, URL, fetch) == CRLF_HTML
+    assert len(calls) == 1
+
+
+def test_accessed_at_survives_restart(tmp_path):
+    cache = HtmlCache(tmp_path)
+    cache.put(URL, "<html>a</html>")
+    cache.put(URL + "page/2", "<html>b</html>")
+    accessed = cache.get(URL)[1].accessed_at
+
+    reopened = HtmlCache(tmp_path)
+
+    assert reopened._index[cache_key(URL)].accessed_at == accessed
@@ -0,0 +1,75 @@
+from __future__ import annotations
+
+import datetime
+from pathlib import Path
+
+import pytest
+import requests
+
+from src.cosme_collector import http_client
+from src.cosme_collector.config import Settings
+from src.cosme_collector.http_client import fetch_html_response
+from src.cosme_collector.rate_limit import AdaptiveHostLimiter
+
+LOGIN_HTML = "<html><head><title>ログイン／メンバー登録 | @cosme</title></head><body></body></html>"
+RANKING_HTML = "<html><head><title>ランキング | @cosme</title></head><body>ok</body></html>"
+
+
+class FakeSession:
+    """session.get 호출 수를 세고 항상 같은 200 응답을 돌려줌"""
+
+    def __init__(self, html: str):
+        self.html = html
+        self.calls = 0
+
+    def get(self, url, **kwargs):
+        self.calls += 1
+        r = requests.Response()
+        r.status_code = 200
+        r.url = url
+        r._content = self.html.encode("utf-8")
+        r.encoding = "utf-8"
+        r.elapsed = datetime.timedelta(seconds=0.01)
+        return r
+
+
+@pytest.fixture(autouse=True)
+def no_sleep(monkeypatch):
+    monkeypatch.setattr(http_client.time, "sleep", lambda s: None)
+
+
+def _settings() -> Settings:
+    return Settings(base_dir=Path("."), output_dir=Path("."), today="2025-01-01", retry=1)
+
+
+def _limiter() -> AdaptiveHostLimiter:
+    return AdaptiveHostLimiter(rate=1000, burst=1000, breaker_failures=5, breaker_cooldown=3600)
+
+
+def test_blocked_200_pages_trip_breaker():
+    session, limiter = FakeSession(LOGIN_HTML), _limiter()
+    url = "https://www.cosme.net/categories/item/800/ranking/"
+
+    for _ in range(20):
+        with pytest.raises(RuntimeError):
+            fetch_html_response(session, _settings(), url, limiter=limiter)
+
+    m = limiter.metrics()["www.cosme.net"]
+    assert m["ok"] == 0
+    assert m["trips"] >= 1
+    assert m["state"] == "open"
+    # 서킷이 열린 뒤로는 요청을 보내지 않음
+    assert session.calls == limiter.breaker_failures
+
+
+def test_normal_200_pages_count_as_success():
+    session, limiter = FakeSession(RANKING_HTML), _limiter()
+    url = "https://www.cosme.net/categories/item/800/ranking/"
+
+    for _ in range(3):
+        fetch_html_response(session, _settings(), url, limiter=limiter)
+
+    m = limiter.metrics()["www.cosme.net"]
+    assert m["ok"] == 3
+    assert m["trips"] == 0
+    assert session.calls == 3
@@ -0,0 +1,77 @@
+from __future__ import annotations
+
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+
+from src.cosme_collector.cache import HtmlCache
+from src.cosme_collector.replay import FixtureArchive, RecordingAdapter
+
+BODY = "<html><head><title>ランキング | @cosme</title></head><body>ok</body></html>".encode("utf-8")
+ETAG = '"v1"'
+
+
+class EtagHandler(BaseHTTPRequestHandler):
+    """ETag 가 맞으면 304, 아니면 200 + 본문"""
+
+    def do_GET(self):
+        if self.headers.get("If-None-Match") == ETAG:
+            self.send_response(304)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("ETag", ETAG)
+        self.send_header("Content-Length", str(len(BODY)))
+        self.end_headers()
+        self.wfile.write(BODY)
+
+    def log_message(self, *args):
+        pass
+
+
+@pytest.fixture
+def server_url():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), EtagHandler)
+    t = threading.Thread(target=server.serve_forever, daemon=True)
+    t.start()
+    yield f"http://127.0.0.1:{server.server_port}/ranking/products/"
+    server.shutdown()
+    server.server_close()
+
+
+def _recording_session(archive: FixtureArchive) -> requests.Session:
+    s = requests.Session()
+    s.mount("http://", RecordingAdapter(archive))
+    return s
+
+
+def test_revalidation_is_recorded_with_body(tmp_path, server_url):
+    archive = FixtureArchive(tmp_path / "fixtures")
+    session = _recording_session(archive)
+
+    r = session.get(server_url, headers={"If-None-Match": ETAG}, timeout=5)
+
+    assert r.status_code == 200
+    entry = archive.get(server_url)
+    assert entry is not None and entry["status"] == 200
+    assert archive.body(entry) == BODY
+
+
+def test_forced_refresh_records_cached_page(tmp_path, server_url):
+    cache = HtmlCache(tmp_path / "_html", ttl_sec=3600)
+    plain = requests.Session()
+    cache.fetch(server_url, lambda url, headers: plain.get(url, headers=headers, timeout=5))
+
+    archive = FixtureArchive(tmp_path / "fixtures")
+    session = _recording_session(archive)
+    fetch = lambda url, headers: session.get(url, headers=headers, timeout=5)
+
+    # TTL 이내 캐시 hit → 요청 없음 → 녹화 안 됨 (main.py 가 --record 때 force_refresh 를 켜는 이유)
+    cache.fetch(server_url, fetch)
+    assert archive.get(server_url) is None
+
+    assert cache.fetch(server_url, fetch, force_refresh=True) == BODY.decode("utf-8")
+    assert archive.body(archive.get(server_url)) == BODY